@@ -3,9 +3,14 @@
 import os
 import sys
 import time
+import socket
 import subprocess
 import signal
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# How long to wait for a node to finish starting up
+STARTUP_TIMEOUT = 10.0
 
 def parse_arguments():
     """
@@ -20,6 +25,22 @@ def parse_arguments():
     
     return parser.parse_args()
 
+def wait_for_port(host, port, timeout=STARTUP_TIMEOUT):
+    """
+    Wait until a TCP port accepts connections.
+    
+    Returns True once a connection succeeds, or False if the timeout expires first.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    
+    return False
+
 def main():
     """
     Run multiple nodes to form a blockchain gossip network.
@@ -67,8 +88,21 @@ def main():
             process = subprocess.Popen(cmd)
             processes.append(process)
             
-            # Wait a bit before starting the next node
-            time.sleep(2)
+            # The other nodes bootstrap from the first one, so it has to be
+            # up before they start; the rest can start together. The node
+            # port itself isn't opened yet, but each node starts its network
+            # visualizer right after the node, so that port signals readiness
+            if i == 0 and not wait_for_port('localhost', vis_port):
+                print(f"Node 0 has not opened its visualizer on port {vis_port} yet")
+        
+        # Wait for the remaining nodes to come up
+        vis_ports = [args.vis_base_port + (i * 2) for i in range(1, args.nodes)]
+        with ThreadPoolExecutor(max_workers=max(1, len(vis_ports))) as executor:
+            ready = list(executor.map(lambda p: wait_for_port('localhost', p), vis_ports))
+        
+        for i, is_ready in enumerate(ready, start=1):
+            if not is_ready:
+                print(f"Node {i} has not opened its visualizer on port {vis_ports[i - 1]} yet")
         
         print(f"Started {args.nodes} nodes. Press Ctrl+C to stop.")
         
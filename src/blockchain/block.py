@@ -1,14 +1,28 @@
 import time
 import json
-import hashlib
+import struct
 from typing import Dict, List, Any, Optional
 
+from ..utils.crypto import sha256, sha256_once, sha256_many
+from .pow import (
+    NONCE_BATCH_SIZE, NONCE_FORMAT, difficulty_target, digest_limit, parallel_nonce_search
+)
+
+# Fixed binary layout of the hashed block header:
+# index (u64), previous hash (32 bytes), Merkle root (32 bytes),
+# timestamp (f64), followed by the nonce (u64) in its own struct
+HEADER_PREFIX = struct.Struct('<Q32s32sd')
+HEADER_NONCE = NONCE_FORMAT
+
 class Block:
     """
     Represents a block in the blockchain.
     Each block contains a list of transactions and links to the previous block.
     """
     
+    __slots__ = ('index', 'transactions', 'timestamp', 'previous_hash', 'nonce',
+                 'merkle_root', 'hash')
+    
     def __init__(self, 
                  index: int, 
                  transactions: List[Dict[str, Any]], 
@@ -30,18 +44,73 @@ class Block:
         self.timestamp = timestamp or time.time()
         self.previous_hash = previous_hash
         self.nonce = nonce
+        self.merkle_root = self._compute_merkle_root(transactions)
         self.hash = self.calculate_hash()
     
     def calculate_hash(self) -> str:
         """
         Calculate the hash of the block.
         
+        Only the fixed-size binary header is hashed; the transactions enter
+        it through their Merkle root, which is computed once per block.
+        
         Returns:
             str: The SHA-256 hash of the block
         """
-        # Convert the block to a string and hash it
-        block_string = json.dumps(self.to_dict(include_hash=False), sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        return sha256(self.header_bytes()).hexdigest()
+    
+    def header_bytes(self) -> bytes:
+        """
+        Pack the block header into its fixed binary layout.
+        
+        Returns:
+            bytes: The header fields followed by the nonce
+        """
+        return self._header_prefix() + HEADER_NONCE.pack(self.nonce)
+    
+    def _header_prefix(self) -> bytes:
+        """
+        Pack the parts of the header that stay fixed while mining.
+        
+        Returns:
+            bytes: The binary encoding of every header field except the nonce
+        """
+        return HEADER_PREFIX.pack(
+            self.index,
+            _hash_to_bytes(self.previous_hash),
+            self.merkle_root,
+            self.timestamp
+        )
+    
+    @staticmethod
+    def _compute_merkle_root(transactions: List[Dict[str, Any]]) -> bytes:
+        """
+        Compute the Merkle root of a list of transactions.
+        
+        Each leaf is the SHA-256 of a transaction's canonical JSON encoding;
+        pairs of digests are hashed together level by level, duplicating the
+        last digest of a level with an odd count.
+        
+        Args:
+            transactions: The transactions to commit to
+            
+        Returns:
+            bytes: The 32-byte Merkle root
+        """
+        if not transactions:
+            return sha256_once(b'')
+        
+        level = sha256_many([
+            json.dumps(tx, sort_keys=True, separators=(',', ':')).encode()
+            for tx in transactions
+        ])
+        
+        while len(level) > 1:
+            if len(level) % 2 == 1:
+                level.append(level[-1])
+            level = sha256_many([level[i] + level[i + 1] for i in range(0, len(level), 2)])
+        
+        return level[0]
     
     def to_dict(self, include_hash: bool = True) -> Dict[str, Any]:
         """
@@ -91,26 +160,63 @@ class Block:
             
         return block
     
-    def mine_block(self, difficulty: int) -> None:
+    def mine_block(self, difficulty: int, workers: int = 1) -> None:
         """
         Mine the block by finding a hash with the specified difficulty.
         
+        The SHA-256 state over the invariant prefix is computed once per
+        mining session; each attempt clones that midstate and only absorbs
+        the nonce. Nonces are searched in fixed-size batches so the block
+        attributes are only written once a match is found.
+        
+        With more than one worker the nonce space is split across
+        processes, each of which builds its own midstate.
+        
         Args:
             difficulty: The number of leading zeros required in the hash
+            workers: The number of processes to split the nonce search across
         """
-        target = '0' * difficulty
+        if self.hash[:difficulty] == '0' * difficulty:
+            return
+        
+        target = difficulty_target(difficulty)
+        
+        if workers > 1:
+            self.nonce, self.hash = parallel_nonce_search(
+                self._header_prefix(), target, self.nonce + 1, workers
+            )
+            return
         
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        # Bind everything the inner loop touches to locals up front
+        copy_midstate = sha256(self._header_prefix()).copy
+        pack_nonce = HEADER_NONCE.pack
+        limit = digest_limit(target)
+        batch_start = self.nonce + 1
+        
+        while True:
+            for nonce in range(batch_start, batch_start + NONCE_BATCH_SIZE):
+                hasher = copy_midstate()
+                hasher.update(pack_nonce(nonce))
+                if hasher.digest() <= limit:
+                    self.nonce = nonce
+                    self.hash = hasher.hexdigest()
+                    return
+            
+            batch_start += NONCE_BATCH_SIZE
     
     def is_valid(self) -> bool:
         """
         Check if the block's hash is valid.
         
+        The Merkle root is re-derived on every call so that transactions
+        modified after the block was built are detected.
+        
         Returns:
             bool: True if the hash is valid, False otherwise
         """
+        if self.merkle_root != self._compute_merkle_root(self.transactions):
+            return False
+        
         return self.hash == self.calculate_hash()
     
     def __str__(self) -> str:
@@ -119,6 +225,22 @@ class Block:
 
 # Helper functions
 
+def _hash_to_bytes(block_hash: str) -> bytes:
+    """
+    Convert a hex block hash to the 32-byte form used in the header.
+    
+    Args:
+        block_hash: The hex-encoded hash (the genesis block uses "0")
+        
+    Returns:
+        bytes: The hash as 32 raw bytes
+    """
+    try:
+        return bytes.fromhex(block_hash.rjust(64, '0'))
+    except ValueError:
+        # Not a hex digest; hash it so the header layout stays fixed
+        return sha256_once(block_hash.encode())
+
 def create_genesis_block() -> Block:
     """
     Create the genesis block (first block in the chain).
@@ -152,7 +274,7 @@ def create_block(index: int, transactions: List[Dict[str, Any]], previous_hash:
         previous_hash=previous_hash
     )
 
-def validate_block(block: Block, previous_block: Block, difficulty: int) -> bool:
+def validate_block(block: Block, previous_block: Block, difficulty: int, target: Optional[int] = None) -> bool:
     """
     Validate a block against the previous block and difficulty.
     
@@ -160,16 +282,12 @@ def validate_block(block: Block, previous_block: Block, difficulty: int) -> bool
         block: The block to validate
         previous_block: The previous block in the chain
         difficulty: The current mining difficulty
+        target: The integer threshold for the difficulty, if the caller has it cached
         
     Returns:
         bool: True if the block is valid, False otherwise
     """
-    # Check that the block's index is one more than the previous block
-    if block.index != previous_block.index + 1:
-        return False
-    
-    # Check that the block's previous_hash matches the hash of the previous block
-    if block.previous_hash != previous_block.hash:
+    if not _is_linked(block, previous_block):
         return False
     
     # Check that the block's hash is valid
@@ -177,7 +295,46 @@ def validate_block(block: Block, previous_block: Block, difficulty: int) -> bool
         return False
     
     # Check that the block's hash meets the difficulty requirement
-    if block.hash[:difficulty] != '0' * difficulty:
+    if target is None:
+        target = difficulty_target(difficulty)
+    return int(block.hash, 16) < target
+
+def _is_linked(block: Block, previous_block: Block) -> bool:
+    """
+    Check that a block directly follows the previous block.
+    
+    Args:
+        block: The block to check
+        previous_block: The previous block in the chain
+        
+    Returns:
+        bool: True if the index and previous hash match, False otherwise
+    """
+    # Check that the block's index is one more than the previous block
+    if block.index != previous_block.index + 1:
         return False
     
-    return True
\ No newline at end of file
+    # Check that the block's previous_hash matches the hash of the previous block
+    return block.previous_hash == previous_block.hash
+
+def validate_chain(chain: List[Block], difficulty: int) -> bool:
+    """
+    Validate every block of a chain against its predecessor.
+    
+    The difficulty target is computed once for the whole chain instead of
+    once per block.
+    
+    Args:
+        chain: The blocks to validate, starting with the genesis block
+        difficulty: The current mining difficulty
+        
+    Returns:
+        bool: True if the chain is valid, False otherwise
+    """
+    target = difficulty_target(difficulty)
+    
+    for i in range(1, len(chain)):
+        if not validate_block(chain[i], chain[i - 1], difficulty, target):
+            return False
+    
+    return True
@@ -1,11 +1,57 @@
-import json
 import time
 import os
+import struct
 from typing import List, Dict, Any, Optional, Tuple
 
+from ..utils.serialization import dumps, loads
+
 # Will be imported once these modules are created
-from .block import Block, create_genesis_block, validate_block
+from .block import Block, create_genesis_block, validate_block, validate_chain
+from .pow import difficulty_target
 from .transaction import Transaction, validate_transaction
+from .tx_index import TransactionIndex
+
+# Chain files are a sequence of frames, each a 4-byte big-endian length
+# followed by a JSON document; the first frame holds the chain settings
+FRAME_HEADER = struct.Struct('>I')
+
+def _encode_frame(payload: Dict[str, Any]) -> bytes:
+    """
+    Encode a document as a length-prefixed frame.
+    
+    Args:
+        payload: The document to encode
+        
+    Returns:
+        bytes: The frame header followed by the compact JSON encoding
+    """
+    body = dumps(payload)
+    return FRAME_HEADER.pack(len(body)) + body
+
+def _decode_frames(data: bytes) -> List[Dict[str, Any]]:
+    """
+    Decode every frame in a buffer.
+    
+    Args:
+        data: The raw contents of a chain file
+        
+    Returns:
+        List[Dict[str, Any]]: The decoded documents in order
+    """
+    frames = []
+    offset = 0
+    header_size = FRAME_HEADER.size
+    
+    while offset + header_size <= len(data):
+        (length,) = FRAME_HEADER.unpack_from(data, offset)
+        offset += header_size
+        if offset + length > len(data):
+            # Truncated trailing frame from an interrupted append
+            break
+        frames.append(loads(data[offset:offset + length]))
+        offset += length
+    
+    return frames
 
 class Blockchain:
     """
@@ -13,20 +59,36 @@ class Blockchain:
     Implements consensus mechanisms and chain validation.
     """
     
-    def __init__(self, difficulty: int = 4, target_block_time: int = 60):
+    def __init__(self, difficulty: int = 4, target_block_time: int = 60, mining_workers: int = 1):
         """
         Initialize a new blockchain.
         
         Args:
             difficulty: The initial mining difficulty (number of leading zeros required in block hash)
             target_block_time: The target time between blocks in seconds
+            mining_workers: The number of processes to split the nonce search across
         """
         self.chain = [create_genesis_block()]
         self.difficulty = difficulty
         self.target_block_time = target_block_time
+        self.mining_workers = mining_workers
         self.pending_transactions = []
+        self._pending_ids = set()
         self.last_difficulty_adjustment = time.time()
         self.adjustment_interval = 10  # Number of blocks between difficulty adjustments
+        self._tx_index = TransactionIndex()
+        self._tx_index.rebuild(self.chain)
+    
+    @property
+    def difficulty(self) -> int:
+        """The number of leading zeros required in a block hash."""
+        return self._difficulty
+    
+    @difficulty.setter
+    def difficulty(self, difficulty: int) -> None:
+        """Set the difficulty and the integer target derived from it."""
+        self._difficulty = difficulty
+        self._target = difficulty_target(difficulty)
     
     def add_transaction(self, transaction: Transaction) -> bool:
         """
@@ -43,11 +105,11 @@ class Blockchain:
             return False
         
         # Check if the transaction is already in the pending transactions
-        for tx in self.pending_transactions:
-            if tx.transaction_id == transaction.transaction_id:
-                return False  # Already have this transaction
+        if transaction.transaction_id in self._pending_ids:
+            return False  # Already have this transaction
         
         # Add to pending transactions
+        self._pending_ids.add(transaction.transaction_id)
         self.pending_transactions.append(transaction)
         return True
     
@@ -73,8 +135,9 @@ class Blockchain:
         )
         reward_transaction.signature = "SYSTEM"  # Special signature for mining rewards
         
-        # Add the reward transaction to the list of transactions to include in the block
-        transactions = self.pending_transactions.copy()
+        # Blocks store transactions as dictionaries; convert the pending
+        # transactions once and add the reward transaction
+        transactions = [tx.to_dict() for tx in self.pending_transactions]
         transactions.append(reward_transaction.to_dict())
         
         # Create a new block
@@ -87,13 +150,15 @@ class Blockchain:
         )
         
         # Mine the block
-        new_block.mine_block(self.difficulty)
+        new_block.mine_block(self.difficulty, self.mining_workers)
         
         # Add the block to the chain
         self.chain.append(new_block)
+        self._tx_index.add_block(new_block)
         
         # Clear the pending transactions
         self.pending_transactions = []
+        self._pending_ids.clear()
         
         # Adjust difficulty if needed
         if len(self.chain) % self.adjustment_interval == 0:
@@ -113,15 +178,17 @@ class Blockchain:
         """
         # Validate the block
         last_block = self.chain[-1]
-        if not validate_block(block, last_block, self.difficulty):
+        if not validate_block(block, last_block, self.difficulty, self._target):
             return False
         
         # Add the block to the chain
         self.chain.append(block)
+        block_tx_ids = set(self._tx_index.add_block(block))
         
         # Remove transactions that are now in the block from pending transactions
-        block_tx_ids = [tx.get('id') for tx in block.transactions]
-        self.pending_transactions = [tx for tx in self.pending_transactions if tx.transaction_id not in block_tx_ids]
+        if not self._pending_ids.isdisjoint(block_tx_ids):
+            self.pending_transactions = [tx for tx in self.pending_transactions if tx.transaction_id not in block_tx_ids]
+            self._pending_ids.difference_update(block_tx_ids)
         
         # Adjust difficulty if needed
         if len(self.chain) % self.adjustment_interval == 0:
@@ -156,19 +223,11 @@ class Blockchain:
         Returns:
             bool: True if the chain is valid, False otherwise
         """
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            
-            # Validate the block
-            if not validate_block(current_block, previous_block, self.difficulty):
-                return False
-        
-        return True
+        return validate_chain(self.chain, self.difficulty)
     
     def get_balance(self, address: str) -> float:
         """
-        Calculate the balance of an address by going through all transactions in the blockchain.
+        Get the balance of an address from the running per-address totals.
         
         Args:
             address: The address to calculate the balance for
@@ -176,21 +235,7 @@ class Blockchain:
         Returns:
             float: The balance of the address
         """
-        balance = 0.0
-        
-        # Go through all blocks in the chain
-        for block in self.chain:
-            # Go through all transactions in the block
-            for tx_dict in block.transactions:
-                # If the address is the receiver, add the amount to the balance
-                if tx_dict.get('receiver') == address:
-                    balance += tx_dict.get('amount', 0.0)
-                
-                # If the address is the sender, subtract the amount from the balance
-                if tx_dict.get('sender') == address:
-                    balance -= tx_dict.get('amount', 0.0)
-        
-        return balance
+        return self._tx_index.get_balance(address)
     
     def get_transaction_history(self, address: str) -> List[Dict[str, Any]]:
         """
@@ -202,20 +247,7 @@ class Blockchain:
         Returns:
             List[Dict[str, Any]]: A list of transactions involving the address
         """
-        transactions = []
-        
-        # Go through all blocks in the chain
-        for block in self.chain:
-            # Go through all transactions in the block
-            for tx_dict in block.transactions:
-                # If the address is involved in the transaction, add it to the list
-                if tx_dict.get('sender') == address or tx_dict.get('receiver') == address:
-                    tx_copy = tx_dict.copy()
-                    tx_copy['block_index'] = block.index
-                    tx_copy['block_hash'] = block.hash
-                    transactions.append(tx_copy)
-        
-        return transactions
+        return self._tx_index.get_transaction_history(address)
     
     def get_latest_block(self) -> Block:
         """
@@ -241,18 +273,22 @@ class Blockchain:
             return False
         
         # Check if the new chain is valid
-        for i in range(1, len(new_chain)):
-            if not validate_block(new_chain[i], new_chain[i - 1], self.difficulty):
-                return False
+        if not validate_chain(new_chain, self.difficulty):
+            return False
         
         # Replace the chain
         self.chain = new_chain
+        self._tx_index.rebuild(self.chain)
         return True
     
     def save_to_file(self, filename: str) -> bool:
         """
         Save the blockchain to a file.
         
+        The file starts with a frame holding the chain settings, followed by
+        one frame per block, so later blocks can be appended with
+        append_block_to_file instead of rewriting the whole file.
+        
         Args:
             filename: The name of the file to save to
             
@@ -263,29 +299,49 @@ class Blockchain:
             # Create the directory if it doesn't exist
             os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
             
-            # Convert the chain to a list of dictionaries
-            chain_data = [block.to_dict() for block in self.chain]
-            
             # Save to file
-            with open(filename, 'w') as f:
-                json.dump({
-                    'chain': chain_data,
+            with open(filename, 'wb') as f:
+                f.write(_encode_frame({
                     'difficulty': self.difficulty,
                     'target_block_time': self.target_block_time,
                     'adjustment_interval': self.adjustment_interval,
                     'last_difficulty_adjustment': self.last_difficulty_adjustment
-                }, f, indent=4)
+                }))
+                for block in self.chain:
+                    f.write(_encode_frame(block.to_dict()))
                 
             return True
         except Exception as e:
             print(f"Error saving blockchain to file: {e}")
             return False
     
+    def append_block_to_file(self, filename: str, block: Block) -> bool:
+        """
+        Append a single block to a file written by save_to_file.
+        
+        Args:
+            filename: The name of the file to append to
+            block: The block to append
+            
+        Returns:
+            bool: True if the block was appended successfully, False otherwise
+        """
+        try:
+            with open(filename, 'ab') as f:
+                f.write(_encode_frame(block.to_dict()))
+            
+            return True
+        except Exception as e:
+            print(f"Error appending block to file: {e}")
+            return False
+    
     @classmethod
     def load_from_file(cls, filename: str) -> Optional['Blockchain']:
         """
         Load a blockchain from a file.
         
+        Files in the older single-document JSON format are still accepted.
+        
         Args:
             filename: The name of the file to load from
             
@@ -293,8 +349,16 @@ class Blockchain:
             Optional[Blockchain]: The loaded blockchain, or None if loading failed
         """
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            with open(filename, 'rb') as f:
+                raw = f.read()
+            
+            if raw.lstrip()[:1] == b'{':
+                data = loads(raw)
+                chain_data = data.get('chain', [])
+            else:
+                frames = _decode_frames(raw)
+                data = frames[0] if frames else {}
+                chain_data = frames[1:]
             
             # Create a new blockchain with the loaded parameters
             blockchain = cls(
@@ -307,7 +371,10 @@ class Blockchain:
             blockchain.last_difficulty_adjustment = data.get('last_difficulty_adjustment', time.time())
             
             # Load the chain
-            blockchain.chain = [Block.from_dict(block_dict) for block_dict in data.get('chain', [])]
+            blockchain.chain = [Block.from_dict(block_dict) for block_dict in chain_data]
+            
+            # Re-derive the index and balances from the loaded blocks
+            blockchain._tx_index.rebuild(blockchain.chain)
             
             return blockchain
         except Exception as e:
@@ -1,6 +1,140 @@
-import hashlib
+import multiprocessing
+import struct
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+from ..utils.crypto import sha256
+
+# Number of consecutive nonces tried per batch in the mining loops
+NONCE_BATCH_SIZE = 1024
+
+# Nonces are appended to the hashed data as 8 little-endian bytes
+NONCE_FORMAT = struct.Struct('<Q')
+
+# Worker processes are spawned rather than forked: nodes run transport,
+# peer and visualizer threads, and a child forked while one of them holds
+# a lock would deadlock on it
+PROCESS_CONTEXT = multiprocessing.get_context('spawn')
+
+def difficulty_target(difficulty: int) -> int:
+    """
+    Get the integer threshold a hash must stay below for a difficulty.
+    
+    A digest read as a big-endian integer is below this value exactly when
+    its hex form starts with the given number of zeros.
+    
+    Args:
+        difficulty: The number of leading zeros required in the hash
+        
+    Returns:
+        int: The exclusive upper bound for a valid digest
+    """
+    return 1 << (256 - 4 * difficulty)
+
+def digest_limit(target: int) -> bytes:
+    """
+    Get the largest digest that meets a target, as raw big-endian bytes.
+    
+    Comparing a raw digest against this value is equivalent to the integer
+    comparison against the target, but avoids building an int per attempt.
+    
+    Args:
+        target: The exclusive upper bound for a valid digest
+        
+    Returns:
+        bytes: The 32-byte inclusive upper bound for a valid digest
+    """
+    return (target - 1).to_bytes(32, 'big')
+
+def _search_worker(prefix: bytes, target: int, start: int, stride: int, stop: Optional[int],
+                   stop_event, results) -> None:
+    """
+    Search every stride-th nonce from start in a worker process.
+    
+    The shared stop event is checked once per batch so that the other
+    workers give up shortly after one of them finds a match. Exactly one
+    message is put on the results queue: the winning (nonce, hash) pair,
+    or None if this worker stopped without a match.
+    
+    Args:
+        prefix: The bytes hashed before the nonce
+        target: The exclusive upper bound for a valid digest
+        start: The first nonce this worker tries
+        stride: The distance between consecutive nonces of this worker
+        stop: The nonce to stop at (exclusive), or None to search until stopped
+        stop_event: The event set once any worker finds a match
+        results: The queue the outcome is reported on
+    """
+    copy_midstate = sha256(prefix).copy
+    pack_nonce = NONCE_FORMAT.pack
+    limit = digest_limit(target)
+    batch_span = NONCE_BATCH_SIZE * stride
+    batch_start = start
+    
+    while not stop_event.is_set() and (stop is None or batch_start < stop):
+        batch_end = batch_start + batch_span
+        if stop is not None:
+            batch_end = min(batch_end, stop)
+        
+        for nonce in range(batch_start, batch_end, stride):
+            hasher = copy_midstate()
+            hasher.update(pack_nonce(nonce))
+            if hasher.digest() <= limit:
+                stop_event.set()
+                results.put((nonce, hasher.hexdigest()))
+                return
+        
+        batch_start = batch_end
+    
+    results.put(None)
+
+def parallel_nonce_search(prefix: bytes, target: int, start: int, workers: int,
+                          stop: Optional[int] = None) -> Optional[Tuple[int, str]]:
+    """
+    Search for a nonce across several worker processes.
+    
+    Worker i tries nonces start + i, start + i + workers, ... so the
+    workers cover disjoint parts of the nonce space. Processes are used
+    rather than threads because hashlib holds the GIL for inputs as
+    small as a block header.
+    
+    Args:
+        prefix: The bytes hashed before the nonce (encoded as 8 little-endian bytes)
+        target: The exclusive upper bound for a valid digest
+        start: The first nonce to try
+        workers: The number of worker processes
+        stop: The nonce to stop at (exclusive), or None to search until a match is found
+        
+    Returns:
+        Optional[Tuple[int, str]]: The winning nonce and hash, or None if the range had no match
+    """
+    stop_event = PROCESS_CONTEXT.Event()
+    results = PROCESS_CONTEXT.Queue()
+    processes = [
+        PROCESS_CONTEXT.Process(
+            target=_search_worker,
+            args=(prefix, target, start + i, workers, stop, stop_event, results),
+            daemon=True
+        )
+        for i in range(workers)
+    ]
+    
+    for process in processes:
+        process.start()
+    
+    found = None
+    try:
+        for _ in range(workers):
+            outcome = results.get()
+            if outcome and found is None:
+                found = outcome
+                stop_event.set()
+    finally:
+        stop_event.set()
+        for process in processes:
+            process.join()
+    
+    return found
 
 class ProofOfWork:
     """
@@ -22,6 +156,17 @@ class ProofOfWork:
         self.blocks_since_adjustment = 0
         self.adjustment_interval = 10  # Number of blocks between difficulty adjustments
     
+    @property
+    def difficulty(self) -> int:
+        """The number of leading zeros required in a block hash."""
+        return self._difficulty
+    
+    @difficulty.setter
+    def difficulty(self, difficulty: int) -> None:
+        """Set the difficulty and the integer target derived from it."""
+        self._difficulty = difficulty
+        self._target = difficulty_target(difficulty)
+    
     def get_target(self) -> str:
         """
         Get the current target hash pattern.
@@ -42,55 +187,113 @@ class ProofOfWork:
         Returns:
             str: The calculated hash
         """
-        # Convert the data to a string and add the nonce
-        data_string = str(data) + str(nonce)
+        hasher = self._base_hasher(data)
+        hasher.update(NONCE_FORMAT.pack(nonce))
+        return hasher.hexdigest()
+    
+    def _base_hasher(self, data: Dict[str, Any]):
+        """
+        Create a SHA-256 hasher that has already absorbed the data.
         
-        # Calculate the hash
-        return hashlib.sha256(data_string.encode()).hexdigest()
+        Copies of the returned hasher only need the nonce appended, so the
+        data is hashed once per mining session instead of once per nonce.
+        
+        Args:
+            data: The data to hash
+            
+        Returns:
+            The SHA-256 hash object over the encoded data
+        """
+        return sha256(self._encode_data(data))
     
-    def mine(self, data: Dict[str, Any], max_nonce: int = 1000000) -> Optional[Dict[str, Any]]:
+    def _encode_data(self, data: Dict[str, Any]) -> bytes:
+        """
+        Encode the data that precedes the nonce in the hashed input.
+        
+        Args:
+            data: The data to encode
+            
+        Returns:
+            bytes: The encoded data
+        """
+        return str(data).encode()
+    
+    def mine(self, data: Dict[str, Any], max_nonce: int = 1000000, workers: int = 1) -> Optional[Dict[str, Any]]:
         """
         Mine a block by finding a hash that meets the difficulty requirement.
         
         Args:
             data: The data to include in the block
             max_nonce: The maximum nonce value to try
+            workers: The number of processes to split the nonce search across
             
         Returns:
             Optional[Dict[str, Any]]: The mined block with nonce and hash, or None if mining failed
         """
-        target = self.get_target()
-        nonce = 0
+        target = self._target
         start_time = time.time()
+        found = None
         
-        while nonce < max_nonce:
-            hash_result = self.calculate_hash(data, nonce)
+        if workers > 1:
+            found = parallel_nonce_search(self._encode_data(data), target, 0, workers, max_nonce)
+        else:
+            base_hasher = self._base_hasher(data)
+            for batch_start in range(0, max_nonce, NONCE_BATCH_SIZE):
+                batch_end = min(batch_start + NONCE_BATCH_SIZE, max_nonce)
+                found = self._search_nonces(base_hasher, batch_start, batch_end, target)
+                if found:
+                    break
+        
+        if found:
+            nonce, hash_result = found
+            
+            # Found a valid hash
+            end_time = time.time()
+            mining_time = end_time - start_time
             
-            if hash_result.startswith(target):
-                # Found a valid hash
-                end_time = time.time()
-                mining_time = end_time - start_time
-                
-                print(f"Block mined in {mining_time:.2f} seconds with nonce {nonce}")
-                print(f"Hash: {hash_result}")
-                
-                # Update block data with the nonce and hash
-                result = data.copy()
-                result['nonce'] = nonce
-                result['hash'] = hash_result
-                
-                # Update difficulty if needed
-                self.blocks_since_adjustment += 1
-                if self.blocks_since_adjustment >= self.adjustment_interval:
-                    self._adjust_difficulty(end_time)
-                
-                return result
+            print(f"Block mined in {mining_time:.2f} seconds with nonce {nonce}")
+            print(f"Hash: {hash_result}")
             
-            nonce += 1
+            # Update block data with the nonce and hash
+            result = data.copy()
+            result['nonce'] = nonce
+            result['hash'] = hash_result
+            
+            # Update difficulty if needed
+            self.blocks_since_adjustment += 1
+            if self.blocks_since_adjustment >= self.adjustment_interval:
+                self._adjust_difficulty(end_time)
+            
+            return result
         
         print(f"Failed to mine block after trying {max_nonce} nonces")
         return None
     
+    def _search_nonces(self, base_hasher, start: int, stop: int, target: int) -> Optional[Tuple[int, str]]:
+        """
+        Search a batch of consecutive nonces for a hash that meets the target.
+        
+        Args:
+            base_hasher: A hasher that has already absorbed the data
+            start: The first nonce to try
+            stop: The nonce to stop at (exclusive)
+            target: The exclusive upper bound for a valid digest
+            
+        Returns:
+            Optional[Tuple[int, str]]: The winning nonce and hash, or None if the batch had no match
+        """
+        copy_base = base_hasher.copy
+        pack_nonce = NONCE_FORMAT.pack
+        limit = digest_limit(target)
+        
+        for nonce in range(start, stop):
+            hasher = copy_base()
+            hasher.update(pack_nonce(nonce))
+            if hasher.digest() <= limit:
+                return nonce, hasher.hexdigest()
+        
+        return None
+    
     def verify(self, data: Dict[str, Any], nonce: int, hash_value: str) -> bool:
         """
         Verify that a hash is valid for the given data and nonce.
@@ -0,0 +1,113 @@
+from array import array
+from collections import defaultdict
+from itertools import compress, repeat
+from operator import eq, or_
+from typing import Dict, List, Any, Tuple
+
+class TransactionIndex:
+    """
+    Column-oriented index over the transactions stored in a chain.
+    Senders, receivers and amounts are kept in parallel columns so that
+    address queries scan flat sequences instead of nested block dictionaries,
+    and per-address balances are maintained as blocks are added.
+    """
+    
+    def __init__(self):
+        """Initialize an empty transaction index."""
+        self.clear()
+    
+    def clear(self) -> None:
+        """Remove every transaction from the index."""
+        self.ids = []
+        self.senders = []
+        self.receivers = []
+        self.amounts = array('d')
+        self.block_indexes = array('q')
+        self.block_hashes = []
+        self.transactions = []
+        self.balances = defaultdict(float)
+    
+    def add_block(self, block) -> Tuple[Any, ...]:
+        """
+        Append the transactions of a block to the index.
+        
+        Each transaction dictionary is read exactly once here; everything
+        else that needs its fields uses the columns or the returned ids.
+        
+        Args:
+            block: The block whose transactions should be indexed
+            
+        Returns:
+            Tuple[Any, ...]: The ids of the indexed transactions
+        """
+        if not block.transactions:
+            return ()
+        
+        ids, senders, receivers, amounts = zip(*[
+            (tx_dict.get('id'), tx_dict.get('sender'), tx_dict.get('receiver'), tx_dict.get('amount', 0.0))
+            for tx_dict in block.transactions
+        ])
+        count = len(ids)
+        
+        self.ids.extend(ids)
+        self.senders.extend(senders)
+        self.receivers.extend(receivers)
+        self.amounts.extend(amounts)
+        self.block_indexes.extend(repeat(block.index, count))
+        self.block_hashes.extend(repeat(block.hash, count))
+        self.transactions.extend(block.transactions)
+        
+        balances = self.balances
+        for sender, receiver, amount in zip(senders, receivers, amounts):
+            balances[receiver] += amount
+            balances[sender] -= amount
+        
+        return ids
+    
+    def rebuild(self, chain: List) -> None:
+        """
+        Rebuild the index from scratch for a whole chain.
+        
+        Args:
+            chain: The list of blocks to index
+        """
+        self.clear()
+        for block in chain:
+            self.add_block(block)
+    
+    def get_balance(self, address: str) -> float:
+        """
+        Get the balance of an address.
+        
+        Args:
+            address: The address to get the balance for
+            
+        Returns:
+            float: The balance of the address
+        """
+        return self.balances.get(address, 0.0)
+    
+    def get_transaction_history(self, address: str) -> List[Dict[str, Any]]:
+        """
+        Get the indexed transactions involving an address.
+        
+        Args:
+            address: The address to get the transaction history for
+            
+        Returns:
+            List[Dict[str, Any]]: Copies of the matching transactions with their block index and hash
+        """
+        involved = map(
+            or_,
+            map(eq, self.senders, repeat(address)),
+            map(eq, self.receivers, repeat(address))
+        )
+        
+        transactions = []
+        for i in compress(range(len(self.transactions)), involved):
+            tx_copy = self.transactions[i].copy()
+            tx_copy['block_index'] = self.block_indexes[i]
+            tx_copy['block_hash'] = self.block_hashes[i]
+            transactions.append(tx_copy)
+        
+        return transactions
@@ -152,7 +152,7 @@ def update_visualization(node: Node, network_vis: NetworkVisualizer, blockchain_
             # Sleep for a bit
             time.sleep(2)
         except Exception as e:
-            logger.error(f"Error updating visualization: {e}")
+            logger.error("Error updating visualization: %s", e)
             time.sleep(5)
 
 def main():
@@ -0,0 +1,171 @@
+import base64
+import math
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Tuple
+
+from ..utils.crypto import sha256
+
+# Number of items whose hash pair is remembered. Message IDs are looked up
+# several times each (seen check, add, every anti-entropy digest while
+# cached), so recent ones are hashed only once.
+HASH_CACHE_SIZE = 1 << 17
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter for string items.
+    Membership tests may return false positives at roughly the configured
+    rate, but never false negatives.
+    """
+    
+    def __init__(self, capacity: int = 100000, error_rate: float = 1e-5):
+        """
+        Initialize an empty Bloom filter.
+        
+        Args:
+            capacity: The number of items the filter is sized for
+            error_rate: The false-positive rate expected at capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, item: str) -> Iterator[int]:
+        """
+        Get the bit positions for an item.
+        
+        Two 64-bit values are taken from a single SHA-256 digest and combined
+        as h1 + i * h2 (Kirsch-Mitzenmacher double hashing).
+        
+        Args:
+            item: The item to hash
+            
+        Returns:
+            Iterator[int]: The bit positions of the item
+        """
+        h1, h2 = _item_hashes(item)
+        num_bits = self.num_bits
+        return ((h1 + i * h2) % num_bits for i in range(self.num_hashes))
+    
+    def add(self, item: str) -> None:
+        """
+        Add an item to the filter.
+        
+        Args:
+            item: The item to add
+        """
+        bits = self.bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        """Check whether an item may have been added to the filter."""
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    def __len__(self) -> int:
+        """Return the number of items added to the filter."""
+        return self.count
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the filter to a JSON-friendly dictionary.
+        
+        Returns:
+            Dict[str, Any]: The bit array (base64) and the parameters needed to query it
+        """
+        return {
+            'bits': base64.b64encode(self.bits).decode('ascii'),
+            'num_bits': self.num_bits,
+            'num_hashes': self.num_hashes
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BloomFilter':
+        """
+        Recreate a filter from a dictionary produced by to_dict.
+        
+        Args:
+            data: The dictionary to create the filter from
+            
+        Returns:
+            BloomFilter: A filter answering the same membership queries
+        """
+        bits = bytearray(base64.b64decode(data['bits']))
+        num_bits = int(data['num_bits'])
+        if num_bits <= 0 or len(bits) != (num_bits + 7) // 8:
+            raise ValueError("Bloom filter size does not match its bit array")
+        
+        num_hashes = int(data['num_hashes'])
+        if not 1 <= num_hashes <= 64:
+            raise ValueError("Bloom filter hash count out of range")
+        
+        bloom = cls.__new__(cls)
+        bloom.capacity = 0
+        bloom.error_rate = 0.0
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        bloom.count = 0
+        return bloom
+
+class RotatingBloomFilter:
+    """
+    A Bloom filter that ages out old items by rotating two generations.
+    Once the current generation reaches its capacity it becomes the previous
+    one and a fresh generation is started, so memory stays bounded and the
+    error rate stays within twice that of a full generation.
+    """
+    
+    def __init__(self, capacity: int = 100000, error_rate: float = 1e-5):
+        """
+        Initialize an empty rotating Bloom filter.
+        
+        Args:
+            capacity: The number of items each generation is sized for
+            error_rate: The false-positive rate of a full generation
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.current = BloomFilter(capacity, error_rate)
+        self.previous = BloomFilter(capacity, error_rate)
+    
+    def add(self, item: str) -> None:
+        """
+        Add an item to the current generation, rotating first if it is full.
+        
+        Args:
+            item: The item to add
+        """
+        if self.current.count >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter(self.capacity, self.error_rate)
+        self.current.add(item)
+    
+    def __contains__(self, item: str) -> bool:
+        """Check whether an item may have been added to either generation."""
+        return item in self.current or item in self.previous
+    
+    def __len__(self) -> int:
+        """Return the number of items remembered by both generations."""
+        return self.current.count + self.previous.count
+
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def _item_hashes(item: str) -> Tuple[int, int]:
+    """
+    Hash an item into the two values its bit positions are derived from.
+    
+    The pair does not depend on the filter size, so one cached entry serves
+    every filter the item is added to or looked up in.
+    
+    Args:
+        item: The item to hash
+        
+    Returns:
+        Tuple[int, int]: The base hash and the (odd) step between positions
+    """
+    digest = sha256(item.encode()).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:16], 'little') | 1
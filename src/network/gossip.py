@@ -1,9 +1,21 @@
+import asyncio
+from array import array
+from collections import deque
 import threading
 import time
 import random
 import json
 from typing import Dict, List, Set, Any, Optional, Callable
 
+from ..utils.crypto import sha256_once
+from ..utils.serialization import dumps
+from .bloom import BloomFilter, RotatingBloomFilter
+from .message import new_message_id
+
+# Point-to-point anti-entropy messages; they are answered by their handler
+# and are never cached, so they are not gossiped on or nested in later syncs
+UNCACHED_TYPES = frozenset({'DIGEST', 'SYNC_REQ', 'SYNC_RESP'})
+
 # Will be imported once these modules are created
 # from ..node.node import Node
 # from .message import Message, MessageType
@@ -24,9 +36,16 @@ class GossipProtocol:
         """
         self.node = node
         self.running = False
-        self.seen_messages = set()  # Set of message IDs we've seen
-        self.message_cache = {}  # Dict[str, Dict] - Cache of recent messages
+        self.seen_messages = RotatingBloomFilter(capacity=100000, error_rate=1e-5)  # Message IDs we've seen
+        # Cache of recent messages, stored as parallel columns
+        self.message_cache = {}  # Dict[str, int] - Column index of each cached message ID
+        self._cache_ids = []  # Message ID per slot, for O(1) random picks
+        self._cache_messages = []  # Message dict per slot
+        self._cache_encoded = []  # Encoded message per slot, or None until first sent
+        self._cache_timestamps = array('d')  # Monotonic cache time per slot
+        self._expiry_queue = deque()  # (cache timestamp, message ID) pairs, oldest first
         self.lock = threading.RLock()
+        self._id_tag = int.from_bytes(sha256_once(str(node.node_id).encode())[:4], 'big')
         
         # Gossip parameters
         self.fanout = 3  # Number of peers to forward messages to
@@ -36,46 +55,46 @@ class GossipProtocol:
         
         # Anti-entropy parameters
         self.anti_entropy_interval = 300  # Seconds between anti-entropy sync
+        self.digest_error_rate = 0.01  # False-positive rate of the digest Bloom filter
         
-        # Background threads
-        self.gossip_thread = None
-        self.anti_entropy_thread = None
+        # Background event loop running the gossip and anti-entropy loops
+        self.loop = None
+        self.loop_thread = None
+        self._stop_event = None
         
         # Message handlers
         self.message_handlers = {}
     
     def start(self) -> None:
-        """Start the gossip protocol and its background threads."""
+        """Start the gossip protocol and its background event loop."""
         if self.running:
             return
             
         self.running = True
         print(f"GossipProtocol starting for node {self.node.node_id}")
         
-        # Start background threads
-        self.gossip_thread = threading.Thread(target=self._gossip_loop, daemon=True)
-        self.gossip_thread.start()
-        
-        self.anti_entropy_thread = threading.Thread(target=self._anti_entropy_loop, daemon=True)
-        self.anti_entropy_thread.start()
+        # Run both background loops on one event loop in a single thread
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self._run_event_loop, daemon=True)
+        self.loop_thread.start()
         
         # Register message handlers
         self._register_default_handlers()
     
     def stop(self) -> None:
-        """Stop the gossip protocol and its background threads."""
+        """Stop the gossip protocol and its background event loop."""
         if not self.running:
             return
             
         self.running = False
         print(f"GossipProtocol stopping for node {self.node.node_id}")
         
-        # Threads will exit on their own since they check self.running
-        if self.gossip_thread:
-            self.gossip_thread.join(timeout=1.0)
+        # Wake the loops from their sleep so they see self.running is False
+        if self.loop and self._stop_event:
+            self.loop.call_soon_threadsafe(self._stop_event.set)
         
-        if self.anti_entropy_thread:
-            self.anti_entropy_thread.join(timeout=1.0)
+        if self.loop_thread:
+            self.loop_thread.join(timeout=1.0)
     
     def broadcast(self, message_type: str, payload: Dict[str, Any], ttl: Optional[int] = None) -> str:
         """
@@ -89,30 +108,76 @@ class GossipProtocol:
         Returns:
             str: The ID of the broadcast message
         """
-        # Create a message
-        message_id = f"{self.node.node_id}:{time.time()}:{random.randint(0, 1000000)}"
-        message = {
-            'id': message_id,
-            'type': message_type,
-            'sender': self.node.node_id,
-            'timestamp': time.time(),
-            'ttl': ttl or self.message_ttl,
-            'payload': payload
-        }
+        message = self._create_message(message_type, payload, ttl or self.message_ttl)
+        message_id = message['id']
         
         # Add to our seen messages and cache
         with self.lock:
             self.seen_messages.add(message_id)
-            self.message_cache[message_id] = {
-                'message': message,
-                'timestamp': time.time()
-            }
+            self._cache_message(message_id, message)
         
         # Broadcast to peers
         self._broadcast_to_peers(message)
         
         return message_id
     
+    def send_to_peer(self, peer_id: str, message_type: str, payload: Dict[str, Any]) -> str:
+        """
+        Send a message to a single peer without gossiping or caching it.
+        
+        Args:
+            peer_id: The ID of the peer to send to
+            message_type: The type of message to send
+            payload: The message payload
+            
+        Returns:
+            str: The ID of the sent message
+        """
+        message = self._create_message(message_type, payload, 1)
+        
+        transport = getattr(self.node, 'transport', None)
+        if transport is None:
+            # No transport yet, so we'll just print a message
+            print(f"Sending message {message['id']} of type {message_type} to peer {peer_id}")
+        else:
+            transport.send_tcp(peer_id, self._encode_message(message))
+        
+        return message['id']
+    
+    def _create_message(self, message_type: str, payload: Dict[str, Any], ttl: int) -> Dict[str, Any]:
+        """
+        Create a message originating from this node.
+        
+        Args:
+            message_type: The type of the message
+            payload: The message payload
+            ttl: Time-to-live for the message (hops)
+            
+        Returns:
+            Dict[str, Any]: The message
+        """
+        timestamp_ns = time.time_ns()
+        return {
+            'id': self._new_message_id(timestamp_ns),
+            'type': message_type,
+            'sender': self.node.node_id,
+            'timestamp': timestamp_ns / 1e9,
+            'ttl': ttl,
+            'payload': payload
+        }
+    
+    def _new_message_id(self, timestamp_ns: int) -> str:
+        """
+        Build a fixed-width ID for a message created by this node.
+        
+        Args:
+            timestamp_ns: The creation time of the message in nanoseconds
+            
+        Returns:
+            str: The ID as 32 hex digits, tagged with a hash of the node ID
+        """
+        return new_message_id(timestamp_ns, self._id_tag)
+    
     def broadcast_transaction(self, transaction: Dict[str, Any]) -> str:
         """
         Broadcast a transaction to the network.
@@ -141,6 +206,8 @@ class GossipProtocol:
             print(f"Received message without ID from {from_peer}")
             return False
         
+        message_type = message.get('type')
+        
         # Check if we've seen this message before
         with self.lock:
             if message_id in self.seen_messages:
@@ -148,10 +215,16 @@ class GossipProtocol:
             
             # Mark as seen and add to cache
             self.seen_messages.add(message_id)
-            self.message_cache[message_id] = {
-                'message': message,
-                'timestamp': time.time()
-            }
+            if message_type not in UNCACHED_TYPES:
+                self._cache_message(message_id, message)
+        
+        # Handle the message based on its type; this happens even on the
+        # last hop, so TTL-1 messages such as digests reach their handler
+        if message_type in self.message_handlers:
+            try:
+                self.message_handlers[message_type](message, from_peer)
+            except Exception as e:
+                print(f"Error handling message of type {message_type}: {e}")
         
         # Decrement TTL
         ttl = message.get('ttl', 0) - 1
@@ -160,17 +233,10 @@ class GossipProtocol:
             print(f"Message {message_id} TTL expired")
             return True
         
-        # Update TTL
+        # Update TTL; the relay encodes the message after this, once, so
+        # every peer and later gossip round gets bytes with the lowered TTL
         message['ttl'] = ttl
         
-        # Handle the message based on its type
-        message_type = message.get('type')
-        if message_type in self.message_handlers:
-            try:
-                self.message_handlers[message_type](message, from_peer)
-            except Exception as e:
-                print(f"Error handling message of type {message_type}: {e}")
-        
         # Forward to other peers (gossip)
         self._relay_message(message, from_peer)
         
@@ -195,6 +261,9 @@ class GossipProtocol:
         self.register_handler('PEER_LIST', self._handle_peer_list)
         self.register_handler('PING', self._handle_ping)
         self.register_handler('PONG', self._handle_pong)
+        self.register_handler('DIGEST', self._handle_digest)
+        self.register_handler('SYNC_REQ', self._handle_sync_request)
+        self.register_handler('SYNC_RESP', self._handle_sync_response)
     
     def _handle_transaction(self, message: Dict[str, Any], from_peer: Optional[str]) -> None:
         """
@@ -261,6 +330,83 @@ class GossipProtocol:
             # Mark the peer as active
             self.node.peer_manager.mark_peer_active(from_peer)
     
+    def _handle_digest(self, message: Dict[str, Any], from_peer: Optional[str]) -> None:
+        """
+        Handle a digest message by sending the peer what it is missing.
+        
+        Our cached IDs are checked against the digest's Bloom filter. An ID
+        the filter rejects is certainly missing at the peer, so those
+        messages are pushed to it. Digests that list their IDs explicitly
+        (create_digest_message) also get a request for the IDs we lack.
+        
+        Args:
+            message: The digest message
+            from_peer: The ID of the peer that sent the message
+        """
+        payload = message.get('payload', {})
+        
+        # Request the messages the peer has that we haven't seen
+        with self.lock:
+            missing_ids = [
+                message_id for message_id in payload.get('message_ids', [])
+                if message_id not in self.seen_messages
+            ]
+        if missing_ids and from_peer:
+            self.send_to_peer(from_peer, 'SYNC_REQ', {'missing_ids': missing_ids})
+        
+        bloom_data = payload.get('bloom')
+        if not bloom_data or not from_peer:
+            return
+        
+        try:
+            peer_bloom = BloomFilter.from_dict(bloom_data)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Ignoring invalid digest filter from {from_peer}: {e}")
+            return
+        
+        # Push the messages the peer certainly doesn't have
+        with self.lock:
+            messages = [
+                self._cache_messages[position]
+                for position, message_id in enumerate(self._cache_ids)
+                if message_id not in peer_bloom
+            ]
+        if messages:
+            self.send_to_peer(from_peer, 'SYNC_RESP', {'messages': messages})
+    
+    def _handle_sync_request(self, message: Dict[str, Any], from_peer: Optional[str]) -> None:
+        """
+        Handle a sync request by sending the requested cached messages.
+        
+        Args:
+            message: The sync request message
+            from_peer: The ID of the peer that sent the message
+        """
+        if not from_peer:
+            return
+        
+        missing_ids = message.get('payload', {}).get('missing_ids', [])
+        with self.lock:
+            messages = [
+                self._cache_messages[self.message_cache[message_id]]
+                for message_id in missing_ids
+                if message_id in self.message_cache
+            ]
+        if messages:
+            self.send_to_peer(from_peer, 'SYNC_RESP', {'messages': messages})
+    
+    def _handle_sync_response(self, message: Dict[str, Any], from_peer: Optional[str]) -> None:
+        """
+        Handle a sync response by processing each message it carries.
+        
+        Args:
+            message: The sync response message
+            from_peer: The ID of the peer that sent the message
+        """
+        for synced_message in message.get('payload', {}).get('messages', []):
+            if isinstance(synced_message, dict):
+                self.receive_message(synced_message, from_peer)
+    
     def _broadcast_to_peers(self, message: Dict[str, Any]) -> None:
         """
         Broadcast a message to all connected peers.
@@ -268,9 +414,14 @@ class GossipProtocol:
         Args:
             message: The message to broadcast
         """
-        # This will be implemented once the transport module is created
-        # For now, we'll just print a message
-        print(f"Broadcasting message {message['id']} of type {message['type']}")
+        transport = getattr(self.node, 'transport', None)
+        if transport is None:
+            # No transport yet, so we'll just print a message
+            print(f"Broadcasting message {message['id']} of type {message['type']}")
+            return
+        
+        # Every peer gets the same pre-encoded bytes
+        transport.broadcast_tcp(self._encode_message(message))
     
     def _relay_message(self, message: Dict[str, Any], exclude_peer: Optional[str] = None) -> None:
         """
@@ -286,10 +437,43 @@ class GossipProtocol:
         if not peers_to_relay:
             return
         
-        # This will be implemented once the transport module is created
-        # For now, we'll just print a message
         peer_ids = [peer.get('id', 'unknown') for peer in peers_to_relay]
-        print(f"Relaying message {message['id']} to peers: {', '.join(peer_ids)}")
+        transport = getattr(self.node, 'transport', None)
+        if transport is None:
+            # No transport yet, so we'll just print a message
+            print(f"Relaying message {message['id']} to peers: {', '.join(peer_ids)}")
+            return
+        
+        # Encode once and hand the same bytes to every selected peer
+        data = self._encode_message(message)
+        for peer_id in peer_ids:
+            transport.send_tcp(peer_id, data)
+    
+    def _encode_message(self, message: Dict[str, Any]) -> bytes:
+        """
+        Get the JSON encoding of a message, serializing it at most once.
+        
+        The encoding is stored next to the message in the cache, so the
+        bytes handed to the transport (which accepts pre-encoded JSON) are
+        reused by every peer and later gossip round. It is built lazily
+        because receive_message updates the TTL after caching the message.
+        Messages that are not cached, such as digests, are encoded directly.
+        
+        Args:
+            message: The message to encode
+            
+        Returns:
+            bytes: The encoded message
+        """
+        with self.lock:
+            position = self.message_cache.get(message['id'])
+            if position is None or self._cache_messages[position] is not message:
+                return dumps(message)
+            
+            encoded = self._cache_encoded[position]
+            if encoded is None:
+                encoded = self._cache_encoded[position] = dumps(message)
+            return encoded
     
     def _select_peers_for_relay(self, exclude_peer: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -304,23 +488,41 @@ class GossipProtocol:
         if not hasattr(self.node, 'peer_manager'):
             return []
         
-        # Get active peers
-        active_peers = self.node.peer_manager.get_active_peers()
-        
-        # Filter out the excluded peer
-        if exclude_peer:
-            active_peers = [peer for peer in active_peers if peer.get('id') != exclude_peer]
-        
-        if not active_peers:
-            return []
+        # Select a random subset of active peers, skipping the excluded one
+        return self.node.peer_manager.get_random_peers(self.fanout, exclude_peer)
+    
+    def _run_event_loop(self) -> None:
+        """
+        Background thread that runs the gossip and anti-entropy coroutines.
+        """
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._run_background_loops())
+        finally:
+            self.loop.close()
+    
+    async def _run_background_loops(self) -> None:
+        """
+        Run the gossip and anti-entropy loops until the protocol is stopped.
+        """
+        self._stop_event = asyncio.Event()
+        await asyncio.gather(self._gossip_loop(), self._anti_entropy_loop())
+    
+    async def _sleep(self, seconds: float) -> None:
+        """
+        Sleep for the given time, returning early if the protocol is stopped.
         
-        # Select a random subset of peers
-        fanout = min(self.fanout, len(active_peers))
-        return random.sample(active_peers, fanout)
+        Args:
+            seconds: The time to sleep in seconds
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
     
-    def _gossip_loop(self) -> None:
+    async def _gossip_loop(self) -> None:
         """
-        Background thread that periodically gossips with peers.
+        Coroutine that periodically gossips with peers.
         """
         while self.running:
             try:
@@ -329,12 +531,15 @@ class GossipProtocol:
                 print(f"Error in gossip loop: {e}")
             
             # Sleep until next gossip interval
-            time.sleep(self.gossip_interval)
+            await self._sleep(self.gossip_interval)
     
     def _gossip_round(self) -> None:
         """
         Perform a round of gossip by sending a random recent message to random peers.
         """
+        # Drop expired messages so they are no longer gossiped
+        self._clean_message_cache()
+        
         # Get a random recent message from the cache
         message = self._get_random_recent_message()
         if not message:
@@ -354,13 +559,12 @@ class GossipProtocol:
             if not self.message_cache:
                 return None
             
-            # Get a random message ID
-            message_id = random.choice(list(self.message_cache.keys()))
-            return self.message_cache[message_id]['message']
+            # Get a random cached message
+            return self._cache_messages[random.randrange(len(self._cache_messages))]
     
-    def _anti_entropy_loop(self) -> None:
+    async def _anti_entropy_loop(self) -> None:
         """
-        Background thread that periodically performs anti-entropy synchronization with peers.
+        Coroutine that periodically performs anti-entropy synchronization with peers.
         """
         while self.running:
             try:
@@ -369,7 +573,7 @@ class GossipProtocol:
                 print(f"Error in anti-entropy loop: {e}")
             
             # Sleep until next anti-entropy interval
-            time.sleep(self.anti_entropy_interval)
+            await self._sleep(self.anti_entropy_interval)
     
     def _anti_entropy_round(self) -> None:
         """
@@ -393,35 +597,89 @@ class GossipProtocol:
         if not message_ids:
             return
         
-        # Create a digest message
-        digest_payload = {
-            'message_ids': message_ids
-        }
+        # Summarize the IDs in a Bloom filter so the peer can find what we
+        # are missing without an exact lookup per ID
+        bloom = BloomFilter(capacity=len(message_ids), error_rate=self.digest_error_rate)
+        for message_id in message_ids:
+            bloom.add(message_id)
         
-        # Broadcast the digest to the selected peer
-        self.broadcast('DIGEST', digest_payload, ttl=1)  # TTL of 1 so it only goes to the selected peer
+        # Send the digest to the selected peer only
+        self.send_to_peer(peer_id, 'DIGEST', {'bloom': bloom.to_dict()})
         
         print(f"Sent digest with {len(message_ids)} message IDs to peer {peer_id}")
     
+    def _cache_message(self, message_id: str, message: Dict[str, Any]) -> None:
+        """
+        Add a message to the cache. Must be called with the lock held.
+        
+        Args:
+            message_id: The ID of the message
+            message: The message to cache
+        """
+        timestamp = time.monotonic()
+        position = self.message_cache.get(message_id)
+        if position is None:
+            self.message_cache[message_id] = len(self._cache_ids)
+            self._cache_ids.append(message_id)
+            self._cache_messages.append(message)
+            self._cache_encoded.append(None)
+            self._cache_timestamps.append(timestamp)
+        else:
+            self._cache_messages[position] = message
+            self._cache_encoded[position] = None
+            self._cache_timestamps[position] = timestamp
+        
+        self._expiry_queue.append((timestamp, message_id))
+    
+    def _evict_cached_message(self, message_id: str) -> None:
+        """
+        Remove a message from the cache. Must be called with the lock held.
+        
+        The last slot of every column is moved into the freed slot so that
+        removal stays O(1).
+        
+        Args:
+            message_id: The ID of the message to remove
+        """
+        position = self.message_cache.pop(message_id)
+        last_id = self._cache_ids.pop()
+        last_message = self._cache_messages.pop()
+        last_encoded = self._cache_encoded.pop()
+        last_timestamp = self._cache_timestamps.pop()
+        
+        if last_id != message_id:
+            self._cache_ids[position] = last_id
+            self._cache_messages[position] = last_message
+            self._cache_encoded[position] = last_encoded
+            self._cache_timestamps[position] = last_timestamp
+            self.message_cache[last_id] = position
+    
     def _clean_message_cache(self) -> None:
         """
         Clean up old messages from the cache.
+        
+        Cache times come from the monotonic clock, so the expiry queue is
+        already sorted and a pass pops expired entries off its front with
+        O(1) deque operations, touching only the messages that expired.
         """
-        current_time = time.time()
+        cutoff = time.monotonic() - self.cache_expiry
+        expired_count = 0
         with self.lock:
-            # Find expired messages
-            expired_ids = []
-            for message_id, cache_entry in self.message_cache.items():
-                if current_time - cache_entry['timestamp'] > self.cache_expiry:
-                    expired_ids.append(message_id)
-            
-            # Remove expired messages
-            for message_id in expired_ids:
-                del self.message_cache[message_id]
-                self.seen_messages.discard(message_id)
+            queue = self._expiry_queue
+            while queue and queue[0][0] < cutoff:
+                timestamp, message_id = queue.popleft()
+                
+                # Skip queue entries superseded by a later re-cache of the message
+                position = self.message_cache.get(message_id)
+                if position is None or self._cache_timestamps[position] != timestamp:
+                    continue
+                
+                # Seen IDs age out of the Bloom filter on their own
+                self._evict_cached_message(message_id)
+                expired_count += 1
             
-            if expired_ids:
-                print(f"Cleaned {len(expired_ids)} expired messages from cache")
+            if expired_count:
+                print(f"Cleaned {expired_count} expired messages from cache")
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -1,9 +1,47 @@
-import json
+import itertools
+import os
+import struct
+import sys
 import time
-import uuid
 from enum import Enum, auto
 from typing import Dict, Any, Optional, Union, List
 
+from ..utils.serialization import dumps, loads
+
+# Message IDs are 16 bytes: creation time in nanoseconds, a 4-byte tag
+# identifying the producer and a counter, sent as 32 hex digits. The time
+# comes first, so IDs sort by creation time.
+MESSAGE_ID_FORMAT = struct.Struct('>QII')
+_id_tag = int.from_bytes(os.urandom(4), 'big')
+_id_counter = itertools.count()
+
+def _reseed_message_ids() -> None:
+    """Give a forked child process its own message ID tag."""
+    global _id_tag, _id_counter
+    _id_tag = int.from_bytes(os.urandom(4), 'big')
+    _id_counter = itertools.count()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_message_ids)
+
+def new_message_id(timestamp_ns: Optional[int] = None, tag: Optional[int] = None) -> str:
+    """
+    Generate a unique, time-ordered message ID.
+    
+    Args:
+        timestamp_ns: The creation time in nanoseconds (defaults to now)
+        tag: A 32-bit producer tag (defaults to a random per-process tag)
+        
+    Returns:
+        str: 16 bytes encoded as 32 hex digits
+    """
+    if timestamp_ns is None:
+        timestamp_ns = time.time_ns()
+    if tag is None:
+        tag = _id_tag
+    counter = next(_id_counter) & 0xFFFFFFFF
+    return MESSAGE_ID_FORMAT.pack(timestamp_ns, tag, counter).hex()
+
 class MessageType(Enum):
     """Enumeration of message types used in the network protocol."""
     TRANSACTION = auto()  # A new transaction
@@ -15,18 +53,26 @@ class MessageType(Enum):
     SYNC_REQ = auto()     # Request for missing messages
     SYNC_RESP = auto()    # Response with requested messages
 
+# Maps each MessageType, and each known type name, to one interned name
+# string, so type normalization is a single dict lookup
+_TYPE_NAMES = {message_type: sys.intern(message_type.name) for message_type in MessageType}
+_TYPE_NAMES.update({name: name for name in list(_TYPE_NAMES.values())})
+
 class Message:
     """
     Represents a message in the network protocol.
     Messages are serialized to JSON for transmission over the network.
     """
     
+    __slots__ = ('id', 'type', 'sender', 'timestamp', 'ttl', 'payload')
+    
     def __init__(self, 
                  message_type: Union[MessageType, str], 
                  payload: Dict[str, Any], 
                  sender: Optional[str] = None,
                  message_id: Optional[str] = None,
-                 ttl: int = 10):
+                 ttl: int = 10,
+                 timestamp: Optional[float] = None):
         """
         Initialize a new message.
         
@@ -36,17 +82,15 @@ class Message:
             sender: The ID of the sender node
             message_id: Optional unique identifier for this message
             ttl: Time-to-live for the message (hops)
+            timestamp: The time the message was created (defaults to current time)
         """
-        self.id = message_id or str(uuid.uuid4())
+        self.id = message_id or new_message_id()
+        
+        # Convert MessageType enum to its (interned) name if needed
+        self.type = _TYPE_NAMES.get(message_type, message_type)
         
-        # Convert MessageType enum to string if needed
-        if isinstance(message_type, MessageType):
-            self.type = message_type.name
-        else:
-            self.type = message_type
-            
         self.sender = sender
-        self.timestamp = time.time()
+        self.timestamp = timestamp or time.time()
         self.ttl = ttl
         self.payload = payload
     
@@ -73,7 +117,16 @@ class Message:
         Returns:
             str: The message as a JSON string
         """
-        return json.dumps(self.to_dict())
+        return self.to_bytes().decode()
+    
+    def to_bytes(self) -> bytes:
+        """
+        Convert the message to UTF-8 encoded JSON, ready to be sent.
+        
+        Returns:
+            bytes: The message as JSON bytes
+        """
+        return dumps(self.to_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Message':
@@ -91,7 +144,8 @@ class Message:
             payload=data.get('payload', {}),
             sender=data.get('sender'),
             message_id=data.get('id'),
-            ttl=data.get('ttl', 10)
+            ttl=data.get('ttl', 10),
+            timestamp=data.get('timestamp')
         )
     
     @classmethod
@@ -105,9 +159,22 @@ class Message:
         Returns:
             Message: The created message
         """
-        data = json.loads(json_str)
+        data = loads(json_str)
         return cls.from_dict(data)
     
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Message':
+        """
+        Create a message from UTF-8 encoded JSON without decoding it to a string first.
+        
+        Args:
+            data: The JSON bytes to create the message from
+            
+        Returns:
+            Message: The created message
+        """
+        return cls.from_dict(loads(data))
+    
     def decrement_ttl(self) -> bool:
         """
         Decrement the TTL of the message.
@@ -166,6 +233,11 @@ def create_ping_message(sender: str, ttl: int = 1) -> Message:
     """
     Create a ping message for heartbeat.
     
+    Besides the wall-clock timestamp, the payload carries the sender's
+    monotonic clock in integer nanoseconds. The pong echoes it back, so the
+    round trip can be measured locally without being affected by clock
+    adjustments or by the skew between the two nodes.
+    
     Args:
         sender: The ID of the sender node
         ttl: Time-to-live for the message
@@ -173,14 +245,16 @@ def create_ping_message(sender: str, ttl: int = 1) -> Message:
     Returns:
         Message: The created ping message
     """
+    now = time.time()
     return Message(
         message_type=MessageType.PING,
-        payload={'timestamp': time.time()},
+        payload={'timestamp': now, 'sent_ns': time.monotonic_ns()},
         sender=sender,
-        ttl=ttl
+        ttl=ttl,
+        timestamp=now
     )
 
-def create_pong_message(ping_id: str, sender: str, ttl: int = 1) -> Message:
+def create_pong_message(ping_id: str, sender: str, ttl: int = 1, sent_ns: Optional[int] = None) -> Message:
     """
     Create a pong message in response to a ping.
     
@@ -188,17 +262,43 @@ def create_pong_message(ping_id: str, sender: str, ttl: int = 1) -> Message:
         ping_id: The ID of the ping message being responded to
         sender: The ID of the sender node
         ttl: Time-to-live for the message
+        sent_ns: The monotonic send time from the ping payload, echoed back unchanged
         
     Returns:
         Message: The created pong message
     """
+    now = time.time()
+    payload = {'ping_id': ping_id, 'timestamp': now}
+    if sent_ns is not None:
+        payload['sent_ns'] = sent_ns
+    
     return Message(
         message_type=MessageType.PONG,
-        payload={'ping_id': ping_id, 'timestamp': time.time()},
+        payload=payload,
         sender=sender,
-        ttl=ttl
+        ttl=ttl,
+        timestamp=now
     )
 
+def round_trip_ns(pong: Message) -> Optional[int]:
+    """
+    Measure the round trip of a ping from the pong that answered it.
+    
+    Only meaningful on the node that sent the ping, since the echoed value
+    comes from that node's monotonic clock.
+    
+    Args:
+        pong: The pong message received in response to our ping
+        
+    Returns:
+        Optional[int]: The round-trip time in nanoseconds, or None if the pong carries no send time
+    """
+    sent_ns = pong.payload.get('sent_ns')
+    if sent_ns is None:
+        return None
+    
+    return time.monotonic_ns() - sent_ns
+
 def create_peer_list_message(peers: List[Dict[str, Any]], sender: str, ttl: int = 1) -> Message:
     """
     Create a peer list message.
@@ -218,7 +318,8 @@ def create_peer_list_message(peers: List[Dict[str, Any]], sender: str, ttl: int
         ttl=ttl
     )
 
-def create_digest_message(message_ids: List[str], sender: str, ttl: int = 1) -> Message:
+def create_digest_message(message_ids: List[str], sender: str, ttl: int = 1,
+                          bloom: Optional[Dict[str, Any]] = None) -> Message:
     """
     Create a digest message for anti-entropy.
     
@@ -226,13 +327,18 @@ def create_digest_message(message_ids: List[str], sender: str, ttl: int = 1) ->
         message_ids: The list of message IDs to include in the digest
         sender: The ID of the sender node
         ttl: Time-to-live for the message
+        bloom: Optional Bloom filter over the IDs, as produced by BloomFilter.to_dict
         
     Returns:
         Message: The created digest message
     """
+    payload = {'message_ids': message_ids}
+    if bloom is not None:
+        payload['bloom'] = bloom
+    
     return Message(
         message_type=MessageType.DIGEST,
-        payload={'message_ids': message_ids},
+        payload=payload,
         sender=sender,
         ttl=ttl
     )
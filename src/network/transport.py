@@ -1,13 +1,38 @@
 import socket
 import threading
-import json
 import time
-import select
-import queue
-from typing import Dict, List, Tuple, Optional, Any, Callable, Set
+import selectors
+import struct
+from collections import deque
+from typing import Dict, List, Tuple, Optional, Any, Callable, Set, Union, Iterable
 
-# Will be imported once these modules are created
-# from .message import Message
+from ..utils.logger import get_logger
+from ..utils.serialization import dumps, loads
+from .message import Message
+
+logger = get_logger('transport')
+
+# TCP messages are framed by a 4-byte big-endian length prefix
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 16 * 1024 * 1024  # bytes
+
+# Most frames handed to the kernel in one scatter-gather write
+SEND_BATCH_MESSAGES = 64
+
+# Frames queued per peer before the peer is disconnected, so a slow peer
+# can't grow its backlog without bound
+PEER_QUEUE_LIMIT = 4096
+
+# Upper bound on connections accepted per listener wake-up, so a burst of
+# new peers can't starve reads on the established connections
+ACCEPT_BATCH = 64
+
+# Kernel send buffer requested for peer connections, large enough to take
+# a full send batch in one write
+SOCKET_SEND_BUFFER = 1 << 20  # bytes
+
+# Anything the send methods accept: a dict, a Message, or pre-encoded JSON
+OutgoingData = Union[Dict[str, Any], Message, bytes]
 
 class Transport:
     """
@@ -31,6 +56,8 @@ class Transport:
         
         # TCP socket for reliable communication
         self.tcp_socket = None
+        # tcp_connections and peer_queues are copy-on-write: writers replace
+        # them under tcp_lock, so readers can use them without locking
         self.tcp_connections = {}  # Dict[str, socket.socket] - Maps peer_id to socket
         self.tcp_lock = threading.RLock()
         
@@ -39,19 +66,35 @@ class Transport:
         self.udp_lock = threading.RLock()
         
         # Message handlers
-        self.message_handlers = []
-        
-        # Background threads
-        self.tcp_listen_thread = None
-        self.udp_listen_thread = None
+        self.message_handlers = []  # Handlers called for every message
+        self.typed_handlers = {}  # Dict[str, List[Callable]] - Handlers per message type
+        
+        # Single I/O thread that waits on every socket with one selector
+        self.selector = None
+        self.io_thread = None
+        self._receive_buffers = {}  # Dict[socket.socket, bytearray] - Partial frames per connection
+        self._recv_scratch = None  # Reused recv_into target, owned by the I/O thread
+        self._pending_watch = []  # Connections to register with the selector
+        self._pending_close = []  # Connections to unregister and close
+        self._pending_writes = set()  # Peers with newly queued frames to flush
+        self._unsent = {}  # Dict[socket.socket, List[memoryview]] - Partially written frames
+        self._wakeup_reader = None
+        self._wakeup_writer = None
         
         # Connection parameters
         self.connection_timeout = 5  # seconds
-        self.buffer_size = 4096  # bytes
+        self.buffer_size = 65536  # bytes
         self.max_connections = 100
         
-        # Message queues for async sending
-        self.send_queue = queue.Queue()
+        # Outbound TCP frames, queued per peer and written by the I/O thread
+        # whenever the peer's socket is writable, so one slow peer can't
+        # hold up the others
+        self.peer_queues = {}  # Dict[str, deque] - Framed messages per peer
+        self.overflow_disconnects = 0  # Peers dropped for falling PEER_QUEUE_LIMIT frames behind
+        
+        # Datagram queue for async sending; the event wakes the send thread
+        self.send_queue = deque()  # (host, port) and encoded datagram pairs
+        self._send_event = threading.Event()
         self.send_thread = None
     
     def start(self) -> bool:
@@ -70,7 +113,7 @@ class Transport:
             self.tcp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.tcp_socket.bind((self.host, self.port))
             self.tcp_socket.listen(self.max_connections)
-            self.tcp_socket.settimeout(0.1)  # Non-blocking with short timeout
+            self.tcp_socket.setblocking(False)  # Accepts are drained until the backlog is empty
             
             # Initialize UDP socket
             self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -78,22 +121,30 @@ class Transport:
             self.udp_socket.bind((self.host, self.port))
             self.udp_socket.settimeout(0.1)  # Non-blocking with short timeout
             
+            # Register the listening sockets, plus a socket pair that other
+            # threads write to when they need the I/O loop to wake up
+            self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+            self._wakeup_reader.setblocking(False)
+            self._wakeup_writer.setblocking(False)
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.tcp_socket, selectors.EVENT_READ)
+            self.selector.register(self.udp_socket, selectors.EVENT_READ)
+            self.selector.register(self._wakeup_reader, selectors.EVENT_READ)
+            self._recv_scratch = memoryview(bytearray(self.buffer_size))
+            
             self.running = True
-            print(f"Transport layer started on {self.host}:{self.port}")
+            logger.info("Transport layer started on %s:%s", self.host, self.port)
             
             # Start background threads
-            self.tcp_listen_thread = threading.Thread(target=self._tcp_listen_loop, daemon=True)
-            self.tcp_listen_thread.start()
-            
-            self.udp_listen_thread = threading.Thread(target=self._udp_listen_loop, daemon=True)
-            self.udp_listen_thread.start()
+            self.io_thread = threading.Thread(target=self._io_loop, daemon=True)
+            self.io_thread.start()
             
             self.send_thread = threading.Thread(target=self._send_loop, daemon=True)
             self.send_thread.start()
             
             return True
         except Exception as e:
-            print(f"Error starting transport layer: {e}")
+            logger.error("Error starting transport layer: %s", e)
             self.stop()
             return False
     
@@ -103,7 +154,13 @@ class Transport:
             return
             
         self.running = False
-        print(f"Transport layer stopping on {self.host}:{self.port}")
+        logger.info("Transport layer stopping on %s:%s", self.host, self.port)
+        
+        # Let the I/O loop exit before its sockets are closed
+        self._send_event.set()
+        self._wake_io_loop()
+        if self.io_thread:
+            self.io_thread.join(timeout=1.0)
         
         # Close all TCP connections
         with self.tcp_lock:
@@ -112,7 +169,13 @@ class Transport:
                     conn.close()
                 except:
                     pass
-            self.tcp_connections.clear()
+            self.tcp_connections = {}
+            self.peer_queues = {}
+            self._pending_watch.clear()
+            self._pending_close.clear()
+            self._pending_writes.clear()
+        self._receive_buffers.clear()
+        self._unsent.clear()
         
         # Close sockets
         if self.tcp_socket:
@@ -129,13 +192,16 @@ class Transport:
                 pass
             self.udp_socket = None
         
-        # Wait for threads to exit
-        if self.tcp_listen_thread:
-            self.tcp_listen_thread.join(timeout=1.0)
+        if self.selector:
+            self.selector.close()
+            self.selector = None
         
-        if self.udp_listen_thread:
-            self.udp_listen_thread.join(timeout=1.0)
+        for wakeup_socket in (self._wakeup_reader, self._wakeup_writer):
+            if wakeup_socket:
+                wakeup_socket.close()
+        self._wakeup_reader = self._wakeup_writer = None
         
+        # Wait for threads to exit
         if self.send_thread:
             self.send_thread.join(timeout=1.0)
     
@@ -156,27 +222,27 @@ class Transport:
         peer_id = f"{host}:{port}"
         
         # Check if already connected
-        with self.tcp_lock:
-            if peer_id in self.tcp_connections:
-                return True
+        if peer_id in self.tcp_connections:
+            return True
         
         try:
             # Create a new socket for this connection
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(self.connection_timeout)
+            _configure_stream_socket(sock)
             sock.connect((host, port))
+            sock.setblocking(False)  # Reads and writes wait on the selector instead
             
-            # Add to connections
+            # Add to connections and have the I/O loop watch for incoming messages
             with self.tcp_lock:
-                self.tcp_connections[peer_id] = sock
-            
-            # Start a thread to handle incoming messages from this peer
-            threading.Thread(target=self._handle_tcp_connection, args=(sock, peer_id), daemon=True).start()
+                self._add_connection(peer_id, sock)
+                self._pending_watch.append((sock, peer_id))
+            self._wake_io_loop()
             
-            print(f"Connected to peer at {host}:{port}")
+            logger.info("Connected to peer at %s:%s", host, port)
             return True
         except Exception as e:
-            print(f"Error connecting to peer at {host}:{port}: {e}")
+            logger.error("Error connecting to peer at %s:%s: %s", host, port, e)
             return False
     
     def disconnect(self, peer_id: str) -> bool:
@@ -192,215 +258,437 @@ class Transport:
         with self.tcp_lock:
             if peer_id not in self.tcp_connections:
                 return False
-                
-            try:
-                self.tcp_connections[peer_id].close()
-            except:
-                pass
-                
-            del self.tcp_connections[peer_id]
-            print(f"Disconnected from peer {peer_id}")
-            return True
+            
+            # The I/O loop owns the selector, so it unregisters and closes the socket
+            sock = self._remove_connection(peer_id)
+            self._pending_close.append(sock)
+            logger.info("Disconnected from peer %s", peer_id)
+        
+        self._wake_io_loop()
+        return True
     
-    def send_tcp(self, peer_id: str, data: Dict[str, Any]) -> bool:
+    def send_tcp(self, peer_id: str, data: OutgoingData) -> bool:
         """
         Send data to a peer over TCP.
         
         Args:
             peer_id: The ID of the peer to send to
-            data: The data to send
+            data: The data to send, as a dict, a Message or pre-encoded JSON bytes
             
         Returns:
             bool: True if the data was sent successfully, False otherwise
         """
-        # Queue the message for async sending
-        self.send_queue.put(('tcp', peer_id, data))
-        return True
+        queue = self.peer_queues.get(peer_id)
+        if queue is None:
+            return False
+        
+        frame = self._encode_frame(data)
+        if frame is None:
+            return False
+        
+        # Queue the message for the I/O thread to write
+        return self._enqueue_frame(peer_id, queue, frame)
     
-    def send_udp(self, host: str, port: int, data: Dict[str, Any]) -> bool:
+    def send_udp(self, host: str, port: int, data: OutgoingData) -> bool:
         """
         Send data to a peer over UDP.
         
         Args:
             host: The hostname or IP address of the peer
             port: The port the peer is listening on
-            data: The data to send
+            data: The data to send, as a dict, a Message or pre-encoded JSON bytes
             
         Returns:
             bool: True if the data was sent successfully, False otherwise
         """
+        datagram = self._encode_datagram(data)
+        if datagram is None:
+            return False
+        
         # Queue the message for async sending
-        self.send_queue.put(('udp', (host, port), data))
+        self.send_queue.append(((host, port), datagram))
+        self._send_event.set()
         return True
     
-    def broadcast_tcp(self, data: Dict[str, Any], exclude_peers: Optional[Set[str]] = None) -> None:
+    def broadcast_tcp(self, data: OutgoingData, exclude_peers: Optional[Set[str]] = None) -> None:
         """
         Broadcast data to all connected TCP peers.
         
         Args:
-            data: The data to broadcast
+            data: The data to broadcast, as a dict, a Message or pre-encoded JSON bytes
             exclude_peers: Optional set of peer IDs to exclude from the broadcast
         """
         exclude_peers = exclude_peers or set()
         
-        with self.tcp_lock:
-            for peer_id in self.tcp_connections:
-                if peer_id not in exclude_peers:
-                    self.send_queue.put(('tcp', peer_id, data))
+        # Encode once; every peer's queue entry shares the same frame
+        frame = self._encode_frame(data)
+        if frame is None:
+            return
+        
+        for peer_id, queue in self.peer_queues.items():
+            if peer_id not in exclude_peers:
+                self._enqueue_frame(peer_id, queue, frame)
     
-    def broadcast_udp(self, data: Dict[str, Any], peers: List[Tuple[str, int]]) -> None:
+    def broadcast_udp(self, data: OutgoingData, peers: List[Tuple[str, int]]) -> None:
         """
         Broadcast data to a list of peers over UDP.
         
         Args:
-            data: The data to broadcast
+            data: The data to broadcast, as a dict, a Message or pre-encoded JSON bytes
             peers: List of (host, port) tuples to broadcast to
         """
-        for host, port in peers:
-            self.send_queue.put(('udp', (host, port), data))
+        # Encode once; every peer's queue entry shares the same datagram
+        datagram = self._encode_datagram(data)
+        if datagram is None:
+            return
+        
+        self.send_queue.extend(((host, port), datagram) for host, port in peers)
+        self._send_event.set()
+    
+    def _enqueue_frame(self, peer_id: str, queue: deque, frame: bytes) -> bool:
+        """
+        Queue a frame for a peer and make sure the I/O thread will flush it.
+        
+        The I/O loop is only woken for the first frame queued since its last
+        pass over the pending writes; later frames ride along with it. A peer
+        that already has PEER_QUEUE_LIMIT frames waiting is disconnected
+        rather than having frames dropped from the middle of its stream.
+        
+        Args:
+            peer_id: The ID of the peer to send to
+            queue: The peer's outbound queue
+            frame: The framed message
+            
+        Returns:
+            bool: True if the frame was queued, False if the peer was disconnected
+        """
+        with self.tcp_lock:
+            if len(queue) >= PEER_QUEUE_LIMIT:
+                overflowed = True
+            else:
+                overflowed = False
+                queue.append(frame)
+                wake = peer_id not in self._pending_writes
+                if wake:
+                    self._pending_writes.add(peer_id)
+        
+        if overflowed:
+            logger.warning("Peer %s fell %d frames behind, disconnecting", peer_id, PEER_QUEUE_LIMIT)
+            if self.disconnect(peer_id):
+                self.overflow_disconnects += 1
+            return False
+        
+        if wake:
+            self._wake_io_loop()
+        return True
+    
+    def _encode_datagram(self, data: OutgoingData) -> Optional[bytes]:
+        """
+        Encode data for sending, unless the caller already encoded it.
+        
+        Args:
+            data: The data to encode, as a dict, a Message or pre-encoded JSON bytes
+            
+        Returns:
+            Optional[bytes]: The encoded message, or None if it can't be serialized
+        """
+        if isinstance(data, bytes):
+            return data
+        
+        try:
+            # Messages encode straight from their fields
+            if isinstance(data, Message):
+                return data.to_bytes()
+            return dumps(data)
+        except Exception as e:
+            logger.error("Error serializing message: %s", e)
+            return None
     
-    def register_message_handler(self, handler: Callable[[Dict[str, Any], Optional[str]], None]) -> None:
+    def _encode_frame(self, data: OutgoingData) -> Optional[bytes]:
+        """
+        Encode data as a length-prefixed TCP frame.
+        
+        Args:
+            data: The data to encode, as a dict, a Message or pre-encoded JSON bytes
+            
+        Returns:
+            Optional[bytes]: The framed message, or None if it can't be serialized
+        """
+        body = self._encode_datagram(data)
+        if body is None:
+            return None
+        return FRAME_HEADER.pack(len(body)) + body
+    
+    def register_message_handler(self, handler: Callable[[Dict[str, Any], Optional[str]], None],
+                                 message_types: Optional[Iterable[str]] = None) -> None:
         """
         Register a handler for incoming messages.
         
         Args:
             handler: The handler function to call when a message is received
+            message_types: The message types the handler is interested in, or None for all messages
+        """
+        if message_types is None:
+            self.message_handlers.append(handler)
+            return
+        
+        for message_type in message_types:
+            self.typed_handlers.setdefault(message_type, []).append(handler)
+    
+    def _add_connection(self, peer_id: str, sock: socket.socket) -> None:
+        """
+        Publish a new connection and its outbound queue. Must be called with tcp_lock held.
+        
+        Args:
+            peer_id: The ID of the peer
+            sock: The connected socket
         """
-        self.message_handlers.append(handler)
+        self.tcp_connections = {**self.tcp_connections, peer_id: sock}
+        self.peer_queues = {**self.peer_queues, peer_id: deque()}
     
-    def _tcp_listen_loop(self) -> None:
+    def _remove_connection(self, peer_id: str) -> socket.socket:
         """
-        Background thread that listens for incoming TCP connections.
+        Unpublish a connection and its outbound queue. Must be called with tcp_lock held.
+        
+        Args:
+            peer_id: The ID of the peer
+            
+        Returns:
+            socket.socket: The socket of the removed connection
         """
-        while self.running and self.tcp_socket:
-            try:
-                # Accept new connections
-                try:
-                    client_socket, client_address = self.tcp_socket.accept()
-                    client_socket.settimeout(None)  # Set to blocking mode for the handler thread
-                    
-                    # Get peer ID
-                    host, port = client_address
-                    peer_id = f"{host}:{port}"
-                    
-                    # Add to connections
-                    with self.tcp_lock:
-                        self.tcp_connections[peer_id] = client_socket
-                    
-                    # Start a thread to handle this connection
-                    threading.Thread(target=self._handle_tcp_connection, args=(client_socket, peer_id), daemon=True).start()
-                    
-                    print(f"Accepted connection from {peer_id}")
-                except socket.timeout:
-                    # No new connections, continue
-                    pass
-                except Exception as e:
-                    if self.running:  # Only log if we're still supposed to be running
-                        print(f"Error accepting TCP connection: {e}")
-            except Exception as e:
-                if self.running:  # Only log if we're still supposed to be running
-                    print(f"Error in TCP listen loop: {e}")
+        connections = dict(self.tcp_connections)
+        sock = connections.pop(peer_id)
+        queues = dict(self.peer_queues)
+        queues.pop(peer_id, None)
+        
+        self.tcp_connections = connections
+        self.peer_queues = queues
+        return sock
+    
+    def _wake_io_loop(self) -> None:
+        """
+        Interrupt the I/O loop's wait so it picks up pending changes.
+        """
+        try:
+            if self._wakeup_writer:
+                self._wakeup_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            # A full wake-up buffer already guarantees a wake-up
+            pass
     
-    def _udp_listen_loop(self) -> None:
+    def _io_loop(self) -> None:
         """
-        Background thread that listens for incoming UDP packets.
+        Background thread that serves every socket from one selector.
+        
+        The listening TCP socket, the UDP socket and all peer connections are
+        registered with a selectors.DefaultSelector (epoll on Linux), so one
+        thread handles any number of peers and only wakes up when a socket is
+        readable or another thread asks it to. A connection is also watched
+        for writability while it has frames the kernel couldn't take yet.
         """
-        while self.running and self.udp_socket:
+        while self.running:
             try:
-                # Receive UDP packets
+                self._apply_pending_changes()
+                events = self.selector.select(timeout=1.0)
+            except Exception as e:
+                if self.running:  # Only log if we're still supposed to be running
+                    logger.error("Error in I/O loop: %s", e)
+                continue
+            
+            for key, mask in events:
+                if not self.running:
+                    break
+                
+                sock = key.fileobj
                 try:
-                    data, addr = self.udp_socket.recvfrom(self.buffer_size)
-                    host, port = addr
-                    peer_id = f"{host}:{port}"
-                    
-                    # Process the received data
-                    self._process_udp_data(data, peer_id, addr)
-                except socket.timeout:
-                    # No data received, continue
-                    pass
+                    if sock is self._wakeup_reader:
+                        sock.recv(4096)
+                    elif sock is self.tcp_socket:
+                        self._accept_tcp_connection()
+                    elif sock is self.udp_socket:
+                        self._receive_udp_packet()
+                    else:
+                        if mask & selectors.EVENT_READ:
+                            self._receive_tcp_data(sock, key.data)
+                        if mask & selectors.EVENT_WRITE and sock in self._receive_buffers:
+                            self._flush_tcp_queue(sock, key.data)
                 except Exception as e:
                     if self.running:  # Only log if we're still supposed to be running
-                        print(f"Error receiving UDP packet: {e}")
-            except Exception as e:
-                if self.running:  # Only log if we're still supposed to be running
-                    print(f"Error in UDP listen loop: {e}")
+                        logger.error("Error in I/O loop: %s", e)
     
-    def _handle_tcp_connection(self, sock: socket.socket, peer_id: str) -> None:
+    def _apply_pending_changes(self) -> None:
+        """
+        Register new connections, close dropped ones and flush newly queued
+        frames, in the I/O thread.
         """
-        Handle an established TCP connection.
+        with self.tcp_lock:
+            to_close, self._pending_close = self._pending_close, []
+            to_watch, self._pending_watch = self._pending_watch, []
+            to_write, self._pending_writes = self._pending_writes, set()
+        
+        # Close first, since a new socket may reuse a closed descriptor
+        for sock in to_close:
+            self._close_socket(sock)
+        
+        for sock, peer_id in to_watch:
+            if sock.fileno() == -1:
+                continue  # Disconnected before it was ever watched
+            self._receive_buffers[sock] = bytearray()
+            self.selector.register(sock, selectors.EVENT_READ, peer_id)
+        
+        # Write straight away; only what the kernel can't take waits for EVENT_WRITE
+        for peer_id in to_write:
+            sock = self.tcp_connections.get(peer_id)
+            if sock is not None and sock in self._receive_buffers and sock not in self._unsent:
+                self._flush_tcp_queue(sock, peer_id)
+    
+    def _close_socket(self, sock: socket.socket) -> None:
+        """
+        Stop watching a connection and close it. Must run in the I/O thread.
         
         Args:
-            sock: The socket for this connection
-            peer_id: The ID of the peer
+            sock: The socket to close
         """
         try:
-            # Set socket to non-blocking mode
-            sock.setblocking(False)
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        
+        self._receive_buffers.pop(sock, None)
+        self._unsent.pop(sock, None)
+        try:
+            sock.close()
+        except:
+            pass
+    
+    def _drop_connection(self, sock: socket.socket, peer_id: str) -> None:
+        """
+        Forget a failed connection and close it. Must run in the I/O thread.
+        
+        Args:
+            sock: The socket of the connection
+            peer_id: The ID of the peer
+        """
+        with self.tcp_lock:
+            if self.tcp_connections.get(peer_id) is sock:
+                self._remove_connection(peer_id)
+        self._close_socket(sock)
+        
+        logger.info("Connection with %s closed", peer_id)
+    
+    def _accept_tcp_connection(self) -> None:
+        """
+        Accept pending TCP connections and start watching them.
+        
+        The listening socket is non-blocking, so every connection already
+        waiting in the backlog (up to ACCEPT_BATCH) is accepted on a single
+        wake-up instead of costing one selector round trip each.
+        """
+        for _ in range(ACCEPT_BATCH):
+            try:
+                client_socket, client_address = self.tcp_socket.accept()
+            except (socket.timeout, BlockingIOError):
+                return  # The backlog is empty
+            client_socket.setblocking(False)
+            _configure_stream_socket(client_socket)
             
-            # Buffer for incomplete data
-            buffer = b''
+            # Get peer ID
+            host, port = client_address
+            peer_id = f"{host}:{port}"
             
-            while self.running:
-                # Check if the connection is still in our list
-                with self.tcp_lock:
-                    if peer_id not in self.tcp_connections:
-                        break
-                
-                # Try to receive data
-                try:
-                    ready_to_read, _, _ = select.select([sock], [], [], 0.1)
-                    if ready_to_read:
-                        data = sock.recv(self.buffer_size)
-                        if not data:  # Connection closed by peer
-                            break
-                        
-                        # Add to buffer
-                        buffer += data
-                        
-                        # Process complete messages in the buffer
-                        buffer = self._process_tcp_buffer(buffer, peer_id)
-                except ConnectionError:
-                    # Connection lost
-                    break
-                except Exception as e:
-                    print(f"Error handling TCP connection from {peer_id}: {e}")
-                    break
-        finally:
-            # Clean up the connection
+            # Add to connections
             with self.tcp_lock:
-                if peer_id in self.tcp_connections:
-                    try:
-                        self.tcp_connections[peer_id].close()
-                    except:
-                        pass
-                    del self.tcp_connections[peer_id]
+                self._add_connection(peer_id, client_socket)
+            
+            self._receive_buffers[client_socket] = bytearray()
+            self.selector.register(client_socket, selectors.EVENT_READ, peer_id)
             
-            print(f"Connection with {peer_id} closed")
+            logger.info("Accepted connection from %s", peer_id)
+    
+    def _receive_udp_packet(self) -> None:
+        """
+        Receive and process one UDP packet.
+        """
+        try:
+            data, addr = self.udp_socket.recvfrom(self.buffer_size)
+        except (socket.timeout, BlockingIOError):
+            return
+        
+        host, port = addr
+        peer_id = f"{host}:{port}"
+        
+        # Process the received data
+        self._process_udp_data(data, peer_id, addr)
+    
+    def _receive_tcp_data(self, sock: socket.socket, peer_id: str) -> None:
+        """
+        Read from a readable TCP connection and handle any complete messages.
+        
+        Args:
+            sock: The readable socket
+            peer_id: The ID of the peer
+        """
+        try:
+            scratch = self._recv_scratch
+            received = sock.recv_into(scratch)
+            if not received:  # Connection closed by peer
+                raise ConnectionError("connection closed by peer")
+            
+            # Append in place and process complete messages in the buffer
+            buffer = self._receive_buffers.setdefault(sock, bytearray())
+            buffer += scratch[:received]
+            self._process_tcp_buffer(buffer, peer_id)
+            return
+        except BlockingIOError:
+            return  # Spurious wake-up; nothing to read yet
+        except ConnectionError:
+            # Connection lost
+            pass
+        except Exception as e:
+            logger.error("Error handling TCP connection from %s: %s", peer_id, e)
+        
+        # Clean up the connection
+        self._drop_connection(sock, peer_id)
     
-    def _process_tcp_buffer(self, buffer: bytes, peer_id: str) -> bytes:
+    def _process_tcp_buffer(self, buffer: bytearray, peer_id: str) -> bytearray:
         """
         Process the TCP receive buffer, extracting and handling complete messages.
         
+        Complete frames are consumed from the front of the buffer in place,
+        so the buffer is compacted once per call rather than once per message.
+        
         Args:
             buffer: The current receive buffer
             peer_id: The ID of the peer that sent the data
             
         Returns:
-            bytes: The remaining buffer after processing
+            bytearray: The same buffer, holding only the unprocessed bytes
         """
-        # Simple protocol: each message is a JSON object followed by a newline
-        while b'\n' in buffer:
-            # Split at the first newline
-            message_bytes, buffer = buffer.split(b'\n', 1)
+        # Each message is a length prefix followed by that many bytes of JSON
+        offset = 0
+        header_size = FRAME_HEADER.size
+        
+        while len(buffer) - offset >= header_size:
+            (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+            if length > MAX_FRAME_SIZE:
+                # The stream can't be resynchronized, so give up on the connection
+                raise ConnectionError(f"Frame of {length} bytes from {peer_id} exceeds the limit")
+            
+            end = offset + header_size + length
+            if end > len(buffer):
+                break  # Wait for the rest of the frame
             
             # Process the message
             try:
-                message_str = message_bytes.decode('utf-8')
-                message = json.loads(message_str)
+                message = loads(buffer[offset + header_size:end])
                 self._handle_message(message, peer_id)
             except Exception as e:
-                print(f"Error processing message from {peer_id}: {e}")
+                logger.error("Error processing message from %s: %s", peer_id, e)
+            
+            offset = end
         
+        # Drop the processed frames with a single move of the unprocessed tail
+        del buffer[:offset]
         return buffer
     
     def _process_udp_data(self, data: bytes, peer_id: str, addr: Tuple[str, int]) -> None:
@@ -413,86 +701,94 @@ class Transport:
             addr: The address (host, port) of the peer
         """
         try:
-            message_str = data.decode('utf-8')
-            message = json.loads(message_str)
+            message = loads(data)
             self._handle_message(message, peer_id)
         except Exception as e:
-            print(f"Error processing UDP data from {peer_id}: {e}")
+            logger.error("Error processing UDP data from %s: %s", peer_id, e)
     
     def _handle_message(self, message: Dict[str, Any], peer_id: Optional[str]) -> None:
         """
         Handle a received message by passing it to registered handlers.
         
+        Handlers registered for specific types are found with one dict
+        lookup on the message type, so they are never called for other types.
+        
         Args:
             message: The received message
             peer_id: The ID of the peer that sent the message, or None if unknown
         """
+        for handler in self.typed_handlers.get(message.get('type'), ()):
+            try:
+                handler(message, peer_id)
+            except Exception as e:
+                logger.error("Error in message handler: %s", e)
+        
         for handler in self.message_handlers:
             try:
                 handler(message, peer_id)
             except Exception as e:
-                print(f"Error in message handler: {e}")
+                logger.error("Error in message handler: %s", e)
     
     def _send_loop(self) -> None:
         """
-        Background thread that processes the send queue.
+        Background thread that sends queued UDP datagrams.
+        
+        Producers append to a deque, whose appends and pops are atomic, and
+        set an event; this thread only blocks on the event while the deque
+        is empty.
         """
+        send_queue = self.send_queue
         while self.running:
             try:
-                # Get the next message to send (with timeout)
-                try:
-                    protocol, destination, data = self.send_queue.get(timeout=0.1)
-                except queue.Empty:
-                    continue
+                # Wait for something to send (with timeout)
+                if not send_queue:
+                    self._send_event.wait(0.1)
                 
-                # Serialize the data
-                try:
-                    data_str = json.dumps(data)
-                    data_bytes = data_str.encode('utf-8')
-                    
-                    # For TCP, add a newline as message delimiter
-                    if protocol == 'tcp':
-                        data_bytes += b'\n'
-                except Exception as e:
-                    print(f"Error serializing message: {e}")
-                    continue
-                
-                # Send the data
-                if protocol == 'tcp':
-                    self._send_tcp_data(destination, data_bytes)
-                elif protocol == 'udp':
-                    self._send_udp_data(destination, data_bytes)
+                # Clear before draining so appends made from here on wake us again
+                self._send_event.clear()
                 
-                # Mark the task as done
-                self.send_queue.task_done()
+                while send_queue:
+                    # Datagrams were encoded when queued
+                    destination, datagram = send_queue.popleft()
+                    self._send_udp_data(destination, datagram)
             except Exception as e:
-                print(f"Error in send loop: {e}")
+                logger.error("Error in send loop: %s", e)
     
-    def _send_tcp_data(self, peer_id: str, data: bytes) -> bool:
+    def _flush_tcp_queue(self, sock: socket.socket, peer_id: str) -> None:
         """
-        Send data to a peer over TCP.
+        Write as much of a peer's queue as the socket accepts without blocking.
+        
+        Frames are handed to the kernel in scatter-gather batches. Whatever
+        is left of a partially written batch is kept for the next attempt,
+        and the socket is watched for writability exactly while something
+        remains unsent. Must run in the I/O thread.
         
         Args:
-            peer_id: The ID of the peer to send to
-            data: The data to send
-            
-        Returns:
-            bool: True if the data was sent successfully, False otherwise
+            sock: The peer's socket
+            peer_id: The ID of the peer
         """
-        with self.tcp_lock:
-            if peer_id not in self.tcp_connections:
-                return False
-                
-            sock = self.tcp_connections[peer_id]
+        queue = self.peer_queues.get(peer_id)
+        pending = self._unsent.pop(sock, [])
         
         try:
-            sock.sendall(data)
-            return True
+            while True:
+                while queue and len(pending) < SEND_BATCH_MESSAGES:
+                    pending.append(memoryview(queue.popleft()))
+                if not pending:
+                    break
+                
+                _send_frames(sock, pending)
+                if pending:
+                    self._unsent[sock] = pending  # The kernel buffer is full
+                    break
         except Exception as e:
-            print(f"Error sending TCP data to {peer_id}: {e}")
-            # Close the connection on error
-            self.disconnect(peer_id)
-            return False
+            logger.error("Error sending TCP data to %s: %s", peer_id, e)
+            self._drop_connection(sock, peer_id)
+            return
+        
+        events = selectors.EVENT_READ | selectors.EVENT_WRITE if pending else selectors.EVENT_READ
+        if self.selector.get_key(sock).events != events:
+            self.selector.modify(sock, events, peer_id)
     
     def _send_udp_data(self, addr: Tuple[str, int], data: bytes) -> bool:
         """
@@ -500,7 +796,7 @@ class Transport:
         
         Args:
             addr: The address (host, port) of the peer
-            data: The data to send
+            data: The encoded message to send
             
         Returns:
             bool: True if the data was sent successfully, False otherwise
@@ -512,7 +808,7 @@ class Transport:
             self.udp_socket.sendto(data, addr)
             return True
         except Exception as e:
-            print(f"Error sending UDP data to {addr}: {e}")
+            logger.error("Error sending UDP data to %s: %s", addr, e)
             return False
     
     def get_connected_peers(self) -> List[str]:
@@ -522,8 +818,7 @@ class Transport:
         Returns:
             List[str]: A list of connected peer IDs
         """
-        with self.tcp_lock:
-            return list(self.tcp_connections.keys())
+        return list(self.tcp_connections)
     
     def is_connected(self, peer_id: str) -> bool:
         """
@@ -535,8 +830,7 @@ class Transport:
         Returns:
             bool: True if connected, False otherwise
         """
-        with self.tcp_lock:
-            return peer_id in self.tcp_connections
+        return peer_id in self.tcp_connections
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -545,11 +839,58 @@ class Transport:
         Returns:
             Dict[str, Any]: A dictionary of transport layer statistics
         """
-        with self.tcp_lock:
-            tcp_connections = len(self.tcp_connections)
+        queued_frames = sum(len(queue) for queue in self.peer_queues.values())
         
         return {
-            'tcp_connections': tcp_connections,
-            'send_queue_size': self.send_queue.qsize(),
+            'tcp_connections': len(self.tcp_connections),
+            'send_queue_size': len(self.send_queue) + queued_frames,
+            'overflow_disconnects': self.overflow_disconnects,
             'running': self.running
-        }
\ No newline at end of file
+        }
+
+# Helper functions
+
+def _configure_stream_socket(sock: socket.socket) -> None:
+    """
+    Tune a peer connection for small, latency-sensitive gossip messages.
+    
+    Nagle's algorithm is disabled, since the send loop already coalesces
+    queued frames into one write and would otherwise see them held back
+    waiting for an ACK. The send buffer is enlarged so a whole batch fits.
+    
+    Args:
+        sock: The TCP socket to configure
+    """
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_SEND_BUFFER)
+    except OSError as e:
+        logger.error("Error configuring socket options: %s", e)
+
+def _send_frames(sock: socket.socket, pending: List[memoryview]) -> None:
+    """
+    Write as many buffers as a non-blocking socket accepts.
+    
+    Where the platform supports it, sendmsg hands the kernel the whole list
+    as one scatter-gather write. Buffers that went out are removed from the
+    list and a partially written one is trimmed to its unsent bytes.
+    
+    Args:
+        sock: The connected, non-blocking socket to write to
+        pending: The buffers to write, in order; updated in place
+    """
+    while pending:
+        try:
+            if hasattr(sock, 'sendmsg'):
+                sent = sock.sendmsg(pending)
+            else:
+                sent = sock.send(pending[0])
+        except BlockingIOError:
+            return
+        
+        # Drop the buffers that went out completely and trim the next one
+        while pending and sent >= len(pending[0]):
+            sent -= len(pending.pop(0))
+        if pending and sent:
+            pending[0] = pending[0][sent:]
+            return  # A short write means the kernel buffer is full
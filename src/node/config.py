@@ -1,14 +1,20 @@
 import os
 import json
+from collections import ChainMap
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
+from ..utils.serialization import dumps, loads
+
 class NodeConfig:
     """
     Configuration manager for blockchain nodes.
     Handles loading, saving, and accessing node configuration settings.
     """
     
-    DEFAULT_CONFIG = {
+    # Read-only, so the defaults shared by every instance can't be changed
+    # through one of them
+    DEFAULT_CONFIG = MappingProxyType({
         # Network settings
         'host': 'localhost',
         'port': 8000,
@@ -40,7 +46,7 @@ class NodeConfig:
         # Visualization settings
         'visualization_enabled': True,
         'visualization_port': 5000
-    }
+    })
     
     def __init__(self, config_file: Optional[str] = None):
         """
@@ -49,7 +55,10 @@ class NodeConfig:
         Args:
             config_file: Path to the configuration file, or None to use default settings
         """
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Settings that differ from the defaults; reads fall back to
+        # DEFAULT_CONFIG, which is shared and never copied
+        self.overrides = {}
+        self.config = ChainMap(self.overrides, self.DEFAULT_CONFIG)
         self.config_file = config_file
         
         if config_file and os.path.exists(config_file):
@@ -59,6 +68,8 @@ class NodeConfig:
         """
         Load configuration from a file.
         
+        The file is read with a single call and decoded from the bytes.
+        
         Args:
             config_file: Path to the configuration file
             
@@ -66,11 +77,12 @@ class NodeConfig:
             bool: True if the configuration was loaded successfully, False otherwise
         """
         try:
-            with open(config_file, 'r') as f:
-                loaded_config = json.load(f)
-                self.config.update(loaded_config)
-                self.config_file = config_file
-                return True
+            with open(config_file, 'rb') as f:
+                loaded_config = loads(f.read())
+            
+            self.config.update(loaded_config)
+            self.config_file = config_file
+            return True
         except Exception as e:
             print(f"Error loading configuration from {config_file}: {e}")
             return False
@@ -94,9 +106,11 @@ class NodeConfig:
             # Ensure the directory exists
             os.makedirs(os.path.dirname(os.path.abspath(config_file)), exist_ok=True)
             
-            with open(config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
-                return True
+            # Encode first so the file is written with a single call
+            data = dumps(dict(self.config), indent=True)
+            with open(config_file, 'wb') as f:
+                f.write(data)
+            return True
         except Exception as e:
             print(f"Error saving configuration to {config_file}: {e}")
             return False
@@ -135,7 +149,7 @@ class NodeConfig:
     
     def reset(self) -> None:
         """Reset the configuration to default values."""
-        self.config = self.DEFAULT_CONFIG.copy()
+        self.overrides.clear()
     
     def __getitem__(self, key: str) -> Any:
         """Allow dictionary-like access to configuration values."""
@@ -151,4 +165,4 @@ class NodeConfig:
     
     def __str__(self) -> str:
         """Return a string representation of the configuration."""
-        return json.dumps(self.config, indent=4)
\ No newline at end of file
+        return json.dumps(dict(self.config), indent=4)
\ No newline at end of file
@@ -1,3 +1,4 @@
+import os
 import socket
 import threading
 import time
@@ -37,10 +38,10 @@ class Node:
         self.transport = None  # Transport(self.host, self.port)
         self.gossip = None  # GossipProtocol(self)
         self.blockchain = None  # Blockchain()
-        self.transaction_pool = []  # List of pending transactions
+        self.transaction_pool = {}  # Dict[str, Dict] - Pending transactions by ID, in arrival order
         
         # Lock for thread safety
-        self.lock = threading.RLock()
+        self.lock = threading.Lock()
     
     def start(self) -> None:
         """Start the node and begin listening for connections."""
@@ -109,9 +110,10 @@ class Node:
             peer_id: The ID of the peer to disconnect from
         """
         with self.lock:
-            if peer_id in self.peers:
-                del self.peers[peer_id]
-                print(f"Node {self.node_id} disconnected from peer {peer_id}")
+            removed = self.peers.pop(peer_id, None) is not None
+        
+        if removed:
+            print(f"Node {self.node_id} disconnected from peer {peer_id}")
     
     def create_transaction(self, sender: str, receiver: str, amount: float) -> Dict[str, Any]:
         """
@@ -131,7 +133,7 @@ class Node:
         
         # For now, we'll just create a simple dictionary
         transaction = {
-            'id': str(uuid.uuid4()),
+            'id': os.urandom(16).hex(),
             'sender': sender,
             'receiver': receiver,
             'amount': amount,
@@ -140,7 +142,7 @@ class Node:
         }
         
         with self.lock:
-            self.transaction_pool.append(transaction)
+            self.transaction_pool[transaction['id']] = transaction
         
         return transaction
     
@@ -170,12 +172,11 @@ class Node:
         """
         # Check if we already have this transaction
         with self.lock:
-            for tx in self.transaction_pool:
-                if tx['id'] == transaction['id']:
-                    return False  # Already have this transaction
+            if transaction['id'] in self.transaction_pool:
+                return False  # Already have this transaction
             
             # Add to our transaction pool
-            self.transaction_pool.append(transaction)
+            self.transaction_pool[transaction['id']] = transaction
         
         print(f"Node {self.node_id} received transaction {transaction['id']} from {from_peer or 'unknown'}")
         
@@ -200,16 +201,16 @@ class Node:
                 return None
                 
             block = {
-                'id': str(uuid.uuid4()),
+                'id': os.urandom(16).hex(),
                 'timestamp': time.time(),
-                'transactions': self.transaction_pool.copy(),
+                'transactions': list(self.transaction_pool.values()),
                 'previous_hash': 'placeholder_hash',
                 'nonce': 0,
                 'hash': 'placeholder_hash'
             }
             
             # Clear the transaction pool
-            self.transaction_pool = []
+            self.transaction_pool = {}
             
         print(f"Node {self.node_id} mined block {block['id']} with {len(block['transactions'])} transactions")
         return block
@@ -1,8 +1,11 @@
 import threading
 import time
 import random
+import heapq
 from typing import Dict, List, Set, Tuple, Optional, Any
 
+from ..network.message import create_ping_message
+
 class PeerManager:
     """
     Manages peer connections for a node in the blockchain gossip network.
@@ -20,8 +23,13 @@ class PeerManager:
         self.peers = {}  # Dict[str, Dict[str, Any]] - Maps peer_id to peer info
         self.active_peers = set()  # Set[str] - Set of active peer IDs
         self.dead_peers = set()  # Set[str] - Set of peers marked as dead/unreachable
-        self.lock = threading.RLock()
+        self._active_list = []  # Active peer infos, in no particular order, for sampling
+        self._active_index = {}  # Dict[str, int] - Position of each active peer in _active_list
+        self._liveness_heap = []  # (last seen, peer ID) entries, oldest first
+        self._scheduled = set()  # Peers with an entry in the liveness heap
+        self.lock = threading.Lock()  # No method re-acquires it, so a plain Lock suffices
         self.running = False
+        self._stop_event = threading.Event()  # Set by stop() to interrupt the background waits
         self.heartbeat_interval = 30  # Seconds between heartbeats
         self.discovery_interval = 60  # Seconds between peer discovery attempts
         self.max_peers = 10  # Maximum number of peers to maintain
@@ -36,6 +44,7 @@ class PeerManager:
             return
             
         self.running = True
+        self._stop_event.clear()
         print(f"PeerManager starting for node {self.node.node_id}")
         
         # Start background threads
@@ -53,7 +62,8 @@ class PeerManager:
         self.running = False
         print(f"PeerManager stopping for node {self.node.node_id}")
         
-        # Threads will exit on their own since they check self.running
+        # Wake the background threads so they exit without finishing their wait
+        self._stop_event.set()
         if self.heartbeat_thread:
             self.heartbeat_thread.join(timeout=1.0)
         
@@ -82,20 +92,22 @@ class PeerManager:
                 return False
                 
             # Add or update the peer
+            last_seen = time.time()
             self.peers[peer_id] = {
                 'id': peer_id,
                 'host': host,
                 'port': port,
-                'last_seen': time.time(),
+                'last_seen': last_seen,
                 'active': True
             }
             
-            self.active_peers.add(peer_id)
+            self._activate(peer_id)
+            self._schedule_liveness_check(peer_id, last_seen)
             if peer_id in self.dead_peers:
                 self.dead_peers.remove(peer_id)
-                
-            print(f"Added peer {peer_id} at {host}:{port}")
-            return True
+        
+        print(f"Added peer {peer_id} at {host}:{port}")
+        return True
     
     def remove_peer(self, peer_id: str) -> bool:
         """
@@ -112,11 +124,11 @@ class PeerManager:
                 return False
                 
             del self.peers[peer_id]
-            self.active_peers.discard(peer_id)
+            self._deactivate(peer_id)
             self.dead_peers.discard(peer_id)
-            
-            print(f"Removed peer {peer_id}")
-            return True
+        
+        print(f"Removed peer {peer_id}")
+        return True
     
     def mark_peer_active(self, peer_id: str) -> None:
         """
@@ -125,11 +137,17 @@ class PeerManager:
         Args:
             peer_id: The unique identifier of the peer
         """
+        last_seen = time.time()
         with self.lock:
-            if peer_id in self.peers:
-                self.peers[peer_id]['last_seen'] = time.time()
-                self.peers[peer_id]['active'] = True
-                self.active_peers.add(peer_id)
+            peer = self.peers.get(peer_id)
+            if peer is None:
+                return
+            
+            peer['last_seen'] = last_seen
+            if not peer['active'] or peer_id not in self.active_peers:
+                peer['active'] = True
+                self._activate(peer_id)
+                self._schedule_liveness_check(peer_id, last_seen)
                 self.dead_peers.discard(peer_id)
     
     def mark_peer_dead(self, peer_id: str) -> None:
@@ -140,11 +158,28 @@ class PeerManager:
             peer_id: The unique identifier of the peer
         """
         with self.lock:
-            if peer_id in self.peers:
-                self.peers[peer_id]['active'] = False
-                self.active_peers.discard(peer_id)
-                self.dead_peers.add(peer_id)
-                print(f"Marked peer {peer_id} as dead")
+            marked = self._mark_dead(peer_id)
+        
+        if marked:
+            print(f"Marked peer {peer_id} as dead")
+    
+    def _mark_dead(self, peer_id: str) -> bool:
+        """
+        Mark a peer as dead/unreachable. Must be called with the lock held.
+        
+        Args:
+            peer_id: The unique identifier of the peer
+            
+        Returns:
+            bool: True if the peer is known, False otherwise
+        """
+        if peer_id not in self.peers:
+            return False
+        
+        self.peers[peer_id]['active'] = False
+        self._deactivate(peer_id)
+        self.dead_peers.add(peer_id)
+        return True
     
     def get_active_peers(self) -> List[Dict[str, Any]]:
         """
@@ -154,28 +189,86 @@ class PeerManager:
             List[Dict[str, Any]]: A list of active peer information dictionaries
         """
         with self.lock:
-            return [self.peers[peer_id] for peer_id in self.active_peers]
+            return list(self._active_list)
+    
+    def _activate(self, peer_id: str) -> None:
+        """
+        Add a peer to the active set and the sampling list. Must be called with the lock held.
+        
+        Args:
+            peer_id: The unique identifier of the peer
+        """
+        self.active_peers.add(peer_id)
+        position = self._active_index.get(peer_id)
+        if position is None:
+            self._active_index[peer_id] = len(self._active_list)
+            self._active_list.append(self.peers[peer_id])
+        else:
+            self._active_list[position] = self.peers[peer_id]  # The info may have been replaced
+    
+    def _deactivate(self, peer_id: str) -> None:
+        """
+        Remove a peer from the active set and the sampling list. Must be called with the lock held.
+        
+        The last entry of the list is moved into the freed slot, so removal
+        is O(1) and the list never needs rebuilding.
+        
+        Args:
+            peer_id: The unique identifier of the peer
+        """
+        self.active_peers.discard(peer_id)
+        position = self._active_index.pop(peer_id, None)
+        if position is None:
+            return
+        
+        last = self._active_list.pop()
+        if position < len(self._active_list):
+            self._active_list[position] = last
+            self._active_index[last['id']] = position
     
-    def get_random_peers(self, count: int) -> List[Dict[str, Any]]:
+    def get_random_peers(self, count: int, exclude_peer: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get a random subset of active peers.
         
+        When only a few peers are needed out of many, random indexes are drawn
+        until enough distinct ones are found, so the cost depends on count
+        rather than on the number of peers.
+        
         Args:
             count: The number of random peers to return
+            exclude_peer: The ID of a peer that must not be returned
             
         Returns:
             List[Dict[str, Any]]: A list of random peer information dictionaries
         """
         with self.lock:
-            if not self.active_peers:
+            active = self._active_list
+            available = len(active)
+            if exclude_peer is not None and exclude_peer in self._active_index:
+                available -= 1
+            
+            count = min(count, available)
+            if count <= 0:
                 return []
-                
-            # Get a random sample of peer IDs
-            sample_size = min(count, len(self.active_peers))
-            sampled_ids = random.sample(list(self.active_peers), sample_size)
             
-            # Return the peer info for each sampled ID
-            return [self.peers[peer_id] for peer_id in sampled_ids]
+            # Dense picks: filter once and let random.sample handle it
+            if count * 4 > len(active):
+                candidates = [peer for peer in active if peer['id'] != exclude_peer]
+                return random.sample(candidates, count)
+            
+            # Sparse picks: draw indexes and skip repeats and the excluded peer
+            picked = set()
+            peers = []
+            while len(peers) < count:
+                index = random.randrange(len(active))
+                if index in picked:
+                    continue
+                picked.add(index)
+                peer = active[index]
+                if peer['id'] != exclude_peer:
+                    peers.append(peer)
+            
+            return peers
     
     def _heartbeat_loop(self) -> None:
         """
@@ -189,31 +282,76 @@ class PeerManager:
             except Exception as e:
                 print(f"Error in heartbeat loop: {e}")
             
-            # Sleep until next heartbeat interval
-            time.sleep(self.heartbeat_interval)
+            # Wait until the next heartbeat interval, or until stop() is called
+            if self._stop_event.wait(self.heartbeat_interval):
+                break
     
     def _send_heartbeats(self) -> None:
         """
         Send heartbeat messages to all active peers.
+        
+        One ping is built per round and handed to the transport together with
+        every address, so it is encoded once no matter how many peers there
+        are and the datagrams go out back to back from the send thread.
         """
-        # This will be implemented once the gossip protocol is created
-        # For now, we'll just print a message
         with self.lock:
-            if self.active_peers:
-                print(f"Sending heartbeats to {len(self.active_peers)} peers")
+            addresses = [(peer['host'], peer['port']) for peer in self._active_list]
+        
+        if not addresses:
+            return
+        
+        transport = getattr(self.node, 'transport', None)
+        if transport is None:
+            # No transport yet, so we'll just print a message
+            print(f"Sending heartbeats to {len(addresses)} peers")
+            return
+        
+        transport.broadcast_udp(create_ping_message(self.node.node_id), addresses)
+    
+    def _schedule_liveness_check(self, peer_id: str, last_seen: float) -> None:
+        """
+        Give an active peer an entry in the liveness heap, unless it has one.
+        Must be called with the lock held.
+        
+        Args:
+            peer_id: The unique identifier of the peer
+            last_seen: When the peer was last seen
+        """
+        if peer_id not in self._scheduled:
+            self._scheduled.add(peer_id)
+            heapq.heappush(self._liveness_heap, (last_seen, peer_id))
     
     def _check_unresponsive_peers(self) -> None:
         """
         Check for peers that haven't been seen recently and mark them as dead.
+        
+        Active peers sit in a min-heap ordered by when they were last seen,
+        so only entries older than the timeout are looked at. Being seen
+        again doesn't touch the heap: a popped entry whose peer has been seen
+        since is pushed back with its current time, and entries of peers that
+        are no longer active are dropped.
         """
-        current_time = time.time()
         timeout = self.heartbeat_interval * 3  # Consider a peer dead after missing 3 heartbeats
+        cutoff = time.time() - timeout
         
+        dead = []
         with self.lock:
-            for peer_id in list(self.active_peers):
+            heap = self._liveness_heap
+            while heap and heap[0][0] < cutoff:
+                _, peer_id = heapq.heappop(heap)
+                self._scheduled.discard(peer_id)
+                if peer_id not in self.active_peers:
+                    continue
+                
                 last_seen = self.peers[peer_id]['last_seen']
-                if current_time - last_seen > timeout:
-                    self.mark_peer_dead(peer_id)
+                if last_seen < cutoff:
+                    self._mark_dead(peer_id)
+                    dead.append(peer_id)
+                else:
+                    self._schedule_liveness_check(peer_id, last_seen)
+        
+        for peer_id in dead:
+            print(f"Marked peer {peer_id} as dead")
     
     def _discovery_loop(self) -> None:
         """
@@ -225,8 +363,9 @@ class PeerManager:
             except Exception as e:
                 print(f"Error in discovery loop: {e}")
             
-            # Sleep until next discovery interval
-            time.sleep(self.discovery_interval)
+            # Wait until the next discovery interval, or until stop() is called
+            if self._stop_event.wait(self.discovery_interval):
+                break
     
     def _discover_peers(self) -> None:
         """
@@ -234,9 +373,9 @@ class PeerManager:
         """
         # This will be implemented once the gossip protocol is created
         # For now, we'll just print a message
-        with self.lock:
-            if self.active_peers:
-                print(f"Attempting peer discovery with {len(self.active_peers)} active peers")
+        active_count = len(self.active_peers)
+        if active_count:
+            print(f"Attempting peer discovery with {active_count} active peers")
     
     def exchange_peer_lists(self, peer_id: str, peer_list: List[Dict[str, Any]]) -> None:
         """
@@ -1,9 +1,59 @@
 import hashlib
-import base64
 import json
-import os
+import re
+import secrets
 import time
-from typing import Tuple, Dict, Any, Optional
+from operator import itemgetter
+from typing import Tuple, Dict, Any, Optional, List, Union
+
+# SHA-256 constructor shared by the hashing helpers. hashlib uses OpenSSL,
+# which picks the fastest code path for the CPU (SHA-NI, AVX2, ...) itself
+sha256 = hashlib.sha256
+
+# Keys of a plain transaction dictionary, in sorted order. Dictionaries with
+# exactly these keys are encoded from their values alone (see canonical_bytes)
+TRANSACTION_KEYS = ('amount', 'id', 'receiver', 'sender', 'timestamp')
+_TRANSACTION_KEY_SET = frozenset(TRANSACTION_KEYS)
+_transaction_values = itemgetter(*TRANSACTION_KEYS)
+
+# Addresses are 40 hex digits, in either case
+_ADDRESS_PATTERN = re.compile(r'[0-9a-fA-F]{40}')
+
+def sha256_once(data: bytes) -> bytes:
+    """
+    Hash a single buffer with SHA-256.
+    
+    Args:
+        data: The bytes to hash
+        
+    Returns:
+        bytes: The 32-byte digest
+    """
+    return sha256(data).digest()
+
+def sha256_hex(data: bytes) -> str:
+    """
+    Hash a single buffer and return the hex digest.
+    
+    Args:
+        data: The bytes to hash
+        
+    Returns:
+        str: The 64-character hex digest
+    """
+    return sha256(data).hexdigest()
+
+def sha256_many(items: List[bytes]) -> List[bytes]:
+    """
+    Hash several independent buffers with SHA-256.
+    
+    Args:
+        items: The buffers to hash
+        
+    Returns:
+        List[bytes]: The 32-byte digest of each buffer, in order
+    """
+    return [sha256(item).digest() for item in items]
 
 def generate_key_pair() -> Tuple[str, str]:
     """
@@ -13,40 +63,57 @@ def generate_key_pair() -> Tuple[str, str]:
     In a real blockchain, you would use proper cryptographic libraries like RSA or ECDSA.
     
     Returns:
-        Tuple[str, str]: A tuple containing (private_key, public_key)
+        Tuple[str, str]: A tuple containing (private_key, public_key) as hex strings
+    """
+    private_key, public_key = _generate_key_bytes()
+    return private_key.hex(), public_key.hex()
+
+def _generate_key_bytes() -> Tuple[bytes, bytes]:
+    """
+    Generate a key pair as raw bytes.
+    
+    The public key is derived by hashing the raw private key, so no text
+    encoding happens before the hash.
+    
+    Returns:
+        Tuple[bytes, bytes]: The 32-byte private key and the 32-byte public key
     """
     # Generate a random private key
-    private_key = base64.b64encode(os.urandom(32)).decode('utf-8')
+    private_key = secrets.token_bytes(32)
     
     # Derive a public key from the private key
     # In a real implementation, this would use proper key derivation
-    public_key = hashlib.sha256(private_key.encode()).hexdigest()
+    public_key = sha256(private_key).digest()
     
     return private_key, public_key
 
-def sign_data(data: Dict[str, Any], private_key: str) -> str:
+def sign_data(data: Dict[str, Any], private_key: Union[str, bytes]) -> str:
     """
     Sign data with a private key.
     
     Note: This is a simplified implementation for demonstration purposes only.
     In a real blockchain, you would use proper cryptographic libraries.
     
+    The key and the canonical encoding of the data are fed to the hash one
+    after the other, so they are never concatenated. Callers that sign
+    repeatedly can pass the key already encoded as bytes.
+    
     Args:
         data: The data to sign
-        private_key: The private key to sign with
+        private_key: The private key to sign with, as a string or UTF-8 bytes
         
     Returns:
         str: The signature
     """
-    # Convert the data to a string
-    data_string = json.dumps(data, sort_keys=True)
+    if isinstance(private_key, str):
+        private_key = private_key.encode()
     
-    # Create a signature by combining the private key and data
+    # Create a signature over the key followed by the canonical encoding
     # In a real implementation, this would use proper signing algorithms
-    signature_input = private_key + data_string
-    signature = hashlib.sha256(signature_input.encode()).hexdigest()
+    hasher = sha256(private_key)
+    hasher.update(canonical_bytes(data))
     
-    return signature
+    return hasher.hexdigest()
 
 def verify_signature(data: Dict[str, Any], signature: str, public_key: str) -> bool:
     """
@@ -78,41 +145,110 @@ def calculate_hash(data: Dict[str, Any]) -> str:
     Returns:
         str: The calculated hash
     """
-    # Convert the data to a string
-    data_string = json.dumps(data, sort_keys=True)
+    return sha256(canonical_bytes(data)).hexdigest()
+
+def canonical_bytes(data: Dict[str, Any]) -> bytes:
+    """
+    Encode data deterministically for hashing and signing.
+    
+    Plain transaction dictionaries (exactly TRANSACTION_KEYS) skip the JSON
+    encoder: their values are taken in sorted key order and written as the
+    repr of a tuple, which quotes strings and writes floats exactly. Any
+    other dictionary is encoded as compact JSON with sorted keys. The two
+    encodings start with different characters, so they can't collide.
     
-    # Calculate the hash
-    return hashlib.sha256(data_string.encode()).hexdigest()
+    Args:
+        data: The data to encode
+        
+    Returns:
+        bytes: The canonical encoding
+    """
+    if data.keys() == _TRANSACTION_KEY_SET:
+        return repr(_transaction_values(data)).encode()
+    
+    return json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
 
-def create_merkle_root(hashes: list) -> str:
+def create_merkle_root(hashes: List[str]) -> str:
     """
     Create a Merkle root from a list of hashes.
     
+    The hex hashes are decoded once; each level then hashes pairs of raw
+    32-byte digests, duplicating the last digest of a level with an odd
+    count, and only the root is hex-encoded again.
+    
     Args:
-        hashes: A list of hash strings
+        hashes: A list of hex-encoded hashes
         
     Returns:
         str: The Merkle root hash
     """
     if not hashes:
-        return hashlib.sha256(b'').hexdigest()
+        return sha256(b'').hexdigest()
     
     if len(hashes) == 1:
         return hashes[0]
     
-    # If the number of hashes is odd, duplicate the last one
-    if len(hashes) % 2 == 1:
-        hashes.append(hashes[-1])
+    level = [bytes.fromhex(leaf) for leaf in hashes]
+    while len(level) > 1:
+        if len(level) % 2 == 1:
+            level.append(level[-1])
+        level = sha256_many([level[i] + level[i + 1] for i in range(0, len(level), 2)])
+    
+    return level[0].hex()
+
+def create_merkle_paths(leaves: List[bytes]) -> Tuple[bytes, List[List[bytes]]]:
+    """
+    Build a Merkle tree and the authentication path of every leaf.
+    
+    Pairs of digests are hashed together level by level, duplicating the
+    last digest of a level with an odd count.
+    
+    Args:
+        leaves: The 32-byte leaf digests
+        
+    Returns:
+        Tuple[bytes, List[List[bytes]]]: The root and, for each leaf, its sibling digests from the bottom up
+    """
+    if not leaves:
+        return sha256_once(b''), []
+    
+    paths = [[] for _ in leaves]
+    positions = list(range(len(leaves)))
+    level = list(leaves)
+    
+    while len(level) > 1:
+        if len(level) % 2 == 1:
+            level.append(level[-1])
+        
+        for i, position in enumerate(positions):
+            paths[i].append(level[position ^ 1])
+            positions[i] = position // 2
+        
+        level = sha256_many([level[i] + level[i + 1] for i in range(0, len(level), 2)])
     
-    # Pair up hashes and hash each pair
-    new_hashes = []
-    for i in range(0, len(hashes), 2):
-        combined = hashes[i] + hashes[i + 1]
-        new_hash = hashlib.sha256(combined.encode()).hexdigest()
-        new_hashes.append(new_hash)
+    return level[0], paths
+
+def merkle_root_from_path(leaf: bytes, index: int, path: List[bytes]) -> bytes:
+    """
+    Recompute a Merkle root from a leaf and its authentication path.
+    
+    Args:
+        leaf: The 32-byte leaf digest
+        index: The position of the leaf in the tree
+        path: The sibling digests from the bottom up
+        
+    Returns:
+        bytes: The root the path leads to
+    """
+    node = leaf
+    for sibling in path:
+        if index % 2 == 0:
+            node = sha256(node + sibling).digest()
+        else:
+            node = sha256(sibling + node).digest()
+        index //= 2
     
-    # Recursively build the tree
-    return create_merkle_root(new_hashes)
+    return node
 
 def generate_wallet() -> Dict[str, str]:
     """
@@ -122,14 +258,14 @@ def generate_wallet() -> Dict[str, str]:
         Dict[str, str]: A dictionary containing the wallet information
     """
     # Generate a key pair
-    private_key, public_key = generate_key_pair()
+    private_key, public_key = _generate_key_bytes()
     
-    # Generate an address from the public key
-    address = hashlib.sha256(public_key.encode()).hexdigest()[:40]
+    # Generate an address from the first 20 bytes of the public key's hash
+    address = sha256(public_key).digest()[:20].hex()
     
     return {
-        'private_key': private_key,
-        'public_key': public_key,
+        'private_key': private_key.hex(),
+        'public_key': public_key.hex(),
         'address': address,
         'created_at': time.time()
     }
@@ -145,5 +281,5 @@ def validate_address(address: str) -> bool:
         bool: True if the address is valid, False otherwise
     """
     # In a real implementation, this would check the address format and possibly a checksum
-    # For this simplified version, we'll just check the length
-    return len(address) == 40 and all(c in '0123456789abcdef' for c in address.lower())
\ No newline at end of file
+    # For this simplified version, we'll just check the length and the characters
+    return len(address) == 40 and _ADDRESS_PATTERN.fullmatch(address) is not None
\ No newline at end of file
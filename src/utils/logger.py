@@ -1,12 +1,38 @@
+import atexit
 import logging
 import os
+import queue
 import sys
+import threading
 import time
-from typing import Optional
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from typing import Any, Optional
+
+# Records buffered per log file before they are written in one go
+FILE_BUFFER_RECORDS = 512
+
+# Seconds between flushes of the log file buffers
+FILE_FLUSH_INTERVAL = 1.0
+
+# Background listeners writing out the records queued by each named logger
+_listeners = {}  # Dict[str, QueueListener]
+
+# Buffers in front of each named logger's file handler
+_file_buffers = {}  # Dict[str, MemoryHandler]
+_flush_thread = None
+
+# The (level, log file) each named logger was last configured with
+_configured = {}  # Dict[str, Tuple[int, Optional[str]]]
+_configure_lock = threading.Lock()
 
 class Logger:
     """
     A custom logger for the blockchain gossip network.
+    Records are only put on a queue by the calling thread; a background
+    listener formats them and writes them to the console and log file, so
+    logging from I/O threads never waits on the stdout lock or on disk.
+    Messages should use %-style placeholders with separate arguments rather
+    than f-strings, so nothing is formatted for disabled levels.
     """
     
     def __init__(self, name: str, log_level: int = logging.INFO, log_file: Optional[str] = None):
@@ -19,12 +45,35 @@ class Logger:
             log_file: The path to the log file (default: None, logs to console only)
         """
         self.logger = logging.getLogger(name)
+        
+        with _configure_lock:
+            # Another Logger already set this name up the same way; share its handlers
+            if _configured.get(name) == (log_level, log_file):
+                self.listener = _listeners[name]
+                return
+            
+            self._configure(name, log_level, log_file)
+            _configured[name] = (log_level, log_file)
+    
+    def _configure(self, name: str, log_level: int, log_file: Optional[str]) -> None:
+        """
+        Replace the handlers of the named logger. Called with _configure_lock held.
+        
+        Args:
+            name: The name of the logger
+            log_level: The logging level
+            log_file: The path to the log file, or None to log to console only
+        """
         self.logger.setLevel(log_level)
         self.logger.propagate = False
         
         # Clear any existing handlers
         if self.logger.handlers:
             self.logger.handlers.clear()
+        if name in _listeners:
+            _listeners.pop(name).stop()
+        if name in _file_buffers:
+            _close_file_buffer(_file_buffers.pop(name))
         
         # Create console handler
         console_handler = logging.StreamHandler(sys.stdout)
@@ -37,8 +86,7 @@ class Logger:
         )
         console_handler.setFormatter(formatter)
         
-        # Add console handler to logger
-        self.logger.addHandler(console_handler)
+        handlers = [console_handler]
         
         # Add file handler if log_file is provided
         if log_file:
@@ -50,58 +98,106 @@ class Logger:
             file_handler = logging.FileHandler(log_file)
             file_handler.setLevel(log_level)
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            
+            # Batch file writes; errors and the periodic flush write them out
+            file_buffer = MemoryHandler(
+                FILE_BUFFER_RECORDS,
+                flushLevel=logging.ERROR,
+                target=file_handler,
+                flushOnClose=True
+            )
+            file_buffer.setLevel(log_level)
+            handlers.append(file_buffer)
+            _file_buffers[name] = file_buffer
+            _start_flush_thread()
+        
+        # Hand records to the handlers through a queue served by a listener thread
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(log_queue))
+        self.listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        _listeners[name] = self.listener
     
-    def debug(self, message: str) -> None:
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Check whether messages at a level would be logged.
+        
+        Callers can use this to skip building expensive log arguments.
+        
+        Args:
+            level: The logging level to check
+            
+        Returns:
+            bool: True if messages at the level are logged, False otherwise
+        """
+        return self.logger.isEnabledFor(level)
+    
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log a debug message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted with args only if the level is enabled
+            *args: Arguments for %-style formatting of the message
+            **kwargs: Keyword arguments for the logging call, such as exc_info
         """
-        self.logger.debug(message)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, **kwargs)
     
-    def info(self, message: str) -> None:
+    def info(self, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log an info message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted with args only if the level is enabled
+            *args: Arguments for %-style formatting of the message
+            **kwargs: Keyword arguments for the logging call, such as exc_info
         """
-        self.logger.info(message)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, **kwargs)
     
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log a warning message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted with args only if the level is enabled
+            *args: Arguments for %-style formatting of the message
+            **kwargs: Keyword arguments for the logging call, such as exc_info
         """
-        self.logger.warning(message)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, **kwargs)
     
-    def error(self, message: str) -> None:
+    def error(self, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log an error message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted with args only if the level is enabled
+            *args: Arguments for %-style formatting of the message
+            **kwargs: Keyword arguments for the logging call, such as exc_info
         """
-        self.logger.error(message)
+        self.logger.error(message, *args, **kwargs)
     
-    def critical(self, message: str) -> None:
+    def critical(self, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log a critical message.
         
         Args:
-            message: The message to log
+            message: The message to log, formatted with args only if the level is enabled
+            *args: Arguments for %-style formatting of the message
+            **kwargs: Keyword arguments for the logging call, such as exc_info
         """
-        self.logger.critical(message)
+        self.logger.critical(message, *args, **kwargs)
 
 
 def get_logger(name: str, log_level: int = logging.INFO, log_file: Optional[str] = None) -> Logger:
     """
     Get a logger instance.
     
+    Repeated calls with the same arguments share the handlers and listener
+    thread set up by the first one instead of rebuilding them.
+    
     Args:
         name: The name of the logger
         log_level: The logging level (default: INFO)
@@ -110,4 +206,44 @@ def get_logger(name: str, log_level: int = logging.INFO, log_file: Optional[str]
     Returns:
         Logger: A logger instance
     """
-    return Logger(name, log_level, log_file)
\ No newline at end of file
+    return Logger(name, log_level, log_file)
+
+def _start_flush_thread() -> None:
+    """Start the thread that periodically flushes the log file buffers, once."""
+    global _flush_thread
+    if _flush_thread is None:
+        _flush_thread = threading.Thread(target=_flush_loop, daemon=True)
+        _flush_thread.start()
+
+def _flush_loop() -> None:
+    """Write out buffered file records every FILE_FLUSH_INTERVAL seconds."""
+    while True:
+        time.sleep(FILE_FLUSH_INTERVAL)
+        for file_buffer in list(_file_buffers.values()):
+            file_buffer.flush()
+
+def _close_file_buffer(file_buffer: MemoryHandler) -> None:
+    """
+    Flush a log file buffer and close the file behind it.
+    
+    Args:
+        file_buffer: The buffer to close
+    """
+    file_handler = file_buffer.target
+    file_buffer.close()
+    if file_handler is not None:
+        file_handler.close()
+
+def _stop_listeners() -> None:
+    """Flush and stop every queue listener at interpreter exit."""
+    with _configure_lock:
+        for listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+        _configured.clear()
+        
+        for file_buffer in _file_buffers.values():
+            _close_file_buffer(file_buffer)
+        _file_buffers.clear()
+
+atexit.register(_stop_listeners)
@@ -0,0 +1,48 @@
+import json
+from typing import Any, Union
+
+# orjson is optional; fall back to the standard library when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Encode data as compact JSON.
+    
+    The output is meant for storage and transport. Code that hashes the
+    encoding must not use it, because orjson and the standard library
+    encoder do not produce byte-identical output.
+    
+    Args:
+        data: The data to encode
+        indent: Whether to pretty-print with two-space indentation, for files meant to be read by people
+        
+    Returns:
+        bytes: The UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    
+    if indent:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(',', ':')).encode()
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document.
+    
+    Args:
+        data: The JSON document as bytes or a string
+        
+    Returns:
+        Any: The decoded data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    
+    return json.loads(data)
@@ -1,82 +1,67 @@
+import gzip
+import queue
 import time
 import threading
-import json
-from typing import Dict, List, Any, Optional
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Callable, Dict, FrozenSet, List, Any, Optional, Tuple
 from http.server import HTTPServer, BaseHTTPRequestHandler
-import socketserver
 import os
+import stat
 import webbrowser
 
-class BlockchainVisualizer:
-    """
-    Visualizes the blockchain using a web interface.
-    """
-    
-    def __init__(self, host: str = 'localhost', port: int = 8081):
-        """
-        Initialize the blockchain visualizer.
-        
-        Args:
-            host: The host to run the visualization server on
-            port: The port to run the visualization server on
-        """
-        self.host = host
-        self.port = port
-        self.blocks: List[Dict[str, Any]] = []
-        self.transactions: List[Dict[str, Any]] = []
-        self.server: Optional[HTTPServer] = None
-        self.server_thread: Optional[threading.Thread] = None
-        self.running = False
-    
-    def start(self) -> None:
-        """
-        Start the visualization server.
-        """
-        if self.running:
-            print("Blockchain visualization server is already running")
-            return
-        
-        # Create a custom HTTP request handler
-        visualizer = self
-        
-        class VisualizerHandler(BaseHTTPRequestHandler):
-            def do_GET(self):
-                if self.path == '/':
-                    self.send_response(200)
-                    self.send_header('Content-type', 'text/html')
-                    self.end_headers()
-                    self.wfile.write(self._get_html().encode())
-                elif self.path == '/data':
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.end_headers()
-                    data = {
-                        'blocks': visualizer.blocks,
-                        'transactions': visualizer.transactions
-                    }
-                    self.wfile.write(json.dumps(data).encode())
-                elif self.path.startswith('/static/'):
-                    # Serve static files (CSS, JS)
-                    file_path = os.path.join(os.path.dirname(__file__), 'static', self.path[8:])
-                    if os.path.exists(file_path):
-                        self.send_response(200)
-                        if file_path.endswith('.css'):
-                            self.send_header('Content-type', 'text/css')
-                        elif file_path.endswith('.js'):
-                            self.send_header('Content-type', 'application/javascript')
-                        self.end_headers()
-                        with open(file_path, 'rb') as f:
-                            self.wfile.write(f.read())
-                    else:
-                        self.send_response(404)
-                        self.end_headers()
-                else:
-                    self.send_response(404)
-                    self.end_headers()
-            
-            def _get_html(self):
-                # Return the HTML for the visualization
-                return '''
+from ..utils.serialization import dumps
+
+# Number of most recent transactions shown
+RECENT_TRANSACTIONS = 10
+
+# Fields every block and transaction must have to be shown
+BLOCK_FIELDS = frozenset(('index', 'hash', 'previous_hash', 'timestamp'))
+TRANSACTION_FIELDS = frozenset(('id', 'from', 'to', 'amount', 'timestamp'))
+
+# Sort keys, extracted in C rather than through a Python lambda
+_INDEX_KEY = itemgetter('index')
+_TIMESTAMP_KEY = itemgetter('timestamp')
+
+# gzip level for /data; the JSON is repetitive enough that the fastest level suffices
+DATA_GZIP_LEVEL = 1
+
+# Directory the /static/ paths are served from
+STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+
+# Content types of the static files, by extension
+STATIC_CONTENT_TYPES = {'.css': 'text/css', '.js': 'application/javascript'}
+
+# Seconds browsers may reuse a static file before requesting it again
+STATIC_MAX_AGE = 3600
+
+# Contents of the static files served so far, keyed by path with their (mtime, size)
+_static_cache = {}  # Dict[str, Tuple[Tuple[int, int], bytes]]
+
+# Seconds an /events stream waits for a change before sending a keep-alive
+EVENT_KEEPALIVE_INTERVAL = 15.0
+
+# Seconds an /events stream lets further changes accumulate before encoding,
+# so a burst of mutations is sent (and the data rebuilt) once
+EVENT_COALESCE_DELAY = 0.05
+
+# Number of threads handling requests, so bursts of clients cannot oversubscribe the CPUs
+SERVER_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Open /events streams allowed at once, leaving the other workers for requests
+EVENT_STREAMS = max(1, SERVER_WORKERS // 2)
+
+# Milliseconds a client turned away from /events waits before reconnecting
+EVENT_RETRY_MS = 2000
+
+# Seconds an idle keep-alive connection may hold a worker
+CONNECTION_TIMEOUT = 5.0
+
+# Bytes of response buffered per connection, so headers and body leave in one send
+RESPONSE_BUFFER_SIZE = 1 << 16
+
+# Page served at /, encoded once at import
+INDEX_HTML = '''
 <!DOCTYPE html>
 <html>
 <head>
@@ -208,28 +193,17 @@ class BlockchainVisualizer:
             <div id="transactions"></div>
         </div>
     </div>
-
+    
     <script>
-        // Function to fetch data from the server
-        async function fetchData() {
-            const response = await fetch('/data');
-            return await response.json();
-        }
-
         // Function to update the visualization
-        async function updateVisualization() {
-            const data = await fetchData();
-            
+        function updateVisualization(data) {
             // Update blockchain visualization
             updateBlockchain(data.blocks);
             
             // Update transactions list
             updateTransactions(data.transactions);
-            
-            // Schedule the next update
-            setTimeout(updateVisualization, 2000);
         }
-
+        
         // Function to update the blockchain visualization
         function updateBlockchain(blocks) {
             const blockchainElement = document.getElementById('blockchain');
@@ -277,7 +251,7 @@ class BlockchainVisualizer:
                 blockchainElement.innerHTML = '<p>No blocks in the blockchain yet.</p>';
             }
         }
-
+        
         // Function to update the transactions list
         function updateTransactions(transactions) {
             const transactionsElement = document.getElementById('transactions');
@@ -310,16 +284,158 @@ class BlockchainVisualizer:
                 transactionsElement.innerHTML = '<p>No transactions yet.</p>';
             }
         }
-
-        // Start the visualization update loop
-        updateVisualization();
+        
+        // Redraw whenever the server pushes new data
+        const events = new EventSource('/events');
+        events.onmessage = (event) => updateVisualization(JSON.parse(event.data));
     </script>
 </body>
 </html>
-'''
+'''.encode()
+
+class PooledHTTPServer(HTTPServer):
+    """
+    An HTTP server that handles connections on a fixed pool of daemon threads.
+    Connections beyond the pool size wait in a queue instead of each getting
+    a thread of their own.
+    """
+    
+    def __init__(self, server_address: Tuple[str, int], handler_class: type, workers: int = SERVER_WORKERS):
+        """
+        Bind the server and start its worker threads.
+        
+        Args:
+            server_address: The (host, port) to listen on
+            handler_class: The request handler class
+            workers: The number of worker threads
+        """
+        super().__init__(server_address, handler_class)
+        self.connections = queue.SimpleQueue()
+        self.workers = [
+            threading.Thread(target=self._worker_loop, daemon=True)
+            for _ in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+    
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Queue an accepted connection for the worker threads."""
+        self.connections.put((request, client_address))
+    
+    def server_close(self) -> None:
+        """Close the listening socket and let the worker threads exit."""
+        super().server_close()
+        for _ in self.workers:
+            self.connections.put(None)
+    
+    def _worker_loop(self) -> None:
+        """Handle queued connections until server_close is called."""
+        while True:
+            item = self.connections.get()
+            if item is None:
+                return
+            
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+class BlockchainVisualizer:
+    """
+    Visualizes the blockchain using a web interface.
+    """
+    
+    def __init__(self, host: str = 'localhost', port: int = 8081):
+        """
+        Initialize the blockchain visualizer.
+        
+        Args:
+            host: The host to run the visualization server on
+            port: The port to run the visualization server on
+        """
+        self.host = host
+        self.port = port
+        self.blocks: List[Dict[str, Any]] = []
+        self.transactions: List[Dict[str, Any]] = []
+        self._block_keys: List[Any] = []  # Index of each entry in blocks, ascending
+        self._transaction_keys: List[Any] = []  # Negated timestamp of each entry in transactions, ascending
+        self.server: Optional[HTTPServer] = None
+        self.server_thread: Optional[threading.Thread] = None
+        self.running = False
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)  # Notified whenever the data changes
+        self.version = 0  # Incremented on every change
+        self._data_bytes: Optional[bytes] = None  # Encoded /data response, None once stale
+        self._data_gzip: Optional[bytes] = None  # Compressed /data response, None once stale
+        self.event_slots = threading.BoundedSemaphore(EVENT_STREAMS)  # Held by each open /events stream
+    
+    def start(self) -> None:
+        """
+        Start the visualization server.
+        """
+        if self.running:
+            print("Blockchain visualization server is already running")
+            return
+        
+        # Create a custom HTTP request handler
+        visualizer = self
+        
+        class VisualizerHandler(BaseHTTPRequestHandler):
+            # Keep connections open between polls; every response sets Content-Length
+            protocol_version = 'HTTP/1.1'
+            timeout = CONNECTION_TIMEOUT
+            
+            # Send each response as soon as it is flushed, without waiting on Nagle
+            disable_nagle_algorithm = True
+            wbufsize = RESPONSE_BUFFER_SIZE
+            
+            def do_GET(self):
+                if self.path == '/':
+                    self.send_response(200)
+                    self.send_header('Content-type', 'text/html')
+                    self.send_header('Content-Length', str(len(INDEX_HTML)))
+                    self.end_headers()
+                    self.wfile.write(INDEX_HTML)
+                elif self.path == '/data':
+                    compressed = 'gzip' in self.headers.get('Accept-Encoding', '')
+                    body = visualizer.get_data_bytes(compressed)
+                    self.send_response(200)
+                    self.send_header('Content-type', 'application/json')
+                    if compressed:
+                        self.send_header('Content-Encoding', 'gzip')
+                    self.send_header('Vary', 'Accept-Encoding')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif self.path == '/events':
+                    stream_events(self, visualizer, visualizer.get_data_bytes)
+                elif self.path.startswith('/static/'):
+                    # Serve static files (CSS, JS)
+                    name = self.path[8:]
+                    body = read_static_file(name)
+                    if body is not None:
+                        self.send_response(200)
+                        content_type = STATIC_CONTENT_TYPES.get(os.path.splitext(name)[1])
+                        if content_type:
+                            self.send_header('Content-type', content_type)
+                        self.send_header('Cache-Control', f'max-age={STATIC_MAX_AGE}')
+                        self.send_header('Content-Length', str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                    else:
+                        self.send_response(404)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                else:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
         
         # Create and start the server
-        self.server = socketserver.TCPServer((self.host, self.port), VisualizerHandler)
+        self.server = PooledHTTPServer((self.host, self.port), VisualizerHandler)
         self.server_thread = threading.Thread(target=self.server.serve_forever)
         self.server_thread.daemon = True
         self.server_thread.start()
@@ -339,6 +455,10 @@ class BlockchainVisualizer:
             self.server.shutdown()
             self.server.server_close()
             self.running = False
+            
+            # Wake the open /events streams so they see the server has stopped
+            with self.changed:
+                self.changed.notify_all()
             print("Blockchain visualization server stopped")
     
     def add_block(self, block_data: Dict[str, Any]) -> None:
@@ -349,17 +469,16 @@ class BlockchainVisualizer:
             block_data: The block data to add
         """
         # Ensure the block has all required fields
-        required_fields = ['index', 'hash', 'previous_hash', 'timestamp']
-        for field in required_fields:
-            if field not in block_data:
-                print(f"Block is missing required field: {field}")
-                return
-        
-        # Add the block to the list
-        self.blocks.append(block_data)
+        if not _has_fields(block_data, BLOCK_FIELDS, 'Block'):
+            return
         
-        # Sort blocks by index
-        self.blocks.sort(key=lambda b: b['index'])
+        # Insert the block after any blocks with the same or a lower index
+        key = block_data['index']
+        with self.changed:
+            position = bisect_right(self._block_keys, key)
+            self._block_keys.insert(position, key)
+            self.blocks.insert(position, block_data)
+            self._data_changed()
     
     def add_transaction(self, tx_data: Dict[str, Any]) -> None:
         """
@@ -369,21 +488,47 @@ class BlockchainVisualizer:
             tx_data: The transaction data to add
         """
         # Ensure the transaction has all required fields
-        required_fields = ['id', 'from', 'to', 'amount', 'timestamp']
-        for field in required_fields:
-            if field not in tx_data:
-                print(f"Transaction is missing required field: {field}")
-                return
+        if not _has_fields(tx_data, TRANSACTION_FIELDS, 'Transaction'):
+            return
         
-        # Add the transaction to the list
-        self.transactions.append(tx_data)
+        # Insert the transaction newest first, after any with the same timestamp
+        key = -tx_data['timestamp']
+        with self.changed:
+            position = bisect_right(self._transaction_keys, key)
+            if position >= RECENT_TRANSACTIONS:
+                return
+            self._transaction_keys.insert(position, key)
+            self.transactions.insert(position, tx_data)
+            
+            # Keep only the most recent transactions
+            if len(self.transactions) > RECENT_TRANSACTIONS:
+                self._transaction_keys.pop()
+                self.transactions.pop()
+            self._data_changed()
+    
+    def add_blocks(self, blocks: List[Dict[str, Any]]) -> None:
+        """
+        Add several blocks to the visualization, sorting only once.
         
-        # Sort transactions by timestamp (newest first)
-        self.transactions.sort(key=lambda tx: tx['timestamp'], reverse=True)
+        Args:
+            blocks: The block data to add
+        """
+        blocks = _valid_blocks(blocks)
+        with self.changed:
+            self._merge_blocks(self.blocks, blocks)
+            self._data_changed()
+    
+    def add_transactions(self, transactions: List[Dict[str, Any]]) -> None:
+        """
+        Add several transactions to the visualization, sorting only once.
         
-        # Keep only the 10 most recent transactions
-        if len(self.transactions) > 10:
-            self.transactions = self.transactions[:10]
+        Args:
+            transactions: The transaction data to add
+        """
+        transactions = _valid_transactions(transactions)
+        with self.changed:
+            self._merge_transactions(self.transactions, transactions)
+            self._data_changed()
     
     def update_from_blockchain(self, blocks: List[Dict[str, Any]], transactions: List[Dict[str, Any]]) -> None:
         """
@@ -393,17 +538,93 @@ class BlockchainVisualizer:
             blocks: The list of blocks
             transactions: The list of transactions
         """
-        # Clear existing data
-        self.blocks = []
-        self.transactions = []
+        blocks = _valid_blocks(blocks)
+        transactions = _valid_transactions(transactions)
         
-        # Add blocks
-        for block in blocks:
-            self.add_block(block)
+        # Replace the existing data, then invalidate the cached encoding once
+        with self.changed:
+            self._merge_blocks([], blocks)
+            self._merge_transactions([], transactions)
+            self._data_changed()
+    
+    def _merge_blocks(self, existing: List[Dict[str, Any]], blocks: List[Dict[str, Any]]) -> None:
+        """
+        Replace the shown blocks with existing ones plus new ones. Must be called with the lock held.
         
-        # Add transactions
-        for tx in transactions:
-            self.add_transaction(tx)
+        Args:
+            existing: The blocks to keep, sorted by index
+            blocks: The validated block data to add
+        """
+        merged = existing + blocks
+        merged.sort(key=_INDEX_KEY)
+        self._block_keys = list(map(_INDEX_KEY, merged))
+        self.blocks = merged
+    
+    def _merge_transactions(self, existing: List[Dict[str, Any]], transactions: List[Dict[str, Any]]) -> None:
+        """
+        Replace the shown transactions with the most recent of existing and new ones. Must be called with the lock held.
+        
+        Args:
+            existing: The transactions to keep, newest first
+            transactions: The validated transaction data to add
+        """
+        merged = existing + transactions
+        merged.sort(key=_TIMESTAMP_KEY, reverse=True)
+        del merged[RECENT_TRANSACTIONS:]
+        self._transaction_keys = [-tx['timestamp'] for tx in merged]
+        self.transactions = merged
+    
+    def get_data_bytes(self, compressed: bool = False) -> bytes:
+        """
+        Get the JSON document served at /data.
+        
+        The encoding and its gzip form are cached until the blocks or
+        transactions change, so polling clients do not re-serialize or
+        re-compress unchanged data.
+        
+        Args:
+            compressed: Whether to return the gzip-compressed document
+            
+        Returns:
+            bytes: The blocks and transactions encoded as JSON
+        """
+        with self.lock:
+            if self._data_bytes is None:
+                data = {
+                    'blocks': self.blocks,
+                    'transactions': self.transactions
+                }
+                self._data_bytes = dumps(data)
+            if not compressed:
+                return self._data_bytes
+            
+            if self._data_gzip is None:
+                self._data_gzip = gzip.compress(self._data_bytes, DATA_GZIP_LEVEL)
+            return self._data_gzip
+    
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """
+        Wait until the data has changed since a version was observed.
+        
+        Args:
+            version: The last version the caller has seen
+            timeout: The maximum number of seconds to wait
+            
+        Returns:
+            int: The current version, which equals the given one on timeout
+        """
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version or not self.running, timeout)
+            return self.version
+    
+    def _data_changed(self) -> None:
+        """
+        Discard the cached /data encoding and wake waiters. Must be called with the lock held.
+        """
+        self._data_bytes = None
+        self._data_gzip = None
+        self.version += 1
+        self.changed.notify_all()
     
     def open_in_browser(self) -> None:
         """
@@ -417,6 +638,133 @@ class BlockchainVisualizer:
         webbrowser.open(url)
         print(f"Opening blockchain visualization in browser: {url}")
 
+# Helper functions
+
+def _has_fields(data: Dict[str, Any], fields: FrozenSet[str], kind: str) -> bool:
+    """
+    Check that an item to visualize has every required field.
+    
+    Args:
+        data: The block or transaction data
+        fields: The names of the required fields
+        kind: The kind of item, used in the error message
+        
+    Returns:
+        bool: True if no field is missing, False otherwise
+    """
+    missing = fields.difference(data)
+    if missing:
+        print(f"{kind} is missing required fields: {', '.join(sorted(missing))}")
+        return False
+    return True
+
+def _valid_blocks(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keep the blocks that have every required field.
+    
+    Args:
+        blocks: The block data to check
+        
+    Returns:
+        List[Dict[str, Any]]: The valid blocks, in order
+    """
+    return [block for block in blocks if _has_fields(block, BLOCK_FIELDS, 'Block')]
+
+def _valid_transactions(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keep the transactions that have every required field.
+    
+    Args:
+        transactions: The transaction data to check
+        
+    Returns:
+        List[Dict[str, Any]]: The valid transactions, in order
+    """
+    return [tx for tx in transactions if _has_fields(tx, TRANSACTION_FIELDS, 'Transaction')]
+
+def stream_events(handler: BaseHTTPRequestHandler, visualizer: Any, get_body: Callable[[], bytes]) -> None:
+    """
+    Push a visualizer's data as server-sent events until the client or server goes away.
+    
+    The visualizer must provide running, version, event_slots and
+    wait_for_change. After a change the stream waits EVENT_COALESCE_DELAY
+    before reading the data, so mutations arriving in a burst produce a
+    single document. A document is only sent when it differs from the last
+    one sent on the stream; otherwise a keep-alive comment is written.
+    
+    Args:
+        handler: The request handler of the /events request
+        visualizer: The visualizer whose data is streamed
+        get_body: Returns the current encoded data
+    """
+    handler.close_connection = True
+    handler.send_response(200)
+    handler.send_header('Content-type', 'text/event-stream')
+    handler.send_header('Cache-Control', 'no-cache')
+    handler.send_header('Connection', 'close')
+    handler.end_headers()
+    
+    # Past the stream limit, send one snapshot and have the client reconnect later
+    if not visualizer.event_slots.acquire(blocking=False):
+        retry = f'retry: {EVENT_RETRY_MS}\n'.encode()
+        handler.wfile.write(retry + b'data: ' + get_body() + b'\n\n')
+        return
+    
+    version = -1
+    last_sent = None
+    try:
+        while visualizer.running:
+            changed = visualizer.wait_for_change(version, EVENT_KEEPALIVE_INTERVAL)
+            if changed != version and last_sent is not None:
+                # Changes made during the delay are included in this document
+                time.sleep(EVENT_COALESCE_DELAY)
+                changed = visualizer.version
+            version = changed
+            body = get_body()
+            if body != last_sent:
+                handler.wfile.write(b'data: ' + body + b'\n\n')
+                last_sent = body
+            else:
+                handler.wfile.write(b': keep-alive\n\n')
+            handler.wfile.flush()
+    except OSError:
+        # The client went away or stopped reading
+        pass
+    finally:
+        visualizer.event_slots.release()
+
+def read_static_file(name: str) -> Optional[bytes]:
+    """
+    Read a file under STATIC_DIR, reusing its cached contents while it is unchanged.
+    
+    Args:
+        name: The path of the file relative to STATIC_DIR
+        
+    Returns:
+        Optional[bytes]: The file contents, or None if it is not a regular file inside STATIC_DIR
+    """
+    # Refuse paths that climb out of the static directory
+    file_path = os.path.normpath(os.path.join(STATIC_DIR, name))
+    if not file_path.startswith(STATIC_DIR + os.sep):
+        return None
+    
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(file_stat.st_mode):
+        return None
+    
+    version = (file_stat.st_mtime_ns, file_stat.st_size)
+    cached = _static_cache.get(file_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    with open(file_path, 'rb') as f:
+        body = f.read()
+    _static_cache[file_path] = (version, body)
+    return body
+
 
 # Example usage
 def main():
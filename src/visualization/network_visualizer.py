@@ -1,86 +1,29 @@
+import gzip
+import hashlib
 import time
 import threading
-import json
-from typing import Dict, List, Any, Optional
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Set, Tuple
 from http.server import HTTPServer, BaseHTTPRequestHandler
-import socketserver
 import os
 import webbrowser
 
-class NetworkVisualizer:
-    """
-    Visualizes the blockchain gossip network using a web interface.
-    """
-    
-    def __init__(self, host: str = 'localhost', port: int = 8080):
-        """
-        Initialize the network visualizer.
-        
-        Args:
-            host: The host to run the visualization server on
-            port: The port to run the visualization server on
-        """
-        self.host = host
-        self.port = port
-        self.nodes: Dict[str, Dict[str, Any]] = {}
-        self.connections: List[Dict[str, str]] = []
-        self.transactions: List[Dict[str, Any]] = []
-        self.blocks: List[Dict[str, Any]] = []
-        self.server: Optional[HTTPServer] = None
-        self.server_thread: Optional[threading.Thread] = None
-        self.running = False
-    
-    def start(self) -> None:
-        """
-        Start the visualization server.
-        """
-        if self.running:
-            print("Visualization server is already running")
-            return
-        
-        # Create a custom HTTP request handler
-        visualizer = self
-        
-        class VisualizerHandler(BaseHTTPRequestHandler):
-            def do_GET(self):
-                if self.path == '/':
-                    self.send_response(200)
-                    self.send_header('Content-type', 'text/html')
-                    self.end_headers()
-                    self.wfile.write(self._get_html().encode())
-                elif self.path == '/data':
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.end_headers()
-                    data = {
-                        'nodes': list(visualizer.nodes.values()),
-                        'connections': visualizer.connections,
-                        'transactions': visualizer.transactions,
-                        'blocks': visualizer.blocks
-                    }
-                    self.wfile.write(json.dumps(data).encode())
-                elif self.path.startswith('/static/'):
-                    # Serve static files (CSS, JS)
-                    file_path = os.path.join(os.path.dirname(__file__), 'static', self.path[8:])
-                    if os.path.exists(file_path):
-                        self.send_response(200)
-                        if file_path.endswith('.css'):
-                            self.send_header('Content-type', 'text/css')
-                        elif file_path.endswith('.js'):
-                            self.send_header('Content-type', 'application/javascript')
-                        self.end_headers()
-                        with open(file_path, 'rb') as f:
-                            self.wfile.write(f.read())
-                    else:
-                        self.send_response(404)
-                        self.end_headers()
-                else:
-                    self.send_response(404)
-                    self.end_headers()
-            
-            def _get_html(self):
-                # Return the HTML for the visualization
-                return '''
+from ..utils.serialization import dumps
+from .blockchain_visualizer import (
+    CONNECTION_TIMEOUT, DATA_GZIP_LEVEL, EVENT_STREAMS, RESPONSE_BUFFER_SIZE, STATIC_CONTENT_TYPES, STATIC_MAX_AGE,
+    PooledHTTPServer, read_static_file, stream_events
+)
+
+# Number of most recent transactions and blocks shown
+RECENT_ITEMS = 10
+
+# Leading characters of transaction IDs/addresses and of block hashes the
+# page shows; /events sends only these, /data keeps the full values
+SHORT_ID_LENGTH = 8
+SHORT_HASH_LENGTH = 16
+
+# Page served at /, encoded once at import
+INDEX_HTML = '''
 <!DOCTYPE html>
 <html>
 <head>
@@ -205,16 +148,8 @@ class NetworkVisualizer:
 
     <script src="https://d3js.org/d3.v7.min.js"></script>
     <script>
-        // Function to fetch data from the server
-        async function fetchData() {
-            const response = await fetch('/data');
-            return await response.json();
-        }
-
         // Function to update the visualization
-        async function updateVisualization() {
-            const data = await fetchData();
-            
+        function updateVisualization(data) {
             // Update network graph
             updateNetworkGraph(data.nodes, data.connections);
             
@@ -226,81 +161,110 @@ class NetworkVisualizer:
             
             // Update blocks list
             updateBlocksList(data.blocks);
-            
-            // Schedule the next update
-            setTimeout(updateVisualization, 2000);
         }
 
+        // Graph layout and elements, created on the first update and reused afterwards
+        let simulation = null;
+        let linkGroup, nodeGroup, labelGroup;
+        let link, node, label;
+        let lastStructure = '';
+        
+        // Connection endpoints are IDs until the link force replaces them with nodes
+        const endpointId = end => typeof end === 'object' ? end.id : end;
+        const linkKey = d => `${endpointId(d.source)}>${endpointId(d.target)}`;
+
         // Function to update the network graph
         function updateNetworkGraph(nodes, connections) {
             const svg = d3.select('#network');
-            const width = svg.node().getBoundingClientRect().width;
-            const height = svg.node().getBoundingClientRect().height;
             
-            svg.selectAll('*').remove();
+            if (simulation === null) {
+                const width = svg.node().getBoundingClientRect().width;
+                const height = svg.node().getBoundingClientRect().height;
+                
+                linkGroup = svg.append('g');
+                nodeGroup = svg.append('g');
+                labelGroup = svg.append('g');
+                
+                simulation = d3.forceSimulation()
+                    .force('link', d3.forceLink().id(d => d.id).distance(100))
+                    .force('charge', d3.forceManyBody().strength(-300))
+                    .force('center', d3.forceCenter(width / 2, height / 2))
+                    .on('tick', ticked);
+            }
             
-            const simulation = d3.forceSimulation(nodes)
-                .force('link', d3.forceLink(connections).id(d => d.id).distance(100))
-                .force('charge', d3.forceManyBody().strength(-300))
-                .force('center', d3.forceCenter(width / 2, height / 2));
+            // Carry the layout state of nodes already shown over to their new data
+            const previous = new Map(simulation.nodes().map(d => [d.id, d]));
+            nodes.forEach(d => {
+                const old = previous.get(d.id);
+                if (old) {
+                    Object.assign(d, {x: old.x, y: old.y, vx: old.vx, vy: old.vy, fx: old.fx, fy: old.fy});
+                }
+            });
             
-            const link = svg.append('g')
-                .selectAll('line')
-                .data(connections)
-                .enter().append('line')
+            link = linkGroup.selectAll('line')
+                .data(connections, linkKey)
+                .join('line')
                 .attr('class', 'link');
             
-            const node = svg.append('g')
-                .selectAll('circle')
-                .data(nodes)
-                .enter().append('circle')
-                .attr('class', d => `node ${d.status}`)
-                .attr('r', 10)
-                .call(d3.drag()
-                    .on('start', dragstarted)
-                    .on('drag', dragged)
-                    .on('end', dragended));
+            node = nodeGroup.selectAll('circle')
+                .data(nodes, d => d.id)
+                .join(enter => enter.append('circle')
+                    .attr('r', 10)
+                    .call(d3.drag()
+                        .on('start', dragstarted)
+                        .on('drag', dragged)
+                        .on('end', dragended)))
+                .attr('class', d => `node ${d.status}`);
             
-            const label = svg.append('g')
-                .selectAll('text')
-                .data(nodes)
-                .enter().append('text')
-                .attr('class', 'node-label')
-                .attr('dy', '0.35em')
-                .text(d => d.id.substring(0, 8));
+            label = labelGroup.selectAll('text')
+                .data(nodes, d => d.id)
+                .join(enter => enter.append('text')
+                    .attr('class', 'node-label')
+                    .attr('dy', '0.35em')
+                    .text(d => d.id.substring(0, 8)));
             
-            simulation.on('tick', () => {
-                link
-                    .attr('x1', d => d.source.x)
-                    .attr('y1', d => d.source.y)
-                    .attr('x2', d => d.target.x)
-                    .attr('y2', d => d.target.y);
-                
-                node
-                    .attr('cx', d => d.x)
-                    .attr('cy', d => d.y);
-                
-                label
-                    .attr('x', d => d.x)
-                    .attr('y', d => d.y + 20);
-            });
+            simulation.nodes(nodes);
+            simulation.force('link').links(connections);
             
-            function dragstarted(event, d) {
-                if (!event.active) simulation.alphaTarget(0.3).restart();
-                d.fx = d.x;
-                d.fy = d.y;
+            // Only warm-start the layout when nodes or links were added or removed
+            const structure = nodes.map(d => d.id).join(',') + '|' + connections.map(linkKey).join(',');
+            if (structure !== lastStructure) {
+                lastStructure = structure;
+                simulation.alpha(0.3).restart();
             }
+        }
+        
+        function ticked() {
+            link
+                .attr('x1', d => d.source.x)
+                .attr('y1', d => d.source.y)
+                .attr('x2', d => d.target.x)
+                .attr('y2', d => d.target.y);
             
-            function dragged(event, d) {
-                d.fx = event.x;
-                d.fy = event.y;
-            }
+            node
+                .attr('cx', d => d.x)
+                .attr('cy', d => d.y);
             
-            function dragended(event, d) {
-                if (!event.active) simulation.alphaTarget(0);
-                d.fx = null;
-                d.fy = null;
-            }
+            label
+                .attr('x', d => d.x)
+                .attr('y', d => d.y + 20);
+        }
+        
+        function dragstarted(event, d) {
+            if (!event.active) simulation.alphaTarget(0.3).restart();
+            d.fx = d.x;
+            d.fy = d.y;
+        }
+        
+        function dragged(event, d) {
+            d.fx = event.x;
+            d.fy = event.y;
+        }
+        
+        function dragended(event, d) {
+            if (!event.active) simulation.alphaTarget(0);
+            d.fx = null;
+            d.fy = null;
         }
 
         // Function to update the nodes list
@@ -331,9 +295,9 @@ class NetworkVisualizer:
                 const txElement = document.createElement('div');
                 txElement.className = 'transaction';
                 txElement.innerHTML = `
-                    <h3>Transaction ${tx.id.substring(0, 8)}</h3>
-                    <p>From: ${tx.from.substring(0, 8)}</p>
-                    <p>To: ${tx.to.substring(0, 8)}</p>
+                    <h3>Transaction ${tx.id}</h3>
+                    <p>From: ${tx.from}</p>
+                    <p>To: ${tx.to}</p>
                     <p>Amount: ${tx.amount}</p>
                     <p>Time: ${new Date(tx.timestamp * 1000).toLocaleString()}</p>
                 `;
@@ -351,8 +315,8 @@ class NetworkVisualizer:
                 blockElement.className = 'block';
                 blockElement.innerHTML = `
                     <h3>Block ${block.index}</h3>
-                    <p>Hash: ${block.hash.substring(0, 16)}...</p>
-                    <p>Previous Hash: ${block.previous_hash.substring(0, 16)}...</p>
+                    <p>Hash: ${block.hash}...</p>
+                    <p>Previous Hash: ${block.previous_hash}...</p>
                     <p>Transactions: ${block.transactions}</p>
                     <p>Time: ${new Date(block.timestamp * 1000).toLocaleString()}</p>
                 `;
@@ -373,15 +337,157 @@ class NetworkVisualizer:
             });
         });
 
-        // Start the visualization update loop
-        updateVisualization();
+        // Redraw whenever the server pushes new data
+        const events = new EventSource('/events');
+        events.onmessage = (event) => updateVisualization(JSON.parse(event.data));
     </script>
 </body>
 </html>
-'''
+'''.encode()
+
+class NodeRow:
+    """
+    The state shown for one node of the network.
+    """
+    
+    __slots__ = ('id', 'status', 'peers', 'transactions', 'blocks')
+    
+    def __init__(self, node_id: str, status: str = 'active', peers: int = 0, transactions: int = 0, blocks: int = 0):
+        """
+        Initialize a node row.
+        
+        Args:
+            node_id: The ID of the node
+            status: The status of the node ('active' or 'inactive')
+            peers: The number of peers the node has
+            transactions: The number of transactions the node has
+            blocks: The number of blocks the node has
+        """
+        self.id = node_id
+        self.status = status
+        self.peers = peers
+        self.transactions = transactions
+        self.blocks = blocks
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the row to a dictionary.
+        
+        Returns:
+            Dict[str, Any]: The node as it appears in /data
+        """
+        return {
+            'id': self.id,
+            'status': self.status,
+            'peers': self.peers,
+            'transactions': self.transactions,
+            'blocks': self.blocks
+        }
+
+class NetworkVisualizer:
+    """
+    Visualizes the blockchain gossip network using a web interface.
+    """
+    
+    def __init__(self, host: str = 'localhost', port: int = 8080):
+        """
+        Initialize the network visualizer.
+        
+        Args:
+            host: The host to run the visualization server on
+            port: The port to run the visualization server on
+        """
+        self.host = host
+        self.port = port
+        self.nodes: Dict[str, NodeRow] = {}
+        self.connections: Dict[Tuple[str, str], Dict[str, str]] = {}  # Keyed by (source, target), in insertion order
+        self._node_connections: Dict[str, Set[Tuple[str, str]]] = {}  # Keys of the connections touching each node
+        self.transactions: Deque[Dict[str, Any]] = deque(maxlen=RECENT_ITEMS)
+        self.blocks: Deque[Dict[str, Any]] = deque(maxlen=RECENT_ITEMS)
+        self.server: Optional[HTTPServer] = None
+        self.server_thread: Optional[threading.Thread] = None
+        self.running = False
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)  # Notified whenever the data changes
+        self.version = 0  # Incremented on every change
+        self.event_slots = threading.BoundedSemaphore(EVENT_STREAMS)  # Held by each open /events stream
+        self._data: Optional[Tuple[bytes, str]] = None  # Encoded /data response and its ETag, None once stale
+        self._data_gzip: Optional[Tuple[bytes, str]] = None  # Compressed /data response and its ETag, None once stale
+        self._event_data: Optional[bytes] = None  # Encoded /events document, None once stale
+    
+    def start(self) -> None:
+        """
+        Start the visualization server.
+        """
+        if self.running:
+            print("Visualization server is already running")
+            return
+        
+        # Create a custom HTTP request handler
+        visualizer = self
+        
+        class VisualizerHandler(BaseHTTPRequestHandler):
+            # Keep connections open between polls; every response sets Content-Length
+            protocol_version = 'HTTP/1.1'
+            timeout = CONNECTION_TIMEOUT
+            
+            # Send each response as soon as it is flushed, without waiting on Nagle
+            disable_nagle_algorithm = True
+            wbufsize = RESPONSE_BUFFER_SIZE
+            
+            def do_GET(self):
+                if self.path == '/':
+                    self.send_response(200)
+                    self.send_header('Content-type', 'text/html')
+                    self.send_header('Content-Length', str(len(INDEX_HTML)))
+                    self.end_headers()
+                    self.wfile.write(INDEX_HTML)
+                elif self.path == '/data':
+                    compressed = 'gzip' in self.headers.get('Accept-Encoding', '')
+                    body, etag = visualizer.get_data(compressed)
+                    if self.headers.get('If-None-Match') == etag:
+                        # The client's copy is current; the browser reuses it
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.send_header('Vary', 'Accept-Encoding')
+                        self.end_headers()
+                    else:
+                        self.send_response(200)
+                        self.send_header('Content-type', 'application/json')
+                        if compressed:
+                            self.send_header('Content-Encoding', 'gzip')
+                        self.send_header('Vary', 'Accept-Encoding')
+                        self.send_header('ETag', etag)
+                        self.send_header('Cache-Control', 'no-cache')
+                        self.send_header('Content-Length', str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                elif self.path == '/events':
+                    stream_events(self, visualizer, visualizer.get_event_data)
+                elif self.path.startswith('/static/'):
+                    # Serve static files (CSS, JS)
+                    name = self.path[8:]
+                    body = read_static_file(name)
+                    if body is not None:
+                        self.send_response(200)
+                        content_type = STATIC_CONTENT_TYPES.get(os.path.splitext(name)[1])
+                        if content_type:
+                            self.send_header('Content-type', content_type)
+                        self.send_header('Cache-Control', f'max-age={STATIC_MAX_AGE}')
+                        self.send_header('Content-Length', str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                    else:
+                        self.send_response(404)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                else:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
         
         # Create and start the server
-        self.server = socketserver.TCPServer((self.host, self.port), VisualizerHandler)
+        self.server = PooledHTTPServer((self.host, self.port), VisualizerHandler)
         self.server_thread = threading.Thread(target=self.server.serve_forever)
         self.server_thread.daemon = True
         self.server_thread.start()
@@ -401,6 +507,10 @@ class NetworkVisualizer:
             self.server.shutdown()
             self.server.server_close()
             self.running = False
+            
+            # Wake the open /events streams so they see the server has stopped
+            with self.changed:
+                self.changed.notify_all()
             print("Visualization server stopped")
     
     def add_node(self, node_id: str, status: str = 'active', peers: int = 0, transactions: int = 0, blocks: int = 0) -> None:
@@ -414,13 +524,9 @@ class NetworkVisualizer:
             transactions: The number of transactions the node has
             blocks: The number of blocks the node has
         """
-        self.nodes[node_id] = {
-            'id': node_id,
-            'status': status,
-            'peers': peers,
-            'transactions': transactions,
-            'blocks': blocks
-        }
+        with self.changed:
+            self.nodes[node_id] = NodeRow(node_id, status, peers, transactions, blocks)
+            self._data_changed()
     
     def update_node(self, node_id: str, status: Optional[str] = None, peers: Optional[int] = None, 
                    transactions: Optional[int] = None, blocks: Optional[int] = None) -> None:
@@ -434,20 +540,21 @@ class NetworkVisualizer:
             transactions: The number of transactions the node has
             blocks: The number of blocks the node has
         """
-        if node_id not in self.nodes:
-            self.add_node(node_id)
-        
-        if status is not None:
-            self.nodes[node_id]['status'] = status
-        
-        if peers is not None:
-            self.nodes[node_id]['peers'] = peers
-        
-        if transactions is not None:
-            self.nodes[node_id]['transactions'] = transactions
-        
-        if blocks is not None:
-            self.nodes[node_id]['blocks'] = blocks
+        changes = {'status': status, 'peers': peers, 'transactions': transactions, 'blocks': blocks}
+        with self.changed:
+            node = self.nodes.get(node_id)
+            changed = node is None
+            if changed:
+                node = self.nodes[node_id] = NodeRow(node_id)
+            
+            for field, value in changes.items():
+                if value is not None and getattr(node, field) != value:
+                    setattr(node, field, value)
+                    changed = True
+            
+            # Only invalidate the cached /data response if something changed
+            if changed:
+                self._data_changed()
     
     def remove_node(self, node_id: str) -> None:
         """
@@ -456,11 +563,14 @@ class NetworkVisualizer:
         Args:
             node_id: The ID of the node
         """
-        if node_id in self.nodes:
-            del self.nodes[node_id]
-            
-            # Remove any connections involving this node
-            self.connections = [c for c in self.connections if c['source'] != node_id and c['target'] != node_id]
+        with self.changed:
+            if node_id in self.nodes:
+                del self.nodes[node_id]
+                
+                # Remove any connections involving this node
+                for key in self._node_connections.pop(node_id, ()):
+                    self._remove_connection_key(key)
+                self._data_changed()
     
     def add_connection(self, source_id: str, target_id: str) -> None:
         """
@@ -470,17 +580,25 @@ class NetworkVisualizer:
             source_id: The ID of the source node
             target_id: The ID of the target node
         """
-        # Make sure both nodes exist
-        if source_id not in self.nodes:
-            self.add_node(source_id)
-        
-        if target_id not in self.nodes:
-            self.add_node(target_id)
-        
-        # Add the connection if it doesn't already exist
-        connection = {'source': source_id, 'target': target_id}
-        if connection not in self.connections:
-            self.connections.append(connection)
+        key = (source_id, target_id)
+        with self.changed:
+            changed = False
+            
+            # Make sure both nodes exist
+            for node_id in key:
+                if node_id not in self.nodes:
+                    self.nodes[node_id] = NodeRow(node_id)
+                    changed = True
+            
+            # Add the connection if it doesn't already exist
+            if key not in self.connections:
+                self.connections[key] = {'source': source_id, 'target': target_id}
+                self._node_connections.setdefault(source_id, set()).add(key)
+                self._node_connections.setdefault(target_id, set()).add(key)
+                changed = True
+            
+            if changed:
+                self._data_changed()
     
     def remove_connection(self, source_id: str, target_id: str) -> None:
         """
@@ -490,7 +608,26 @@ class NetworkVisualizer:
             source_id: The ID of the source node
             target_id: The ID of the target node
         """
-        self.connections = [c for c in self.connections if not (c['source'] == source_id and c['target'] == target_id)]
+        key = (source_id, target_id)
+        with self.changed:
+            if key in self.connections:
+                self._remove_connection_key(key)
+                self._data_changed()
+    
+    def _remove_connection_key(self, key: Tuple[str, str]) -> None:
+        """
+        Remove a connection and its entries in the per-node index. Must be called with the lock held.
+        
+        Args:
+            key: The (source, target) of the connection
+        """
+        del self.connections[key]
+        for node_id in key:
+            keys = self._node_connections.get(node_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._node_connections[node_id]
     
     def add_transaction(self, tx_id: str, from_addr: str, to_addr: str, amount: float, timestamp: Optional[float] = None) -> None:
         """
@@ -506,17 +643,17 @@ class NetworkVisualizer:
         if timestamp is None:
             timestamp = time.time()
         
-        self.transactions.append({
-            'id': tx_id,
-            'from': from_addr,
-            'to': to_addr,
-            'amount': amount,
-            'timestamp': timestamp
-        })
-        
-        # Keep only the 10 most recent transactions
-        if len(self.transactions) > 10:
-            self.transactions = self.transactions[-10:]
+        # Once full, the deque drops the oldest transaction; appending under
+        # the lock keeps it from changing while get_data iterates it
+        with self.changed:
+            self.transactions.append({
+                'id': tx_id,
+                'from': from_addr,
+                'to': to_addr,
+                'amount': amount,
+                'timestamp': timestamp
+            })
+            self._data_changed()
     
     def add_block(self, index: int, hash_val: str, prev_hash: str, transactions: int, timestamp: Optional[float] = None) -> None:
         """
@@ -532,17 +669,114 @@ class NetworkVisualizer:
         if timestamp is None:
             timestamp = time.time()
         
-        self.blocks.append({
-            'index': index,
-            'hash': hash_val,
-            'previous_hash': prev_hash,
-            'transactions': transactions,
-            'timestamp': timestamp
-        })
+        # Once full, the deque drops the oldest block
+        with self.changed:
+            self.blocks.append({
+                'index': index,
+                'hash': hash_val,
+                'previous_hash': prev_hash,
+                'transactions': transactions,
+                'timestamp': timestamp
+            })
+            self._data_changed()
+    
+    def get_data(self, compressed: bool = False) -> Tuple[bytes, str]:
+        """
+        Get the JSON document served at /data and its ETag.
+        
+        The encoding, its gzip form and their ETags are cached until the
+        nodes, connections, transactions or blocks change, so polling
+        clients do not re-serialize or re-compress unchanged data, and
+        clients that already have it are answered with 304.
+        
+        Args:
+            compressed: Whether to return the gzip-compressed document
+            
+        Returns:
+            Tuple[bytes, str]: The visualization state encoded as JSON, and its quoted ETag
+        """
+        with self.lock:
+            if self._data is None:
+                data = {
+                    'nodes': [node.to_dict() for node in self.nodes.values()],
+                    'connections': list(self.connections.values()),
+                    'transactions': list(self.transactions),
+                    'blocks': list(self.blocks)
+                }
+                body = dumps(data)
+                etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+                self._data = (body, etag)
+            if not compressed:
+                return self._data
+            
+            if self._data_gzip is None:
+                # The compressed form is a different representation, so it gets its own ETag
+                body, etag = self._data
+                self._data_gzip = (gzip.compress(body, DATA_GZIP_LEVEL), etag[:-1] + '-gzip"')
+            return self._data_gzip
+    
+    def get_event_data(self) -> bytes:
+        """
+        Get the JSON document pushed to the page over /events.
         
-        # Keep only the 10 most recent blocks
-        if len(self.blocks) > 10:
-            self.blocks = self.blocks[-10:]
+        It has the shape of /data, but transaction IDs, addresses and block
+        hashes are cut to the prefixes the page displays. Node IDs stay
+        whole because connections refer to them. Like /data, the encoding
+        is cached until the data changes.
+        
+        Returns:
+            bytes: The narrowed visualization state encoded as JSON
+        """
+        with self.lock:
+            if self._event_data is None:
+                data = {
+                    'nodes': [node.to_dict() for node in self.nodes.values()],
+                    'connections': list(self.connections.values()),
+                    'transactions': [
+                        {
+                            **tx,
+                            'id': tx['id'][:SHORT_ID_LENGTH],
+                            'from': tx['from'][:SHORT_ID_LENGTH],
+                            'to': tx['to'][:SHORT_ID_LENGTH]
+                        }
+                        for tx in self.transactions
+                    ],
+                    'blocks': [
+                        {
+                            **block,
+                            'hash': block['hash'][:SHORT_HASH_LENGTH],
+                            'previous_hash': block['previous_hash'][:SHORT_HASH_LENGTH]
+                        }
+                        for block in self.blocks
+                    ]
+                }
+                self._event_data = dumps(data)
+            return self._event_data
+    
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """
+        Wait until the data has changed since a version was observed.
+        
+        Args:
+            version: The last version the caller has seen
+            timeout: The maximum number of seconds to wait
+            
+        Returns:
+            int: The current version, which equals the given one on timeout
+        """
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version or not self.running, timeout)
+            return self.version
+    
+    def _data_changed(self) -> None:
+        """
+        Discard the cached /data and /events encodings and wake waiters. Must be called with the lock held.
+        """
+        self._data = None
+        self._data_gzip = None
+        self._event_data = None
+        self.version += 1
+        self.changed.notify_all()
     
     def open_in_browser(self) -> None:
         """
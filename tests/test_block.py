@@ -0,0 +1,218 @@
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.blockchain.block import HEADER_NONCE, HEADER_PREFIX, Block, create_genesis_block, validate_block, validate_chain
+from src.blockchain.pow import NONCE_BATCH_SIZE
+from src.utils.crypto import sha256, sha256_once
+
+
+class TestBlock(unittest.TestCase):
+    """
+    Test block hashing and chain validation.
+    """
+    
+    def _chain(self, length, difficulty=1):
+        """
+        Build a mined chain of the given length, including the genesis block.
+        """
+        chain = [create_genesis_block()]
+        for i in range(1, length):
+            block = Block(i, [{'id': f"tx-{i}", 'sender': 'alice', 'receiver': 'bob', 'amount': i}],
+                          previous_hash=chain[-1].hash)
+            block.mine_block(difficulty)
+            chain.append(block)
+        return chain
+    
+    def test_validate_chain(self):
+        """
+        Test that a mined chain validates and a broken link is rejected.
+        """
+        chain = self._chain(5)
+        self.assertTrue(validate_chain(chain, 1))
+        
+        chain[3].previous_hash = chain[1].hash
+        self.assertFalse(validate_chain(chain, 1))
+    
+    def test_validate_chain_detects_modified_transaction(self):
+        """
+        Test that a transaction changed after validation invalidates the chain.
+        """
+        chain = self._chain(4)
+        self.assertTrue(validate_chain(chain, 1))
+        
+        chain[2].transactions[0]['amount'] = 1000
+        self.assertFalse(validate_chain(chain, 1))
+    
+    def test_is_valid_detects_changes(self):
+        """
+        Test that is_valid rechecks the transactions and hash on every call.
+        """
+        block = self._chain(2)[1]
+        self.assertTrue(block.is_valid())
+        self.assertTrue(block.is_valid())
+        
+        block.transactions[0]['amount'] = 1000
+        self.assertFalse(block.is_valid())
+        
+        block.transactions[0]['amount'] = 1
+        self.assertTrue(block.is_valid())
+        
+        block.hash = '0' * 64
+        self.assertFalse(block.is_valid())
+    
+    def test_header_layout(self):
+        """
+        Test that the header packs every field into its fixed binary layout.
+        """
+        block = Block(3, [{'id': 'tx-1', 'sender': 'alice', 'receiver': 'bob', 'amount': 5}],
+                      timestamp=1700000000.5, previous_hash='cd' * 32, nonce=42)
+        header = block.header_bytes()
+        
+        self.assertEqual(len(header), HEADER_PREFIX.size + HEADER_NONCE.size)
+        self.assertEqual(HEADER_PREFIX.unpack(header[:HEADER_PREFIX.size]),
+                         (3, bytes.fromhex('cd' * 32), block.merkle_root, 1700000000.5))
+        self.assertEqual(HEADER_NONCE.unpack(header[HEADER_PREFIX.size:]), (42,))
+    
+    def test_previous_hash_encoding(self):
+        """
+        Test the header encoding of the genesis and non-hex previous hashes.
+        """
+        genesis = create_genesis_block()
+        self.assertEqual(genesis.header_bytes()[8:40], bytes(32))
+        
+        block = Block(1, [], timestamp=1700000000.0, previous_hash='not-a-hash')
+        self.assertEqual(block.header_bytes()[8:40], sha256_once(b'not-a-hash'))
+    
+    def test_every_header_field_changes_hash(self):
+        """
+        Test that changing any hashed field changes the block hash.
+        """
+        def build(**overrides):
+            fields = {
+                'index': 1,
+                'transactions': [{'id': 'tx-1', 'sender': 'alice', 'receiver': 'bob', 'amount': 5}],
+                'timestamp': 1700000000.0,
+                'previous_hash': 'ab' * 32,
+                'nonce': 0
+            }
+            fields.update(overrides)
+            return Block(**fields).hash
+        
+        base = build()
+        self.assertEqual(build(), base)
+        for overrides in ({'index': 2}, {'timestamp': 1700000001.0}, {'previous_hash': 'ac' * 32},
+                          {'nonce': 1}, {'transactions': []}):
+            self.assertNotEqual(build(**overrides), base)
+    
+    def test_dict_round_trip_keeps_hash(self):
+        """
+        Test that a block rebuilt from its dictionary recomputes the same hash.
+        """
+        block = self._chain(2)[1]
+        restored = Block.from_dict(block.to_dict(include_hash=False))
+        
+        self.assertEqual(restored.hash, block.hash)
+        self.assertTrue(restored.is_valid())
+    
+    def test_validate_block_checks_difficulty(self):
+        """
+        Test that a block is only accepted at difficulties its hash meets.
+        """
+        chain = self._chain(2, difficulty=2)
+        leading_zeros = len(chain[1].hash) - len(chain[1].hash.lstrip('0'))
+        
+        self.assertTrue(validate_block(chain[1], chain[0], leading_zeros))
+        self.assertFalse(validate_block(chain[1], chain[0], leading_zeros + 1))
+
+
+class TestBlockMining(unittest.TestCase):
+    """
+    Test the nonce search in Block.mine_block.
+    """
+    
+    def _block(self):
+        """
+        Create an unmined block with a couple of transactions.
+        """
+        transactions = [
+            {'id': 'tx-1', 'sender': 'alice', 'receiver': 'bob', 'amount': 5},
+            {'id': 'tx-2', 'sender': 'bob', 'receiver': 'carol', 'amount': 2}
+        ]
+        return Block(1, transactions, timestamp=1700000000.0, previous_hash='ab' * 32)
+    
+    def test_mined_hash_matches_calculate_hash(self):
+        """
+        Test that the hash found while mining is the block's own hash.
+        """
+        for difficulty in (1, 2, 3):
+            block = self._block()
+            block.mine_block(difficulty)
+            
+            self.assertTrue(block.hash.startswith('0' * difficulty))
+            self.assertEqual(block.hash, block.calculate_hash())
+            self.assertTrue(block.is_valid())
+    
+    def test_mining_a_mined_block_keeps_its_nonce(self):
+        """
+        Test that a block already meeting the difficulty is left unchanged.
+        """
+        block = self._block()
+        block.mine_block(2)
+        nonce, block_hash = block.nonce, block.hash
+        
+        block.mine_block(2)
+        
+        self.assertEqual((block.nonce, block.hash), (nonce, block_hash))
+    
+    def test_mining_finds_first_valid_nonce(self):
+        """
+        Test that the batched search returns the first nonce meeting the difficulty.
+        """
+        difficulty = 4
+        expected = self._block()
+        while not expected.calculate_hash().startswith('0' * difficulty):
+            expected.nonce += 1
+        
+        # The first match lies well past the first batch
+        self.assertGreater(expected.nonce, NONCE_BATCH_SIZE)
+        
+        block = self._block()
+        block.mine_block(difficulty)
+        
+        self.assertEqual(block.nonce, expected.nonce)
+        self.assertEqual(block.hash, expected.calculate_hash())
+    
+    def test_midstate_copies_match_full_hash(self):
+        """
+        Test that hashing the nonce onto a copied prefix midstate gives the full header hash.
+        """
+        block = self._block()
+        midstate = sha256(block._header_prefix())
+        
+        for nonce in (0, 1, NONCE_BATCH_SIZE, 2 ** 40):
+            block.nonce = nonce
+            hasher = midstate.copy()
+            hasher.update(HEADER_NONCE.pack(nonce))
+            
+            self.assertEqual(block._header_prefix() + HEADER_NONCE.pack(nonce), block.header_bytes())
+            self.assertEqual(hasher.hexdigest(), block.calculate_hash())
+    
+    def test_mining_with_workers(self):
+        """
+        Test that a block mined across worker processes ends up with a valid hash.
+        """
+        block = self._block()
+        block.mine_block(3, workers=2)
+        
+        self.assertTrue(block.hash.startswith('000'))
+        self.assertEqual(block.hash, block.calculate_hash())
+        self.assertTrue(block.is_valid())
+
+
+if __name__ == '__main__':
+    unittest.main()
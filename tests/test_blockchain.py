@@ -0,0 +1,216 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.blockchain.chain import FRAME_HEADER, Blockchain
+from src.blockchain.block import Block
+from src.blockchain.transaction import Transaction
+
+
+def _transfer_chain(transfers):
+    """
+    Build a chain with one mined block per (sender, receiver, amount) transfer.
+    """
+    blockchain = Blockchain(difficulty=1)
+    for i, (sender, receiver, amount) in enumerate(transfers, start=1):
+        block = Block(i, [{'id': f"tx-{i}", 'sender': sender, 'receiver': receiver, 'amount': amount}],
+                      previous_hash=blockchain.get_latest_block().hash)
+        block.mine_block(blockchain.difficulty)
+        blockchain.add_block(block)
+    return blockchain
+
+
+class TestBlockchainMining(unittest.TestCase):
+    """
+    Test mining pending transactions into the chain.
+    """
+    
+    def test_mine_with_workers(self):
+        """
+        Test that a chain configured with several mining processes mines a valid block.
+        """
+        blockchain = Blockchain(difficulty=2, mining_workers=2)
+        self.assertTrue(blockchain.add_transaction(Transaction('alice', 'bob', 5, signature='signature')))
+        
+        block = blockchain.mine_pending_transactions('miner')
+        
+        self.assertIsNotNone(block)
+        self.assertTrue(block.hash.startswith('00'))
+        self.assertTrue(blockchain.is_chain_valid())
+        self.assertEqual(blockchain.get_balance('miner'), 1.0)
+    
+    def test_assigned_difficulty_is_used(self):
+        """
+        Test that assigning the difficulty updates the target blocks are checked against.
+        """
+        blockchain = Blockchain(difficulty=20)
+        blockchain.difficulty = 1
+        
+        block = Block(1, [], previous_hash=blockchain.get_latest_block().hash)
+        block.mine_block(1)
+        
+        self.assertTrue(blockchain.add_block(block))
+
+
+class TestTransactionIndex(unittest.TestCase):
+    """
+    Test address queries answered from the transaction index.
+    """
+    
+    def setUp(self):
+        """
+        Set up a short chain with a few transfers.
+        """
+        self.blockchain = _transfer_chain([
+            ('alice', 'bob', 10),
+            ('bob', 'carol', 4),
+            ('alice', 'carol', 3)
+        ])
+    
+    def test_transaction_history(self):
+        """
+        Test that the history lists every transaction involving an address with its block.
+        """
+        history = self.blockchain.get_transaction_history('carol')
+        
+        self.assertEqual([tx['id'] for tx in history], ['tx-2', 'tx-3'])
+        self.assertEqual([tx['block_index'] for tx in history], [2, 3])
+        self.assertEqual([tx['block_hash'] for tx in history],
+                         [self.blockchain.chain[2].hash, self.blockchain.chain[3].hash])
+        self.assertEqual(self.blockchain.get_transaction_history('dave'), [])
+    
+    def test_history_entries_are_copies(self):
+        """
+        Test that the history does not expose the transactions stored in the blocks.
+        """
+        history = self.blockchain.get_transaction_history('alice')
+        history[0]['amount'] = 1000
+        
+        self.assertNotIn('block_index', self.blockchain.chain[1].transactions[0])
+        self.assertEqual(self.blockchain.chain[1].transactions[0]['amount'], 10)
+    
+    def test_replace_chain_rebuilds_index(self):
+        """
+        Test that replacing the chain re-indexes the new blocks.
+        """
+        longer = _transfer_chain([('alice', 'dave', 1)] * 4)
+        
+        self.assertTrue(self.blockchain.replace_chain(longer.chain))
+        self.assertEqual(self.blockchain.get_transaction_history('carol'), [])
+        self.assertEqual(len(self.blockchain.get_transaction_history('dave')), 4)
+    
+    def test_balances(self):
+        """
+        Test that balances follow each indexed transfer.
+        """
+        self.assertEqual(self.blockchain.get_balance('alice'), -13)
+        self.assertEqual(self.blockchain.get_balance('bob'), 6)
+        self.assertEqual(self.blockchain.get_balance('carol'), 7)
+        self.assertEqual(self.blockchain.get_balance('dave'), 0.0)
+    
+    def test_balances_update_as_blocks_are_added(self):
+        """
+        Test that appending and mining blocks update balances without a rebuild.
+        """
+        block = Block(4, [{'id': 'tx-4', 'sender': 'carol', 'receiver': 'dave', 'amount': 5}],
+                      previous_hash=self.blockchain.get_latest_block().hash)
+        block.mine_block(self.blockchain.difficulty)
+        self.assertTrue(self.blockchain.add_block(block))
+        
+        self.assertEqual(self.blockchain.get_balance('carol'), 2)
+        self.assertEqual(self.blockchain.get_balance('dave'), 5)
+        
+        self.assertTrue(self.blockchain.add_transaction(Transaction('dave', 'erin', 2, signature='signature')))
+        self.assertIsNotNone(self.blockchain.mine_pending_transactions('miner'))
+        
+        self.assertEqual(self.blockchain.get_balance('dave'), 3)
+        self.assertEqual(self.blockchain.get_balance('erin'), 2)
+        self.assertEqual(self.blockchain.get_balance('miner'), 1.0)
+
+
+class TestBlockchainStorage(unittest.TestCase):
+    """
+    Test the length-prefixed chain file format.
+    """
+    
+    def setUp(self):
+        """
+        Set up a short chain and a scratch directory for the chain file.
+        """
+        self.blockchain = _transfer_chain([
+            ('alice', 'bob', 10),
+            ('bob', 'carol', 4)
+        ])
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, 'chain.dat')
+    
+    def tearDown(self):
+        """
+        Remove the chain file.
+        """
+        self.temp_dir.cleanup()
+    
+    def _assert_same_chain(self, loaded, blockchain):
+        """
+        Assert that a loaded chain has the blocks and balances of another.
+        """
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.difficulty, blockchain.difficulty)
+        self.assertEqual([block.hash for block in loaded.chain],
+                         [block.hash for block in blockchain.chain])
+        for address in ('alice', 'bob', 'carol'):
+            self.assertEqual(loaded.get_balance(address), blockchain.get_balance(address))
+    
+    def test_save_load_round_trip(self):
+        """
+        Test that a saved chain loads with the same blocks and balances.
+        """
+        self.assertTrue(self.blockchain.save_to_file(self.filename))
+        
+        self._assert_same_chain(Blockchain.load_from_file(self.filename), self.blockchain)
+    
+    def test_append_block(self):
+        """
+        Test that an appended block is loaded after the saved ones.
+        """
+        self.blockchain.save_to_file(self.filename)
+        
+        block = Block(3, [{'id': 'tx-3', 'sender': 'alice', 'receiver': 'carol', 'amount': 3}],
+                      previous_hash=self.blockchain.get_latest_block().hash)
+        block.mine_block(self.blockchain.difficulty)
+        self.assertTrue(self.blockchain.add_block(block))
+        self.assertTrue(self.blockchain.append_block_to_file(self.filename, block))
+        
+        self._assert_same_chain(Blockchain.load_from_file(self.filename), self.blockchain)
+    
+    def test_truncated_frame_is_ignored(self):
+        """
+        Test that a block frame cut short by an interrupted append is skipped.
+        """
+        self.blockchain.save_to_file(self.filename)
+        saved_hashes = [block.hash for block in self.blockchain.chain]
+        
+        with open(self.filename, 'ab') as f:
+            f.write(FRAME_HEADER.pack(100) + b'{"index": 3')
+        
+        loaded = Blockchain.load_from_file(self.filename)
+        self.assertEqual([block.hash for block in loaded.chain], saved_hashes)
+    
+    def test_load_single_document_format(self):
+        """
+        Test that files written as one JSON document still load.
+        """
+        with open(self.filename, 'w') as f:
+            json.dump(self.blockchain.to_dict(), f, indent=4)
+        
+        self._assert_same_chain(Blockchain.load_from_file(self.filename), self.blockchain)
+
+
+if __name__ == '__main__':
+    unittest.main()
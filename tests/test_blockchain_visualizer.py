@@ -0,0 +1,197 @@
+import gzip
+import http.client
+import os
+import random
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.visualization.blockchain_visualizer import BlockchainVisualizer, RECENT_TRANSACTIONS, read_static_file
+from src.utils.serialization import loads
+
+
+def make_block(index):
+    """Build block data with every field the visualizer requires."""
+    return {'index': index, 'hash': f"hash-{index}", 'previous_hash': f"hash-{index - 1}", 'timestamp': float(index)}
+
+
+def make_transaction(timestamp):
+    """Build transaction data with every field the visualizer requires."""
+    return {'id': f"tx-{timestamp}", 'from': 'alice', 'to': 'bob', 'amount': 1, 'timestamp': timestamp}
+
+
+class TestBlockchainVisualizerData(unittest.TestCase):
+    """
+    Test the data kept and served by the blockchain visualizer.
+    """
+    
+    def setUp(self):
+        """
+        Set up a visualizer without starting its server.
+        """
+        self.visualizer = BlockchainVisualizer(port=0)
+    
+    def test_concurrent_inserts_stay_sorted(self):
+        """
+        Test that concurrent callers keep the sort keys in step with the data.
+        """
+        indexes = list(range(400))
+        random.shuffle(indexes)
+        
+        def add_blocks(part):
+            for index in part:
+                self.visualizer.add_block(make_block(index))
+                self.visualizer.add_transaction(make_transaction(float(index)))
+        
+        threads = [threading.Thread(target=add_blocks, args=(indexes[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual([block['index'] for block in self.visualizer.blocks], list(range(400)))
+        self.assertEqual(self.visualizer._block_keys, list(range(400)))
+        
+        newest = [float(index) for index in range(399, 399 - RECENT_TRANSACTIONS, -1)]
+        self.assertEqual([tx['timestamp'] for tx in self.visualizer.transactions], newest)
+        self.assertEqual(self.visualizer._transaction_keys, [-timestamp for timestamp in newest])
+    
+    def test_changes_refresh_data(self):
+        """
+        Test that every kind of change replaces the cached /data document.
+        """
+        self.visualizer.add_block(make_block(1))
+        first = loads(self.visualizer.get_data_bytes())
+        self.assertEqual([block['index'] for block in first['blocks']], [1])
+        
+        self.visualizer.add_blocks([make_block(3), make_block(2), {'index': 4}])
+        self.visualizer.add_transactions([make_transaction(5.0)])
+        data = loads(self.visualizer.get_data_bytes())
+        self.assertEqual([block['index'] for block in data['blocks']], [1, 2, 3])
+        self.assertEqual([tx['timestamp'] for tx in data['transactions']], [5.0])
+        
+        self.visualizer.update_from_blockchain([make_block(7)], [])
+        data = loads(self.visualizer.get_data_bytes())
+        self.assertEqual([block['index'] for block in data['blocks']], [7])
+        self.assertEqual(data['transactions'], [])
+    
+    def test_compressed_data_is_cached(self):
+        """
+        Test that the gzip form of /data matches the JSON and is rebuilt only after a change.
+        """
+        self.visualizer.add_block(make_block(1))
+        compressed = self.visualizer.get_data_bytes(compressed=True)
+        
+        self.assertEqual(gzip.decompress(compressed), self.visualizer.get_data_bytes())
+        self.assertIs(self.visualizer.get_data_bytes(compressed=True), compressed)
+        
+        self.visualizer.add_block(make_block(2))
+        changed = self.visualizer.get_data_bytes(compressed=True)
+        self.assertEqual([block['index'] for block in loads(gzip.decompress(changed))['blocks']], [1, 2])
+
+
+class TestBlockchainVisualizerServer(unittest.TestCase):
+    """
+    Test the HTTP responses of the blockchain visualizer.
+    """
+    
+    def setUp(self):
+        """
+        Start a visualizer on a free port with one block.
+        """
+        self.visualizer = BlockchainVisualizer(port=0)
+        self.visualizer.add_block(make_block(1))
+        self.visualizer.start()
+        self.connection = http.client.HTTPConnection('localhost', self.visualizer.server.server_address[1], timeout=5)
+    
+    def tearDown(self):
+        """
+        Close the connection and stop the server.
+        """
+        self.connection.close()
+        self.visualizer.stop()
+    
+    def _get(self, path, headers=None):
+        """
+        Request a path and return the response with its body read.
+        """
+        self.connection.request('GET', path, headers=headers or {})
+        response = self.connection.getresponse()
+        return response, response.read()
+    
+    def test_data_is_compressed_when_accepted(self):
+        """
+        Test that /data is gzip-encoded only for clients that accept it.
+        """
+        response, body = self._get('/data', {'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.getheader('Content-Encoding'), 'gzip')
+        self.assertEqual(response.getheader('Vary'), 'Accept-Encoding')
+        self.assertEqual(loads(gzip.decompress(body))['blocks'], [make_block(1)])
+        
+        response, body = self._get('/data')
+        self.assertIsNone(response.getheader('Content-Encoding'))
+        self.assertEqual(loads(body)['blocks'], [make_block(1)])
+
+
+class TestStaticFiles(unittest.TestCase):
+    """
+    Test reading files from the static directory.
+    """
+    
+    def setUp(self):
+        """
+        Point the static directory at a scratch directory with one file.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.static_dir = os.path.join(self.temp_dir.name, 'static')
+        os.makedirs(os.path.join(self.static_dir, 'css'))
+        with open(os.path.join(self.static_dir, 'app.js'), 'wb') as f:
+            f.write(b'console.log(1);')
+        with open(os.path.join(self.temp_dir.name, 'secret.txt'), 'wb') as f:
+            f.write(b'secret')
+        
+        self.patches = [
+            mock.patch('src.visualization.blockchain_visualizer.STATIC_DIR', self.static_dir),
+            mock.patch.dict('src.visualization.blockchain_visualizer._static_cache', clear=True)
+        ]
+        for patch in self.patches:
+            patch.start()
+    
+    def tearDown(self):
+        """
+        Restore the static directory and remove the scratch files.
+        """
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.temp_dir.cleanup()
+    
+    def test_contents_are_cached_until_the_file_changes(self):
+        """
+        Test that an unchanged file is served from the cache and a changed one is re-read.
+        """
+        first = read_static_file('app.js')
+        self.assertEqual(first, b'console.log(1);')
+        self.assertIs(read_static_file('app.js'), first)
+        
+        with open(os.path.join(self.static_dir, 'app.js'), 'wb') as f:
+            f.write(b'console.log(22);')
+        
+        self.assertEqual(read_static_file('app.js'), b'console.log(22);')
+    
+    def test_paths_outside_static_dir_are_refused(self):
+        """
+        Test that traversal, absolute paths, directories and missing files are not served.
+        """
+        for name in ('../secret.txt', 'css/../../secret.txt', os.path.join(self.temp_dir.name, 'secret.txt'),
+                     'css', '', 'missing.js'):
+            self.assertIsNone(read_static_file(name), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
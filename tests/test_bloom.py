@@ -0,0 +1,113 @@
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.network.bloom import BloomFilter, RotatingBloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+    """
+    Test membership queries and serialization of a single Bloom filter.
+    """
+    
+    def test_no_false_negatives(self):
+        """
+        Test that every added item is reported as present.
+        """
+        bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+        items = [f"message-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        
+        self.assertEqual(len(bloom), 1000)
+        for item in items:
+            self.assertIn(item, bloom)
+    
+    def test_false_positive_rate(self):
+        """
+        Test that a full filter stays near its configured false-positive rate.
+        """
+        bloom = BloomFilter(capacity=1000, error_rate=1e-2)
+        for i in range(1000):
+            bloom.add(f"message-{i}")
+        
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+    
+    def test_to_dict_round_trip(self):
+        """
+        Test that a filter rebuilt from to_dict answers the same queries.
+        """
+        bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+        items = [f"message-{i}" for i in range(200)]
+        for item in items:
+            bloom.add(item)
+        
+        restored = BloomFilter.from_dict(bloom.to_dict())
+        
+        self.assertEqual(restored.num_bits, bloom.num_bits)
+        self.assertEqual(restored.num_hashes, bloom.num_hashes)
+        self.assertEqual(restored.bits, bloom.bits)
+        for item in items:
+            self.assertIn(item, restored)
+        
+        # Items never added give the same answer from both filters
+        for i in range(200, 400):
+            item = f"message-{i}"
+            self.assertEqual(item in restored, item in bloom)
+    
+    def test_from_dict_rejects_size_mismatch(self):
+        """
+        Test that a bit array of the wrong length is rejected.
+        """
+        data = BloomFilter(capacity=100, error_rate=1e-3).to_dict()
+        data['num_bits'] += 64
+        
+        with self.assertRaises(ValueError):
+            BloomFilter.from_dict(data)
+    
+    def test_from_dict_rejects_hash_count(self):
+        """
+        Test that a hash count outside the supported range is rejected.
+        """
+        data = BloomFilter(capacity=100, error_rate=1e-3).to_dict()
+        
+        for num_hashes in (0, 65):
+            data['num_hashes'] = num_hashes
+            with self.assertRaises(ValueError):
+                BloomFilter.from_dict(data)
+
+
+class TestRotatingBloomFilter(unittest.TestCase):
+    """
+    Test the two-generation Bloom filter used for seen gossip messages.
+    """
+    
+    def test_rotation_keeps_one_previous_generation(self):
+        """
+        Test that items survive one rotation and are dropped by the next.
+        """
+        bloom = RotatingBloomFilter(capacity=10, error_rate=1e-6)
+        first = [f"first-{i}" for i in range(10)]
+        second = [f"second-{i}" for i in range(10)]
+        
+        for item in first + second:
+            bloom.add(item)
+        for item in first + second:
+            self.assertIn(item, bloom)
+        
+        bloom.add("third-0")
+        
+        self.assertIn("third-0", bloom)
+        for item in second:
+            self.assertIn(item, bloom)
+        for item in first:
+            self.assertNotIn(item, bloom)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.node.config import NodeConfig
+
+
+class TestNodeConfig(unittest.TestCase):
+    """
+    Test configuration overrides layered over the shared defaults.
+    """
+    
+    def test_writes_land_in_overrides(self):
+        """
+        Test that every way of writing a setting stores only the override.
+        """
+        config = NodeConfig()
+        config.set('port', 8001)
+        config['max_peers'] = 20
+        config.update({'log_level': 'DEBUG'})
+        
+        self.assertEqual(config.overrides, {'port': 8001, 'max_peers': 20, 'log_level': 'DEBUG'})
+        self.assertEqual(config['port'], 8001)
+        self.assertEqual(config.get('host'), 'localhost')
+        self.assertEqual(config.get('missing', 'fallback'), 'fallback')
+        self.assertIn('visualization_port', config)
+    
+    def test_reset_restores_defaults(self):
+        """
+        Test that resetting drops the overrides and leaves the defaults intact.
+        """
+        config = NodeConfig()
+        config['port'] = 8001
+        config.reset()
+        
+        self.assertEqual(config['port'], NodeConfig.DEFAULT_CONFIG['port'])
+        self.assertEqual(config.overrides, {})
+    
+    def test_instances_do_not_share_overrides(self):
+        """
+        Test that a setting changed on one instance is not seen by another.
+        """
+        first = NodeConfig()
+        second = NodeConfig()
+        first['port'] = 8001
+        
+        self.assertEqual(second['port'], 8000)
+        self.assertEqual(NodeConfig.DEFAULT_CONFIG['port'], 8000)
+    
+    def test_save_load_round_trip(self):
+        """
+        Test that a saved file lists every setting and loads back as overrides.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'config.json')
+            config = NodeConfig()
+            config['port'] = 8001
+            self.assertTrue(config.save(filename))
+            
+            with open(filename) as f:
+                self.assertEqual(set(json.load(f)), set(NodeConfig.DEFAULT_CONFIG))
+            
+            loaded = NodeConfig(filename)
+            self.assertEqual(loaded['port'], 8001)
+            self.assertEqual(loaded['host'], 'localhost')
+    
+    def test_defaults_are_read_only(self):
+        """
+        Test that the shared defaults cannot be changed directly.
+        """
+        with self.assertRaises(TypeError):
+            NodeConfig.DEFAULT_CONFIG['port'] = 9000
+        
+        config = NodeConfig()
+        with self.assertRaises(TypeError):
+            config.config.maps[-1]['port'] = 9000
+        
+        self.assertEqual(NodeConfig()['port'], 8000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.utils.crypto import create_merkle_paths, create_merkle_root, merkle_root_from_path, sha256_hex, sha256_many, sha256_once
+from src.blockchain.transaction import Transaction, sign_batch
+
+
+class TestHashing(unittest.TestCase):
+    """
+    Test the SHA-256 helpers.
+    """
+    
+    def test_helpers_match_hashlib(self):
+        """
+        Test that the helpers produce the standard SHA-256 digests.
+        """
+        items = [b'', b'abc', bytes(range(256))]
+        
+        self.assertEqual(sha256_many(items), [hashlib.sha256(item).digest() for item in items])
+        for item in items:
+            self.assertEqual(sha256_once(item), hashlib.sha256(item).digest())
+            self.assertEqual(sha256_hex(item), hashlib.sha256(item).hexdigest())
+
+
+class TestMerklePaths(unittest.TestCase):
+    """
+    Test Merkle paths and the batch signatures built on them.
+    """
+    
+    def _leaves(self, count):
+        """
+        Create distinct 32-byte leaf digests.
+        """
+        return [sha256_once(f"leaf-{i}".encode()) for i in range(count)]
+    
+    def test_every_path_leads_to_the_root(self):
+        """
+        Test that each leaf and its path reproduce the root, including odd leaf counts.
+        """
+        for count in (1, 2, 3, 5, 8):
+            leaves = self._leaves(count)
+            root, paths = create_merkle_paths(leaves)
+            
+            self.assertEqual(len(paths), count)
+            for index, (leaf, path) in enumerate(zip(leaves, paths)):
+                self.assertEqual(merkle_root_from_path(leaf, index, path), root)
+    
+    def test_tampered_leaf_fails(self):
+        """
+        Test that a changed leaf or a wrong index does not reproduce the root.
+        """
+        leaves = self._leaves(5)
+        root, paths = create_merkle_paths(leaves)
+        
+        tampered = sha256_once(b"tampered")
+        self.assertNotEqual(merkle_root_from_path(tampered, 2, paths[2]), root)
+        self.assertNotEqual(merkle_root_from_path(leaves[2], 1, paths[2]), root)
+    
+    def test_empty_tree(self):
+        """
+        Test the root and paths of an empty tree.
+        """
+        self.assertEqual(create_merkle_paths([]), (sha256_once(b''), []))
+    
+    def test_sign_batch(self):
+        """
+        Test that batch signatures verify only for the transaction they were issued to.
+        """
+        transactions = [Transaction("alice", f"bob-{i}", i + 1) for i in range(3)]
+        sign_batch(transactions, "private-key")
+        
+        for transaction in transactions:
+            self.assertTrue(transaction.verify_signature("public-key"))
+        
+        # A signature moved to another transaction no longer reaches the root
+        forged = Transaction("alice", "bob-1", 1000, signature=transactions[1].signature)
+        self.assertFalse(forged.verify_signature("public-key"))
+        
+        # So does a transaction changed after it was signed
+        transactions[2].amount = 1000
+        self.assertFalse(transactions[2].verify_signature("public-key"))
+    
+    def test_merkle_root_matches_paths(self):
+        """
+        Test that the hex Merkle root agrees with the root built alongside the paths.
+        """
+        for count in (2, 3, 5, 8):
+            leaves = self._leaves(count)
+            root, _ = create_merkle_paths(leaves)
+            self.assertEqual(create_merkle_root([leaf.hex() for leaf in leaves]), root.hex())
+        
+        leaf = self._leaves(1)[0].hex()
+        self.assertEqual(create_merkle_root([leaf]), leaf)
+        self.assertEqual(create_merkle_root([]), sha256_hex(b''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,292 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.network.gossip import GossipProtocol
+from src.utils.serialization import loads
+
+
+class RecordingTransport:
+    """
+    Transport stand-in that records what would have been sent.
+    """
+    
+    def __init__(self):
+        self.sent = []  # (peer_id, data) pairs from send_tcp
+        self.broadcasts = []  # data passed to broadcast_tcp
+    
+    def send_tcp(self, peer_id, data):
+        self.sent.append((peer_id, data))
+        return True
+    
+    def broadcast_tcp(self, data, exclude_peers=None):
+        self.broadcasts.append(data)
+
+
+class StaticPeerManager:
+    """
+    Peer manager stand-in with a fixed list of peers.
+    """
+    
+    def __init__(self, peer_ids):
+        self.peer_ids = peer_ids
+    
+    def get_random_peers(self, count, exclude_peer=None):
+        return [{'id': peer_id} for peer_id in self.peer_ids if peer_id != exclude_peer][:count]
+
+
+class FakeNode:
+    """
+    Minimal node carrying what the gossip protocol reads.
+    """
+    
+    def __init__(self, node_id, peer_ids):
+        self.node_id = node_id
+        self.transport = RecordingTransport()
+        self.peer_manager = StaticPeerManager(peer_ids)
+
+
+class TestGossipEncoding(unittest.TestCase):
+    """
+    Test that gossip messages are encoded once and shared across peers.
+    """
+    
+    def setUp(self):
+        """
+        Set up a gossip protocol with three peers.
+        """
+        self.node = FakeNode('node1', ['peer1', 'peer2', 'peer3'])
+        self.gossip = GossipProtocol(self.node)
+    
+    def test_broadcast_encodes_once(self):
+        """
+        Test that a broadcast and later gossip rounds reuse the same bytes.
+        """
+        message_id = self.gossip.broadcast('TRANSACTION', {'transaction': {'id': 'tx-1'}})
+        self.gossip._gossip_round()
+        
+        sent = self.node.transport.broadcasts + [data for _, data in self.node.transport.sent]
+        self.assertEqual(len(sent), 4)
+        self.assertTrue(all(data is sent[0] for data in sent))
+        self.assertEqual(loads(sent[0])['id'], message_id)
+    
+    def test_relay_encodes_decremented_ttl(self):
+        """
+        Test that a relayed message carries the lowered TTL and skips its sender.
+        """
+        message = {
+            'id': 'message-1',
+            'type': 'TRANSACTION',
+            'sender': 'node2',
+            'timestamp': 0.0,
+            'ttl': 5,
+            'payload': {}
+        }
+        self.assertTrue(self.gossip.receive_message(message, 'peer1'))
+        
+        peers = [peer_id for peer_id, _ in self.node.transport.sent]
+        self.assertEqual(peers, ['peer2', 'peer3'])
+        self.assertEqual(loads(self.node.transport.sent[0][1])['ttl'], 4)
+    
+    def test_send_to_peer_is_not_cached(self):
+        """
+        Test that point-to-point messages go to one peer and stay out of the cache.
+        """
+        self.gossip.send_to_peer('peer2', 'DIGEST', {'bloom': {}})
+        
+        self.assertEqual([peer_id for peer_id, _ in self.node.transport.sent], ['peer2'])
+        self.assertEqual(len(self.gossip.message_cache), 0)
+
+
+class TestGossipCache(unittest.TestCase):
+    """
+    Test duplicate suppression and the recent message cache.
+    """
+    
+    def setUp(self):
+        """
+        Set up a gossip protocol with no peers.
+        """
+        self.node = FakeNode('node1', [])
+        self.gossip = GossipProtocol(self.node)
+    
+    def _message(self, message_id):
+        """
+        Create a gossip message that is not relayed any further.
+        """
+        return {
+            'id': message_id,
+            'type': 'TRANSACTION',
+            'sender': 'node2',
+            'timestamp': 0.0,
+            'ttl': 1,
+            'payload': {}
+        }
+    
+    def test_duplicate_message_is_ignored(self):
+        """
+        Test that a message is handled once however often it arrives.
+        """
+        handled = []
+        self.gossip.register_handler('TRANSACTION', lambda message, from_peer: handled.append(message['id']))
+        
+        self.assertTrue(self.gossip.receive_message(self._message('message-1'), 'peer1'))
+        self.assertFalse(self.gossip.receive_message(self._message('message-1'), 'peer2'))
+        self.assertTrue(self.gossip.receive_message(self._message('message-2'), 'peer2'))
+        
+        self.assertEqual(handled, ['message-1', 'message-2'])
+        self.assertIn('message-1', self.gossip.seen_messages)
+    
+    def test_random_recent_message(self):
+        """
+        Test that random picks come from the cached messages.
+        """
+        self.assertIsNone(self.gossip._get_random_recent_message())
+        
+        for i in range(5):
+            self.gossip.receive_message(self._message(f"message-{i}"), 'peer1')
+        
+        picked = {self.gossip._get_random_recent_message()['id'] for _ in range(200)}
+        self.assertEqual(picked, {f"message-{i}" for i in range(5)})
+    
+    def _assert_columns_consistent(self):
+        """
+        Assert that every cache column has one slot per cached message ID.
+        """
+        gossip = self.gossip
+        self.assertEqual(len(gossip._cache_ids), len(gossip.message_cache))
+        self.assertEqual(len(gossip._cache_messages), len(gossip._cache_ids))
+        self.assertEqual(len(gossip._cache_encoded), len(gossip._cache_ids))
+        self.assertEqual(len(gossip._cache_timestamps), len(gossip._cache_ids))
+        for message_id, position in gossip.message_cache.items():
+            self.assertEqual(gossip._cache_ids[position], message_id)
+            self.assertEqual(gossip._cache_messages[position]['id'], message_id)
+    
+    def test_eviction_moves_last_slot(self):
+        """
+        Test that evicting a message keeps the columns aligned, including the encoded bytes.
+        """
+        for i in range(4):
+            self.gossip.receive_message(self._message(f"message-{i}"), 'peer1')
+        encoded = self.gossip._encode_message(self.gossip._cache_messages[3])
+        
+        with self.gossip.lock:
+            self.gossip._evict_cached_message('message-1')
+        
+        self._assert_columns_consistent()
+        self.assertNotIn('message-1', self.gossip.message_cache)
+        self.assertEqual(self.gossip.message_cache['message-3'], 1)
+        self.assertIs(self.gossip._cache_encoded[1], encoded)
+        
+        with self.gossip.lock:
+            self.gossip._evict_cached_message('message-2')
+        
+        self._assert_columns_consistent()
+        self.assertEqual(sorted(self.gossip.message_cache), ['message-0', 'message-3'])
+    
+    def test_expired_messages_are_cleaned(self):
+        """
+        Test that only messages cached longer than cache_expiry ago are evicted.
+        """
+        self.gossip.cache_expiry = 300
+        
+        with mock.patch('src.network.gossip.time.monotonic', side_effect=[100.0, 200.0, 250.0]):
+            self.gossip.receive_message(self._message('message-1'), 'peer1')
+            self.gossip.receive_message(self._message('message-2'), 'peer1')
+            
+            # Re-caching supersedes the first expiry queue entry of message-1
+            with self.gossip.lock:
+                self.gossip._cache_message('message-1', self._message('message-1'))
+        
+        with mock.patch('src.network.gossip.time.monotonic', return_value=460.0):
+            self.gossip._clean_message_cache()
+        self.assertEqual(sorted(self.gossip.message_cache), ['message-1', 'message-2'])
+        
+        with mock.patch('src.network.gossip.time.monotonic', return_value=520.0):
+            self.gossip._clean_message_cache()
+        self.assertEqual(list(self.gossip.message_cache), ['message-1'])
+        self._assert_columns_consistent()
+        
+        with mock.patch('src.network.gossip.time.monotonic', return_value=560.0):
+            self.gossip._clean_message_cache()
+        self.assertEqual(len(self.gossip.message_cache), 0)
+        self.assertEqual(len(self.gossip._expiry_queue), 0)
+
+
+class TestGossipAntiEntropy(unittest.TestCase):
+    """
+    Test anti-entropy digests summarized in a Bloom filter.
+    """
+    
+    def _gossip(self, node_id, peer_id):
+        """
+        Create a gossip protocol with the default handlers and a single peer.
+        """
+        gossip = GossipProtocol(FakeNode(node_id, [peer_id]))
+        gossip._register_default_handlers()
+        return gossip
+    
+    def _cache(self, gossip, message_ids):
+        """
+        Cache messages on a gossip protocol without relaying them.
+        """
+        for message_id in message_ids:
+            gossip.receive_message({
+                'id': message_id,
+                'type': 'TRANSACTION',
+                'sender': 'node3',
+                'timestamp': 0.0,
+                'ttl': 1,
+                'payload': {}
+            })
+    
+    def _deliver(self, sender, receiver):
+        """
+        Hand the messages a node sent over to another node and clear its outbox.
+        """
+        for _, data in sender.node.transport.sent:
+            receiver.receive_message(loads(data), sender.node.node_id)
+        sender.node.transport.sent.clear()
+    
+    def test_digest_pushes_missing_messages(self):
+        """
+        Test that a peer receiving our digest sends back the messages we lack.
+        """
+        first = self._gossip('node1', 'node2')
+        second = self._gossip('node2', 'node1')
+        self._cache(first, ['message-1', 'message-2'])
+        self._cache(second, ['message-1', 'message-3'])
+        
+        first._anti_entropy_round()
+        self.assertEqual(loads(first.node.transport.sent[0][1])['type'], 'DIGEST')
+        self._deliver(first, second)
+        
+        sync = [loads(data) for _, data in second.node.transport.sent]
+        self.assertEqual([message['type'] for message in sync], ['SYNC_RESP'])
+        self.assertEqual([message['id'] for message in sync[0]['payload']['messages']], ['message-3'])
+        self._deliver(second, first)
+        
+        self.assertEqual(sorted(first.message_cache), ['message-1', 'message-2', 'message-3'])
+        
+        # Digests and sync messages are point-to-point and never cached
+        self.assertEqual(sorted(second.message_cache), ['message-1', 'message-3'])
+    
+    def test_invalid_digest_filter_is_ignored(self):
+        """
+        Test that a digest with a malformed filter sends nothing back.
+        """
+        gossip = self._gossip('node1', 'node2')
+        self._cache(gossip, ['message-1'])
+        
+        gossip._handle_digest({'payload': {'bloom': {'bits': '', 'num_bits': 64, 'num_hashes': 3}}}, 'node2')
+        
+        self.assertEqual(gossip.node.transport.sent, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.utils import logger as logger_module
+from src.utils.logger import Logger, get_logger
+
+
+class TestLogger(unittest.TestCase):
+    """
+    Test how loggers are configured and shared.
+    """
+    
+    def test_same_arguments_share_handlers(self):
+        """
+        Test that repeated get_logger calls reuse one handler and listener.
+        """
+        first = get_logger('test.shared', logging.WARNING)
+        second = get_logger('test.shared', logging.WARNING)
+        
+        self.assertIs(first.listener, second.listener)
+        self.assertEqual(len(logging.getLogger('test.shared').handlers), 1)
+    
+    def test_new_arguments_reconfigure(self):
+        """
+        Test that a different level replaces the handlers instead of adding to them.
+        """
+        first = get_logger('test.reconfigured', logging.WARNING)
+        second = get_logger('test.reconfigured', logging.ERROR)
+        
+        self.assertIsNot(first.listener, second.listener)
+        self.assertEqual(len(logging.getLogger('test.reconfigured').handlers), 1)
+        self.assertFalse(second.is_enabled_for(logging.WARNING))
+    
+    def test_constructing_twice_shares_the_file(self):
+        """
+        Test that a second Logger with the same file reuses it, and a new file closes the old one.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_file = os.path.join(temp_dir, 'first.log')
+            second_file = os.path.join(temp_dir, 'second.log')
+            
+            first = Logger('test.files', logging.WARNING, first_file)
+            file_handler = logger_module._file_buffers['test.files'].target
+            
+            second = Logger('test.files', logging.WARNING, first_file)
+            self.assertIs(second.listener, first.listener)
+            self.assertIs(logger_module._file_buffers['test.files'].target, file_handler)
+            
+            third = Logger('test.files', logging.WARNING, second_file)
+            self.assertIsNot(third.listener, first.listener)
+            self.assertIsNone(file_handler.stream)
+            self.assertEqual(logger_module._file_buffers['test.files'].target.baseFilename, second_file)
+            
+            # Drop the file from the shared tables before its directory goes away
+            logger_module._listeners.pop('test.files').stop()
+            logger_module._configured.pop('test.files')
+            logger_module._close_file_buffer(logger_module._file_buffers.pop('test.files'))
+
+
+class TestLoggerFileBuffer(unittest.TestCase):
+    """
+    Test the buffer in front of the log file.
+    """
+    
+    def setUp(self):
+        """
+        Set up a logger writing to a file in a scratch directory.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, 'node.log')
+        self.log = Logger('test.buffered', logging.WARNING, self.log_file)
+        
+        # Keep the periodic flush thread away from the buffer under test
+        self.file_buffer = logger_module._file_buffers.pop('test.buffered')
+    
+    def tearDown(self):
+        """
+        Close the log file and remove the scratch directory.
+        """
+        logger_module._listeners.pop('test.buffered').stop()
+        logger_module._configured.pop('test.buffered')
+        logger_module._close_file_buffer(self.file_buffer)
+        self.temp_dir.cleanup()
+    
+    def _written(self):
+        """
+        Wait for the listener to handle every queued record and read the log file.
+        """
+        self.log.listener.stop()
+        self.log.listener.start()
+        with open(self.log_file) as f:
+            return f.read()
+    
+    def test_records_are_buffered_until_flushed(self):
+        """
+        Test that warnings wait in the buffer, errors write it out and a flush empties it.
+        """
+        self.log.warning("first warning")
+        self.assertNotIn("first warning", self._written())
+        
+        self.log.error("first error")
+        written = self._written()
+        self.assertIn("first warning", written)
+        self.assertIn("first error", written)
+        
+        self.log.warning("second warning")
+        self.assertNotIn("second warning", self._written())
+        self.file_buffer.flush()
+        self.assertIn("second warning", self._written())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import gzip
+import http.client
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.visualization.network_visualizer import NetworkVisualizer, SHORT_HASH_LENGTH, SHORT_ID_LENGTH
+from src.utils.serialization import loads
+
+
+class TestNetworkVisualizerData(unittest.TestCase):
+    """
+    Test the documents served by the network visualizer.
+    """
+    
+    def setUp(self):
+        """
+        Set up a visualizer with one of each kind of item, without starting its server.
+        """
+        self.visualizer = NetworkVisualizer(port=0)
+        self.visualizer.add_node('node-with-a-long-id')
+        self.visualizer.add_transaction('a' * 32, 'b' * 40, 'c' * 40, 5.0, timestamp=1.0)
+        self.visualizer.add_block(1, 'd' * 64, 'e' * 64, 1, timestamp=2.0)
+    
+    def test_data_keeps_full_values(self):
+        """
+        Test that /data carries full IDs, addresses and hashes.
+        """
+        data = loads(self.visualizer.get_data()[0])
+        
+        self.assertEqual(data['transactions'][0]['id'], 'a' * 32)
+        self.assertEqual(data['transactions'][0]['from'], 'b' * 40)
+        self.assertEqual(data['blocks'][0]['hash'], 'd' * 64)
+        self.assertEqual(data['blocks'][0]['previous_hash'], 'e' * 64)
+    
+    def test_event_data_is_narrowed(self):
+        """
+        Test that the /events document carries only the displayed prefixes.
+        """
+        data = loads(self.visualizer.get_event_data())
+        
+        self.assertEqual(data['nodes'][0]['id'], 'node-with-a-long-id')
+        self.assertEqual(data['transactions'][0]['id'], 'a' * SHORT_ID_LENGTH)
+        self.assertEqual(data['transactions'][0]['to'], 'c' * SHORT_ID_LENGTH)
+        self.assertEqual(data['blocks'][0]['hash'], 'd' * SHORT_HASH_LENGTH)
+        
+        # The narrowed document is rebuilt after a change
+        self.visualizer.add_node('node2')
+        data = loads(self.visualizer.get_event_data())
+        self.assertEqual(len(data['nodes']), 2)
+
+
+class TestNetworkVisualizerServer(unittest.TestCase):
+    """
+    Test the HTTP responses of the network visualizer.
+    """
+    
+    def setUp(self):
+        """
+        Start a visualizer on a free port with one node.
+        """
+        self.visualizer = NetworkVisualizer(port=0)
+        self.visualizer.add_node('node1')
+        self.visualizer.start()
+        self.connection = http.client.HTTPConnection('localhost', self.visualizer.server.server_address[1], timeout=5)
+    
+    def tearDown(self):
+        """
+        Close the connection and stop the server.
+        """
+        self.connection.close()
+        self.visualizer.stop()
+    
+    def _get(self, path, headers=None):
+        """
+        Request a path and return the response with its body read.
+        """
+        self.connection.request('GET', path, headers=headers or {})
+        response = self.connection.getresponse()
+        return response, response.read()
+    
+    def test_unchanged_data_is_not_resent(self):
+        """
+        Test that a matching If-None-Match gets a bodiless 304 until the data changes.
+        """
+        response, body = self._get('/data')
+        etag = response.getheader('ETag')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader('Cache-Control'), 'no-cache')
+        self.assertEqual(loads(body)['nodes'][0]['id'], 'node1')
+        
+        response, body = self._get('/data', {'If-None-Match': etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.getheader('ETag'), etag)
+        self.assertEqual(body, b'')
+        
+        self.visualizer.add_node('node2')
+        response, body = self._get('/data', {'If-None-Match': etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.getheader('ETag'), etag)
+        self.assertEqual(len(loads(body)['nodes']), 2)
+    
+    def test_data_is_compressed_when_accepted(self):
+        """
+        Test that the gzip form of /data has its own ETag and decodes to the same document.
+        """
+        response, body = self._get('/data')
+        etag = response.getheader('ETag')
+        
+        response, compressed = self._get('/data', {'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.getheader('Content-Encoding'), 'gzip')
+        self.assertEqual(response.getheader('Vary'), 'Accept-Encoding')
+        self.assertNotEqual(response.getheader('ETag'), etag)
+        self.assertEqual(gzip.decompress(compressed), body)
+        
+        # An ETag only revalidates the encoding it was issued for
+        response, _ = self._get('/data', {'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        self.assertEqual(response.status, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.node.peer_manager import PeerManager
+
+
+class FakeNode:
+    """
+    Minimal node carrying what the peer manager reads.
+    """
+    
+    def __init__(self, node_id):
+        self.node_id = node_id
+
+
+class TestPeerLiveness(unittest.TestCase):
+    """
+    Test the liveness heap used to find unresponsive peers.
+    """
+    
+    def setUp(self):
+        """
+        Set up a peer manager with a 30 second heartbeat, so peers time out after 90 seconds.
+        """
+        self.manager = PeerManager(FakeNode('node1'))
+        self.manager.heartbeat_interval = 30
+        self.clock = mock.patch('src.node.peer_manager.time.time')
+        self.time = self.clock.start()
+    
+    def tearDown(self):
+        """
+        Restore the real clock.
+        """
+        self.clock.stop()
+    
+    def _at(self, now, action, *args):
+        """
+        Run a peer manager method with the clock set to a given time.
+        """
+        self.time.return_value = now
+        return action(*args)
+    
+    def test_only_stale_peers_are_marked_dead(self):
+        """
+        Test that a peer seen again is rescheduled and the others time out in order.
+        """
+        self._at(0.0, self.manager.add_peer, 'peer1', 'localhost', 8001)
+        self._at(50.0, self.manager.add_peer, 'peer2', 'localhost', 8002)
+        self._at(80.0, self.manager.mark_peer_active, 'peer1')
+        
+        self._at(100.0, self.manager._check_unresponsive_peers)
+        self.assertEqual(self.manager.active_peers, {'peer1', 'peer2'})
+        
+        self._at(145.0, self.manager._check_unresponsive_peers)
+        self.assertEqual(self.manager.active_peers, {'peer1'})
+        self.assertEqual(self.manager.dead_peers, {'peer2'})
+        
+        self._at(175.0, self.manager._check_unresponsive_peers)
+        self.assertEqual(self.manager.active_peers, set())
+        self.assertEqual(self.manager.dead_peers, {'peer1', 'peer2'})
+        self.assertEqual(self.manager._liveness_heap, [])
+    
+    def test_heap_does_not_grow_when_peers_are_seen(self):
+        """
+        Test that marking a peer active does not add heap entries.
+        """
+        self._at(0.0, self.manager.add_peer, 'peer1', 'localhost', 8001)
+        for i in range(100):
+            self._at(float(i), self.manager.mark_peer_active, 'peer1')
+        
+        self.assertEqual(len(self.manager._liveness_heap), 1)
+    
+    def test_revived_peer_is_checked_again(self):
+        """
+        Test that a dead peer seen again gets a new liveness entry.
+        """
+        self._at(0.0, self.manager.add_peer, 'peer1', 'localhost', 8001)
+        self._at(100.0, self.manager._check_unresponsive_peers)
+        self.assertEqual(self.manager.dead_peers, {'peer1'})
+        
+        self._at(110.0, self.manager.mark_peer_active, 'peer1')
+        self.assertEqual(self.manager.active_peers, {'peer1'})
+        
+        self._at(210.0, self.manager._check_unresponsive_peers)
+        self.assertEqual(self.manager.dead_peers, {'peer1'})
+
+
+class TestActivePeers(unittest.TestCase):
+    """
+    Test the active peer list kept for sampling.
+    """
+    
+    def setUp(self):
+        """
+        Set up a peer manager with twenty active peers.
+        """
+        self.manager = PeerManager(FakeNode('node1'))
+        self.manager.max_peers = 20
+        for i in range(20):
+            self.manager.add_peer(f"peer{i}", 'localhost', 8000 + i)
+    
+    def _assert_list_matches_set(self):
+        """
+        Assert that the sampling list and its index hold exactly the active peers.
+        """
+        manager = self.manager
+        self.assertEqual({peer['id'] for peer in manager._active_list}, manager.active_peers)
+        self.assertEqual(len(manager._active_list), len(manager.active_peers))
+        for peer_id, position in manager._active_index.items():
+            self.assertEqual(manager._active_list[position]['id'], peer_id)
+    
+    def test_removal_keeps_list_consistent(self):
+        """
+        Test that removing and killing peers from any position keeps the list aligned.
+        """
+        self.manager.remove_peer('peer3')
+        self.manager.mark_peer_dead('peer0')
+        self.manager.mark_peer_dead('peer19')
+        self._assert_list_matches_set()
+        self.assertEqual(len(self.manager.get_active_peers()), 17)
+        
+        self.manager.mark_peer_active('peer0')
+        self._assert_list_matches_set()
+        self.assertIn('peer0', self.manager.active_peers)
+    
+    def test_random_peers_are_distinct_and_exclude_peer(self):
+        """
+        Test both the sparse and the dense sampling paths.
+        """
+        for count in (2, 10, 25):
+            for _ in range(50):
+                peers = [peer['id'] for peer in self.manager.get_random_peers(count, exclude_peer='peer5')]
+                
+                self.assertEqual(len(peers), min(count, 19))
+                self.assertEqual(len(set(peers)), len(peers))
+                self.assertNotIn('peer5', peers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.blockchain.pow import NONCE_BATCH_SIZE, NONCE_FORMAT, ProofOfWork, difficulty_target, digest_limit, parallel_nonce_search
+
+
+class TestProofOfWork(unittest.TestCase):
+    """
+    Test nonce search and verification in ProofOfWork.
+    """
+    
+    def test_assigned_difficulty_is_used(self):
+        """
+        Test that assigning the difficulty updates mining and verification.
+        """
+        pow_system = ProofOfWork(difficulty=20)
+        pow_system.difficulty = 2
+        
+        result = pow_system.mine({'index': 1, 'data': 'block'}, max_nonce=100000)
+        
+        self.assertIsNotNone(result)
+        self.assertTrue(result['hash'].startswith('00'))
+        self.assertTrue(pow_system.verify({'index': 1, 'data': 'block'}, result['nonce'], result['hash']))
+    
+    def test_mine_finds_first_valid_nonce(self):
+        """
+        Test that the batched search returns the first valid nonce and honours max_nonce.
+        """
+        data = {'index': 1, 'data': 'block'}
+        pow_system = ProofOfWork(difficulty=3)
+        
+        expected = 0
+        while not pow_system.calculate_hash(data, expected).startswith('000'):
+            expected += 1
+        self.assertGreater(expected, NONCE_BATCH_SIZE)
+        
+        # A search ending just before the match fails, one including it succeeds
+        self.assertIsNone(pow_system.mine(data, max_nonce=expected))
+        result = pow_system.mine(data, max_nonce=expected + 1)
+        
+        self.assertEqual(result['nonce'], expected)
+        self.assertEqual(result['hash'], pow_system.calculate_hash(data, expected))
+    
+    def test_calculate_hash_appends_the_nonce(self):
+        """
+        Test that the hash covers the encoded data followed by the 8-byte nonce.
+        """
+        data = {'index': 1, 'data': 'block'}
+        pow_system = ProofOfWork(difficulty=1)
+        
+        for nonce in (0, 255, 2 ** 40):
+            expected = hashlib.sha256(str(data).encode() + NONCE_FORMAT.pack(nonce)).hexdigest()
+            self.assertEqual(pow_system.calculate_hash(data, nonce), expected)
+    
+    def test_mine_leaves_data_unchanged(self):
+        """
+        Test that mining returns a verified copy of the data.
+        """
+        data = {'index': 1, 'data': 'block'}
+        pow_system = ProofOfWork(difficulty=2)
+        
+        result = pow_system.mine(data, max_nonce=100000)
+        
+        self.assertEqual(data, {'index': 1, 'data': 'block'})
+        self.assertTrue(pow_system.verify(data, result['nonce'], result['hash']))
+        self.assertFalse(pow_system.verify(data, result['nonce'] + 1, result['hash']))
+
+
+class TestDifficultyTarget(unittest.TestCase):
+    """
+    Test the integer targets derived from a difficulty.
+    """
+    
+    def test_target_matches_leading_zeros(self):
+        """
+        Test that a digest is below the target exactly when it has enough leading zeros.
+        """
+        digests = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(2000)]
+        
+        for difficulty in range(1, 7):
+            target = difficulty_target(difficulty)
+            
+            # The largest and smallest digests either side of the boundary
+            self.assertTrue(f"{target - 1:064x}".startswith('0' * difficulty))
+            self.assertFalse(f"{target:064x}".startswith('0' * difficulty))
+            
+            for digest in digests:
+                self.assertEqual(int(digest, 16) < target, digest.startswith('0' * difficulty))
+    
+    def test_digest_limit_matches_integer_compare(self):
+        """
+        Test that comparing raw digests against the limit agrees with the integer target.
+        """
+        digests = [hashlib.sha256(str(i).encode()).digest() for i in range(2000)]
+        
+        for difficulty in range(1, 7):
+            target = difficulty_target(difficulty)
+            limit = digest_limit(target)
+            
+            self.assertEqual(len(limit), 32)
+            self.assertTrue((target - 1).to_bytes(32, 'big') <= limit)
+            self.assertFalse(target.to_bytes(32, 'big') <= limit)
+            
+            for digest in digests:
+                self.assertEqual(digest <= limit, int.from_bytes(digest, 'big') < target)
+
+
+class TestParallelNonceSearch(unittest.TestCase):
+    """
+    Test the nonce search split across worker processes.
+    """
+    
+    def test_finds_valid_nonce(self):
+        """
+        Test that the winning nonce and hash meet the target.
+        """
+        prefix = b'parallel-search'
+        target = difficulty_target(3)
+        
+        nonce, hash_value = parallel_nonce_search(prefix, target, 10, 2)
+        
+        self.assertGreaterEqual(nonce, 10)
+        self.assertEqual(hash_value, hashlib.sha256(prefix + NONCE_FORMAT.pack(nonce)).hexdigest())
+        self.assertLess(int(hash_value, 16), target)
+    
+    def test_range_without_match(self):
+        """
+        Test that a bounded search with no valid nonce returns None.
+        """
+        prefix = b'parallel-search'
+        target = difficulty_target(3)
+        first = 0
+        while int(hashlib.sha256(prefix + NONCE_FORMAT.pack(first)).hexdigest(), 16) >= target:
+            first += 1
+        
+        self.assertIsNone(parallel_nonce_search(prefix, target, 0, 3, first))
+        self.assertEqual(parallel_nonce_search(prefix, target, 0, 3, first + 1)[0], first)
+    
+    def test_mine_with_workers(self):
+        """
+        Test that ProofOfWork.mine returns a verifiable result when split across processes.
+        """
+        data = {'index': 1, 'data': 'block'}
+        pow_system = ProofOfWork(difficulty=2)
+        
+        result = pow_system.mine(data, max_nonce=100000, workers=2)
+        
+        self.assertTrue(pow_system.verify(data, result['nonce'], result['hash']))
+
+
+if __name__ == '__main__':
+    unittest.main()
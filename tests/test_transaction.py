@@ -0,0 +1,128 @@
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.blockchain.transaction import (
+    HASH_FIELDS, Transaction, validate_transactions, _compile_hash_input, _transaction_columns, _validate_columns
+)
+
+
+class TestTransaction(unittest.TestCase):
+    """
+    Test transaction hashing and validation.
+    """
+    
+    def _transactions(self, count):
+        """
+        Create signed transactions that pass the basic checks.
+        """
+        return [Transaction("alice", f"bob-{i}", i + 1, signature="signature") for i in range(count)]
+    
+    def test_hash_follows_field_changes(self):
+        """
+        Test that assigning a hashed field drops the memoized hash, but signing does not.
+        """
+        transaction = Transaction("alice", "bob", 5, timestamp=1.0, transaction_id="tx-1")
+        original = transaction.calculate_hash()
+        
+        transaction.signature = "signature"
+        self.assertEqual(transaction.calculate_hash(), original)
+        
+        transaction.amount = 6
+        changed = transaction.calculate_hash()
+        self.assertNotEqual(changed, original)
+        self.assertEqual(changed, Transaction("alice", "bob", 6, timestamp=1.0, transaction_id="tx-1").calculate_hash())
+        
+        transaction.amount = 5
+        self.assertEqual(transaction.calculate_hash(), original)
+    
+    def test_malformed_addresses_are_rejected_by_is_valid(self):
+        """
+        Test that non-string addresses construct and then fail validation.
+        """
+        transaction = Transaction.from_dict({'sender': None, 'receiver': None, 'amount': 1, 'signature': 'signature'})
+        self.assertFalse(transaction.is_valid())
+    
+    def test_addresses_are_interned(self):
+        """
+        Test that equal addresses share one string object.
+        """
+        first = Transaction(''.join(['al', 'ice']), "bob", 1)
+        second = Transaction(''.join(['ali', 'ce']), "bob", 1)
+        self.assertIs(first.sender, second.sender)
+    
+    def test_validate_transactions_in_process(self):
+        """
+        Test that the default in-process validation rejects an invalid transaction.
+        """
+        transactions = self._transactions(10)
+        self.assertTrue(validate_transactions(transactions))
+        
+        transactions.append(Transaction("alice", "alice", 1, signature="signature"))
+        self.assertFalse(validate_transactions(transactions))
+    
+    def test_validate_transactions_with_workers(self):
+        """
+        Test that the worker pool agrees with in-process validation.
+        """
+        transactions = self._transactions(100)
+        self.assertTrue(validate_transactions(transactions, workers=2))
+        
+        transactions.append(Transaction("alice", "bob", 0, signature="signature"))
+        self.assertFalse(validate_transactions(transactions, workers=2))
+    
+    def test_validate_columns_matches_is_valid(self):
+        """
+        Test that the column checks reject what Transaction.is_valid rejects.
+        """
+        invalid = [
+            Transaction("alice", "bob", 0, signature="signature"),
+            Transaction("alice", "alice", 1, signature="signature"),
+            Transaction("alice", "bob", 1)
+        ]
+        
+        for transaction in invalid:
+            self.assertFalse(transaction.is_valid())
+            columns = _transaction_columns(self._transactions(3) + [transaction])
+            self.assertFalse(_validate_columns(columns))
+        
+        self.assertTrue(_validate_columns(_transaction_columns(self._transactions(3))))
+    
+    def test_hash_input_matches_tuple_repr(self):
+        """
+        Test that the generated encoder writes the repr of the hashed fields.
+        """
+        transaction = Transaction("alice", "bob", 0.1, timestamp=1700000000.25, transaction_id="tx-1")
+        fields = tuple(getattr(transaction, field) for field in HASH_FIELDS)
+        
+        self.assertEqual(transaction._hash_input(), repr(fields).encode())
+        
+        encode = _compile_hash_input(('sender', 'amount'))
+        self.assertEqual(encode(transaction), b"('alice', 0.1)")
+    
+    def test_hash_input_is_unambiguous(self):
+        """
+        Test that separators inside field values cannot make two transactions collide.
+        """
+        first = Transaction("a', 'b", "c", 1, timestamp=1.0, transaction_id="tx-1")
+        second = Transaction("a", "b', 'c", 1, timestamp=1.0, transaction_id="tx-1")
+        
+        self.assertNotEqual(first._hash_input(), second._hash_input())
+        self.assertNotEqual(first.calculate_hash(), second.calculate_hash())
+    
+    def test_hash_batch_matches_single_hashes(self):
+        """
+        Test that batch hashing gives the same hashes as hashing one at a time.
+        """
+        transactions = self._transactions(5)
+        expected = [Transaction.from_dict(tx.to_dict()).calculate_hash() for tx in transactions]
+        
+        self.assertEqual(Transaction.calculate_hash_batch(transactions), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import project modules
+from src.network.transport import Transport
+
+
+class TestTransportFrames(unittest.TestCase):
+    """
+    Test the length-prefixed TCP framing.
+    """
+    
+    def setUp(self):
+        """
+        Set up a transport that records the messages it decodes.
+        """
+        self.transport = Transport('localhost', 0)
+        self.received = []
+        self.transport.register_message_handler(lambda message, peer_id: self.received.append(message))
+    
+    def test_frames_split_across_reads(self):
+        """
+        Test that frames are decoded whole however the stream is split.
+        """
+        messages = [{'type': 'PING', 'seq': i} for i in range(3)]
+        stream = b''.join(self.transport._encode_frame(message) for message in messages)
+        
+        buffer = bytearray()
+        for i in range(0, len(stream), 5):
+            buffer.extend(stream[i:i + 5])
+            buffer = self.transport._process_tcp_buffer(buffer, 'peer')
+        
+        self.assertEqual(self.received, messages)
+        self.assertEqual(len(buffer), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()